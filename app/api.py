@@ -0,0 +1,362 @@
+# app/api.py
+"""HTTP 서비스 모드
+
+프로세스가 떠 있는 동안 PlaneClient(커넥션 풀), DB 풀, MetadataCache를 계속 재사용한다.
+배치는 BatchQueue에 등록되고 프로세스 안의 QueueWorker 스레드가 실행하며
+(다른 호스트의 run_queue_worker도 같은 큐를 가져감), 진행 상황은 sync_batches와
+created_resources를 조회하는 폴링/SSE 엔드포인트로 확인한다.
+메타데이터 테이블은 Plane 웹훅(/webhooks/plane)으로 갱신하고, METADATA_RECONCILE_WORKSPACES의
+워크스페이스는 METADATA_RECONCILE_SECONDS마다 전체 sync로 놓친 변경을 맞춘다.
+
+    uvicorn app.api:app --port 8011
+"""
+import asyncio
+import json
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from datetime import datetime
+from typing import List, Optional
+import yaml
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.errors import WebhookError
+from app.database.session import SessionLocal, ScopedSession, get_async_sessionmaker
+from app.database.models import BatchStatus
+from app.services.plane_client import PlaneClient
+from app.services.async_plane_client import AsyncPlaneClient
+from app.services.rate_limiter import RateLimiter
+from app.services.metadata_cache import MetadataCache
+from app.services.metadata_service import MetadataService
+from app.services.execution_engine import ExecutionEngine
+from app.services.async_execution_engine import AsyncExecutionEngine
+from app.services.batch_queue import BatchQueue, QueueWorker, default_worker_id
+from app.services.batch_loader import Loader
+from app.services.batch_report import BatchReport
+from app.services.metrics import Metrics
+from app.services.webhooks import SIGNATURE_HEADER, EVENT_HEADER, verify_signature, parse_event
+
+# 메모리에 보관할 sync 작업 수 (넘으면 오래된 완료 작업부터 삭제)
+MAX_JOBS = 1000
+
+
+class SyncRequest(BaseModel):
+    members: bool = True
+    projects: bool = True
+    states: bool = False
+    project_ids: Optional[List[str]] = None  # states 대상 (없으면 워크스페이스의 모든 프로젝트)
+    detect_deletions: bool = False
+
+
+class ServiceState:
+    """프로세스 수명 동안 공유하는 client, cache, 큐 워커, sync 작업"""
+    def __init__(self):
+        self.limiter = RateLimiter.from_settings(settings)
+        self.metrics = Metrics.from_settings(settings)  # 프로세스 전체 Plane 요청 집계 (/metrics)
+        self.client = PlaneClient.from_settings(settings, limiter=self.limiter, metrics=self.metrics)
+        self.cache = MetadataCache.from_settings(settings)
+        # 워커 스레드와 heartbeat 스레드가 각자의 Session을 재사용
+        self.queue = BatchQueue.from_settings(settings, ScopedSession)
+        self.workers = [
+            QueueWorker(
+                self.queue, self.build_engine, worker_id=f"{default_worker_id()}:{i}",
+                poll_interval=settings.BATCH_QUEUE_POLL_SECONDS,
+                heartbeat_interval=settings.BATCH_QUEUE_HEARTBEAT_SECONDS,
+                close_client=False,
+            )
+            for i in range(settings.API_QUEUE_WORKERS)
+        ]
+        self.threads = []
+        self.executor = ThreadPoolExecutor(max_workers=settings.API_SYNC_WORKERS)
+        self.jobs = {}  # sync 작업 id -> 상태
+        self._jobs_lock = threading.Lock()
+        self._snapshot_pending = False
+        self._stopped = threading.Event()
+
+    def build_engine(self, db):
+        """QueueWorker용 engine_factory, 동기 모드는 공유 client를 그대로 사용"""
+        # 배치마다 batch_id가 다르므로 요청/단계 시간은 배치용 Metrics에 기록 (프로세스 전체 /metrics에도 함께 반영)
+        metrics = self.metrics.child() if self.metrics is not None else None
+        if settings.PLANE_ASYNC_EXECUTION:
+            # httpx 클라이언트는 이벤트 루프에 묶이므로 배치마다 만들고 limiter만 공유
+            client = AsyncPlaneClient.from_settings(settings, limiter=self.limiter, metrics=metrics)
+            engine = AsyncExecutionEngine(
+                client, db, max_projects=settings.PLANE_ASYNC_MAX_PROJECTS, chunk_size=settings.DB_BULK_CHUNK_SIZE,
+                cache=self.cache, cycle_owner_email=settings.PLANE_CYCLE_OWNER_EMAIL, metrics=metrics,
+                bulk_membership=settings.PLANE_BULK_MEMBERSHIP, state_sync=self.state_sync(),
+                metadata_changed=self.metadata_changed(),
+                async_sessionmaker=get_async_sessionmaker() if settings.DB_ASYNC_ENABLED else None
+            )
+        else:
+            client = self.client.with_metrics(metrics)
+            engine = ExecutionEngine(
+                client, db, max_workers=settings.PLANE_MAX_WORKERS, chunk_size=settings.DB_BULK_CHUNK_SIZE,
+                cache=self.cache, cycle_owner_email=settings.PLANE_CYCLE_OWNER_EMAIL, metrics=metrics,
+                bulk_membership=settings.PLANE_BULK_MEMBERSHIP, state_sync=self.state_sync(),
+                metadata_changed=self.metadata_changed()
+            )
+        return client, engine
+
+    def meta_service(self):
+        return MetadataService(self.client, self.cache, page_size=settings.PLANE_SYNC_PAGE_SIZE,
+                               snapshot_path=settings.METADATA_SNAPSHOT_PATH)
+
+    def state_sync(self):
+        """배치가 상태를 모르는 프로젝트를 만나면 공유 client/cache로 상태를 동기화 (METADATA_AUTO_STATE_SYNC)"""
+        if not settings.METADATA_AUTO_STATE_SYNC:
+            return None
+        # 스냅샷은 배치가 끝날 때 metadata_changed로 한 번만 다시 씀
+        return partial(self.meta_service().sync_workspace, SessionLocal, max_workers=settings.METADATA_SYNC_WORKERS,
+                       members=False, snapshot=False)
+
+    def metadata_changed(self):
+        """배치가 프로젝트/상태를 바꾼 뒤 워크스페이스 스냅샷을 다시 쓰는 함수 (METADATA_SNAPSHOT_PATH가 없으면 None)"""
+        if not settings.METADATA_SNAPSHOT_PATH:
+            return None
+        return partial(self.meta_service().refresh_snapshot, SessionLocal)
+
+    def start(self):
+        for worker in self.workers:
+            thread = threading.Thread(target=worker.run, name=worker.worker_id, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        if settings.METADATA_RECONCILE_WORKSPACES and settings.METADATA_RECONCILE_SECONDS > 0:
+            thread = threading.Thread(target=self._reconcile_loop, name="metadata-reconcile", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def _reconcile_loop(self):
+        """웹훅을 놓쳤을 때를 위한 안전망: 주기적으로 삭제 감지를 포함한 전체 sync"""
+        while not self._stopped.wait(settings.METADATA_RECONCILE_SECONDS):
+            for workspace_slug in settings.METADATA_RECONCILE_WORKSPACES:
+                self.submit_sync(workspace_slug, SyncRequest(states=True, detect_deletions=True))
+
+    def apply_webhook(self, event: str, action: str, data: dict):
+        """웹훅 이벤트를 메타데이터 테이블과 캐시에 반영하고, 바뀌었으면 스냅샷 재작성을 예약"""
+        db = SessionLocal()
+        try:
+            applied = self.meta_service().apply_event(db, event, action, data)
+        finally:
+            db.close()
+        if applied and settings.METADATA_SNAPSHOT_PATH:
+            self._schedule_snapshot()
+        return applied
+
+    def _schedule_snapshot(self):
+        # 이벤트가 몰려도 대기 중인 재작성은 하나만 (작성 중에 들어온 이벤트는 다음 재작성에 반영)
+        with self._jobs_lock:
+            if self._snapshot_pending:
+                return
+            self._snapshot_pending = True
+        self.executor.submit(self._write_snapshot)
+
+    def _write_snapshot(self):
+        with self._jobs_lock:
+            self._snapshot_pending = False
+        db = SessionLocal()
+        try:
+            self.meta_service().write_snapshots(db)
+        except Exception as e:
+            print(f"⚠️ 메타데이터 스냅샷 저장 실패: {e}")
+        finally:
+            db.close()
+
+    def stop(self):
+        """워커는 실행 중인 배치를 마치면 종료 (시간 안에 끝나지 않으면 lease 만료 후 다른 워커가 이어서 실행)"""
+        self._stopped.set()
+        for worker in self.workers:
+            worker.stop()
+        for thread in self.threads:
+            thread.join(timeout=settings.BATCH_QUEUE_HEARTBEAT_SECONDS)
+        self.executor.shutdown(wait=False)
+        self.client.close()
+
+    def submit_sync(self, workspace_slug: str, request: SyncRequest):
+        job_id = str(uuid.uuid4())
+        with self._jobs_lock:
+            if len(self.jobs) >= MAX_JOBS:
+                finished = [k for k, job in self.jobs.items() if job["status"] != "RUNNING"]
+                for old_id in finished[:len(self.jobs) - MAX_JOBS + 1]:
+                    del self.jobs[old_id]
+            self.jobs[job_id] = {"id": job_id, "workspace": workspace_slug, "status": "RUNNING", "result": {}}
+        self.executor.submit(self._run_sync, job_id, workspace_slug, request)
+        return self.jobs[job_id]
+
+    def _run_sync(self, job_id, workspace_slug, request: SyncRequest):
+        db = SessionLocal()
+        service = self.meta_service()
+        result = self.jobs[job_id]["result"]
+        try:
+            if request.states:
+                # 프로젝트 목록은 한 번만 받고 프로젝트별 상태는 동시에 동기화
+                result.update(service.sync_workspace(
+                    SessionLocal, workspace_slug, project_ids=request.project_ids,
+                    max_workers=settings.METADATA_SYNC_WORKERS, detect_deletions=request.detect_deletions,
+                    members=request.members,
+                ))
+            else:
+                if request.members:
+                    result["members"] = service.sync_members(db, workspace_slug)
+                if request.projects:
+                    result["projects"] = service.sync_project_list(db, workspace_slug, request.detect_deletions)
+                service.write_snapshot(db, workspace_slug)
+            status, error = "COMPLETED", None
+        except Exception as e:
+            status, error = "FAILED", str(e)
+        finally:
+            db.close()
+        with self._jobs_lock:
+            self.jobs[job_id].update(status=status, error=error)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    service = ServiceState()
+    service.start()
+    app.state.service = service
+    yield
+    service.stop()
+
+
+app = FastAPI(title="GoQuest Manager", lifespan=lifespan)
+
+
+def _batch_status(batch_id: str):
+    return app.state.service.queue.batch_status(batch_id)
+
+
+def _is_finished(status: dict):
+    # FAILED이어도 워커가 lease를 놓기 전에는 재시도(QUEUED)로 돌아갈 수 있음
+    if status["status"] in (BatchStatus.COMPLETED.value, BatchStatus.ROLLED_BACK.value):
+        return True
+    return status["status"] == BatchStatus.FAILED.value and status["worker_id"] is None
+
+
+@app.get("/health")
+def health():
+    return {"status": "ok"}
+
+
+@app.post("/batches", status_code=202)
+async def submit_batch(request: Request, split_projects: bool = False):
+    """YAML(또는 JSON) 본문을 큐에 등록, split_projects이면 프로젝트마다 배치 하나"""
+    body = await request.body()
+    try:
+        if request.headers.get("content-type", "").startswith("application/json"):
+            yaml_data = json.loads(body)
+        else:
+            yaml_data = yaml.load(body, Loader=Loader)
+    except (ValueError, yaml.YAMLError) as e:
+        raise HTTPException(status_code=400, detail=f"본문을 읽을 수 없습니다: {e}")
+    if not isinstance(yaml_data, dict) or not yaml_data.get("Workspace Slug"):
+        raise HTTPException(status_code=400, detail="Workspace Slug가 있는 YAML 매핑이어야 합니다")
+
+    group_id = str(uuid.uuid4())
+    queue = request.app.state.service.queue
+    batch_ids = await run_in_threadpool(queue.enqueue, yaml_data, split_projects, group_id)
+    return {"group_id": group_id, "batch_ids": batch_ids}
+
+
+@app.get("/batches/{batch_id}")
+def get_batch(batch_id: str):
+    status = _batch_status(batch_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Batch를 찾을 수 없습니다")
+    return status
+
+
+@app.get("/batches/{batch_id}/events")
+async def batch_events(batch_id: str, request: Request):
+    """배치 상태가 바뀔 때마다 SSE status 이벤트를 보내고, 끝나면 스트림 종료"""
+    status = await run_in_threadpool(_batch_status, batch_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Batch를 찾을 수 없습니다")
+
+    async def events(status):
+        last = None
+        while True:
+            if status != last:
+                yield f"event: status\ndata: {json.dumps(status)}\n\n"
+                last = status
+            if _is_finished(status) or await request.is_disconnected():
+                return
+            await asyncio.sleep(settings.API_STATUS_POLL_SECONDS)
+            status = await run_in_threadpool(_batch_status, batch_id)
+
+    return StreamingResponse(events(status), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+def _report():
+    return BatchReport.from_settings(settings, SessionLocal)
+
+
+@app.get("/resources")
+def export_resources(batch_id: Optional[str] = None, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                     resource_type: Optional[str] = None, format: str = Query("jsonl", pattern="^(jsonl|csv)$"),
+                     tree: bool = False):
+    """배치/기간의 created_resources를 JSONL 또는 CSV로 스트리밍 (서버 측 커서, 메모리 사용량 일정)"""
+    if not (batch_id or since or until):
+        raise HTTPException(status_code=400, detail="batch_id나 since/until이 필요합니다")
+    chunks = _report().export(format, tree=tree, batch_id=batch_id, since=since, until=until,
+                              resource_type=resource_type)
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(chunks, media_type=media_type)
+
+
+@app.get("/resources/summary")
+def resources_summary(batch_id: Optional[str] = None, since: Optional[datetime] = None,
+                      until: Optional[datetime] = None):
+    """resource_type별 생성/삭제 개수"""
+    if not (batch_id or since or until):
+        raise HTTPException(status_code=400, detail="batch_id나 since/until이 필요합니다")
+    return _report().summary(batch_id, since, until)
+
+
+@app.get("/groups/{group_id}")
+def get_group(group_id: str, request: Request):
+    counts = request.app.state.service.queue.group_status(group_id)
+    if not counts:
+        raise HTTPException(status_code=404, detail="배치 묶음을 찾을 수 없습니다")
+    return {"group_id": group_id, "status": counts}
+
+
+@app.post("/workspaces/{workspace_slug}/sync", status_code=202)
+def submit_sync(workspace_slug: str, body: SyncRequest, request: Request):
+    """멤버/프로젝트/상태 동기화를 백그라운드에서 실행, /jobs/{id}로 결과 확인"""
+    return request.app.state.service.submit_sync(workspace_slug, body)
+
+
+@app.post("/webhooks/plane")
+async def plane_webhook(request: Request):
+    """Plane 웹훅 수신: 서명 확인 후 project/state/member 이벤트를 메타데이터 테이블과 캐시에 반영"""
+    if not settings.PLANE_WEBHOOK_SECRET:
+        raise HTTPException(status_code=503, detail="PLANE_WEBHOOK_SECRET이 설정되지 않았습니다")
+    body = await request.body()
+    if not verify_signature(settings.PLANE_WEBHOOK_SECRET, body, request.headers.get(SIGNATURE_HEADER)):
+        raise HTTPException(status_code=401, detail="웹훅 서명이 올바르지 않습니다")
+    try:
+        event, action, data = parse_event(body, request.headers.get(EVENT_HEADER))
+    except WebhookError as e:
+        raise HTTPException(status_code=400, detail=e.message)
+    applied = await run_in_threadpool(request.app.state.service.apply_webhook, event, action, data)
+    return {"event": event, "action": action, "applied": applied}
+
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str, request: Request):
+    job = request.app.state.service.jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+    return job
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics(request: Request):
+    """프로세스 전체 Plane 요청 메트릭 (PLANE_METRICS_ENABLED일 때만 값이 있음)"""
+    service_metrics = request.app.state.service.metrics
+    return service_metrics.to_prometheus() if service_metrics else ""
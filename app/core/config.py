@@ -1,4 +1,6 @@
 # app/core/config.py
+from functools import lru_cache
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -10,12 +12,110 @@ class Settings(BaseSettings):
     DB_PORT: str
     DB_NAME: str
 
+    # Plane HTTP 커넥션 풀 설정
+    PLANE_HTTP_POOL_CONNECTIONS: int = 10  # 캐시할 호스트별 풀 개수
+    PLANE_HTTP_POOL_MAXSIZE: int = 20      # 호스트당 최대 커넥션 수
+    PLANE_HTTP_POOL_BLOCK: bool = False
+    PLANE_HTTP_KEEP_ALIVE: bool = True
+    PLANE_HTTP_TIMEOUT: float = 30
+
+    # ExecutionEngine 이슈 생성 워커 수 (PLANE_HTTP_POOL_MAXSIZE 이하 권장)
+    PLANE_MAX_WORKERS: int = 8
+    # CreatedResource bulk insert 단위
+    DB_BULK_CHUNK_SIZE: int = 500
+    # created_resources 리포트/내보내기에서 서버 측 커서로 한 번에 받는 행 수 (BatchReport)
+    REPORT_FETCH_SIZE: int = 1000
+
+    # DB 커넥션 풀 (워커 스레드/프로세스 수에 맞춰 조정)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800   # 초, 이보다 오래된 커넥션은 다시 연결
+    DB_POOL_PRE_PING: bool = True
+    # AsyncExecutionEngine의 CreatedResource 저장을 asyncpg로 (이벤트 루프를 막지 않음)
+    DB_ASYNC_ENABLED: bool = False
+
+    # operation_logs / created_resources 월별 파티션 보관 (python init_db.py maintenance)
+    LOG_RETENTION_DAYS: int = 90                # 0이면 삭제하지 않음
+    CREATED_RESOURCES_RETENTION_DAYS: int = 0   # 0이면 삭제하지 않음 (삭제하면 재개/teardown 불가)
+    PARTITION_MONTHS_AHEAD: int = 2             # 미리 만들어 둘 다음 달 파티션 수
+
+    # asyncio 실행 모드 (AsyncExecutionEngine) 사용 여부와 전역 동시 요청 한도
+    PLANE_ASYNC_EXECUTION: bool = False
+    PLANE_ASYNC_MAX_IN_FLIGHT: int = 100
+    PLANE_ASYNC_MAX_PROJECTS: int = 4  # 동시에 파싱/실행할 프로젝트 수 (0이면 전체)
+
+    # 클라이언트 측 요청 제한 (RateLimiter)
+    PLANE_RATE_LIMIT: float = 0          # 기본 초당 요청 수 (0이면 토큰 제한 없음)
+    PLANE_RATE_BURST: int = 10
+    PLANE_RATE_LIMIT_RULES: dict = {}    # 예: {"gopedia": 1.0, "gopedia:work-items": 0.5}
+    PLANE_MAX_RETRIES: int = 5           # 429/503 재시도 횟수
+    PLANE_BACKOFF_BASE: float = 0.5
+    PLANE_BACKOFF_MAX: float = 30.0
+    PLANE_MIN_CONCURRENCY: int = 1       # 적응형 동시 요청 수 범위
+    PLANE_MAX_CONCURRENCY: int = 100
+    PLANE_LATENCY_TARGET: float = 2.0    # 이 지연(초)을 넘으면 동시 요청 수를 줄임
+
+    # 메타데이터 동기화 시 페이지당 항목 수 (Plane per_page, 최대 100)
+    PLANE_SYNC_PAGE_SIZE: int = 100
+
+    # 워크스페이스 동기화 (MetadataService.sync_workspace)
+    METADATA_SYNC_WORKERS: int = 8           # 상태를 동시에 동기화할 프로젝트 수
+    METADATA_AUTO_STATE_SYNC: bool = True    # 배치가 상태를 모르는 프로젝트를 만나면 먼저 동기화
+
+    # 메타데이터 캐시 (MetadataCache)
+    METADATA_CACHE_TTL: float = 300         # 초, 0이면 만료 없음 (sync 시에는 항상 비움)
+    METADATA_CACHE_MAX_PROJECTS: int = 256  # 상태 목록을 캐시할 최대 프로젝트 수
+    # Cycle owned_by로 쓸 멤버 email (YAML cycle에 owner가 없을 때, 둘 다 없으면 API 키 사용자)
+    PLANE_CYCLE_OWNER_EMAIL: Optional[str] = None
+    # 이슈의 Cycle/Module 연결을 이슈 요청마다 넣지 않고 Cycle/Module마다 한 번에 추가 (cycle-issues / module-issues)
+    PLANE_BULK_MEMBERSHIP: bool = True
+    # 메타데이터 스냅샷 파일 (메타데이터가 바뀔 때마다 워크스페이스별로 저장, 새 프로세스는 DB 조회 없이 캐시를 채움)
+    # 예: data/metadata.snapshot -> data/metadata.<workspace>.snapshot ({workspace}로 위치 지정 가능), 없으면 사용 안 함
+    METADATA_SNAPSHOT_PATH: Optional[str] = None
+    METADATA_SNAPSHOT_MAX_AGE: float = 86400        # 초, 이보다 오래된 스냅샷은 무시 (0이면 제한 없음)
+    # Plane 웹훅 (POST /webhooks/plane), secret이 없으면 엔드포인트는 503
+    PLANE_WEBHOOK_SECRET: Optional[str] = None
+    # 웹훅을 놓친 경우를 위한 주기적 전체 sync (API 서비스, 워크스페이스가 없으면 하지 않음)
+    METADATA_RECONCILE_WORKSPACES: list = []       # 예: ["gopedia"]
+    METADATA_RECONCILE_SECONDS: float = 3600
+
+    # 요청/단계별 시간 집계 (Metrics), 꺼져 있으면 측정하지 않음
+    PLANE_METRICS_ENABLED: bool = False
+    PLANE_METRICS_EXPORT_PATH: Optional[str] = None  # 배치 후 Prometheus 텍스트를 쓸 파일 경로
+
+    # sync_batches 작업 큐 (BatchQueue / QueueWorker)
+    BATCH_QUEUE_LEASE_SECONDS: float = 300     # heartbeat가 없으면 이 시간 뒤 다른 워커가 가져감
+    BATCH_QUEUE_HEARTBEAT_SECONDS: float = 30  # lease보다 충분히 짧게
+    BATCH_QUEUE_POLL_SECONDS: float = 5        # 큐가 비었을 때 다시 확인하는 주기
+    BATCH_QUEUE_MAX_ATTEMPTS: int = 3
+
+    # HTTP 서비스 모드 (app.api)
+    API_QUEUE_WORKERS: int = 2           # 프로세스 안에서 큐 배치를 실행할 워커 스레드 수 (0이면 등록만)
+    API_SYNC_WORKERS: int = 2            # 메타데이터 sync 작업 스레드 수
+    API_STATUS_POLL_SECONDS: float = 1.0  # SSE 상태 스트림의 DB 조회 주기
+
     @property
     def DATABASE_URL(self):
         return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def ASYNC_DATABASE_URL(self):
+        return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+
     class Config:
         env_file = ".env"
 
-settings = Settings()
+
+@lru_cache(maxsize=None)
+def get_settings():
+    """.env를 읽어 Settings 생성 (처음 호출할 때 한 번만)"""
+    return Settings()
+
+
+def __getattr__(name):
+    # `from app.core.config import settings`는 그대로 동작하되, import만으로는 .env를 읽지 않음
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
@@ -12,4 +12,20 @@ class APIConnectionError(PlaneManagerError):
 
 class DatabaseError(PlaneManagerError):
     """DB 작업 실패 시 발생"""
-    pass
\ No newline at end of file
+    pass
+
+class TemplateError(PlaneManagerError):
+    """배치 템플릿 확장 실패 시 발생 (변수/반복/include 오류)"""
+    pass
+
+class WebhookError(PlaneManagerError):
+    """웹훅 본문을 해석할 수 없을 때 발생"""
+    pass
+
+class LeaseLostError(PlaneManagerError):
+    """큐 배치의 lease를 다른 워커가 가져가 실행을 멈출 때 발생"""
+    pass
+
+class TeardownError(PlaneManagerError):
+    """배치 롤백에서 삭제하지 못한 리소스가 남았을 때 발생"""
+    pass
@@ -0,0 +1,182 @@
+# app/database/migrations.py
+"""순서대로 한 번씩 적용하는 스키마 마이그레이션 (Postgres)
+
+create_all은 없는 테이블만 만들기 때문에, 기존 DB의 컬럼/인덱스/파티션 변경은 여기서 적용한다.
+적용한 버전은 schema_migrations에 기록하고, 여러 워커가 동시에 실행해도
+advisory lock으로 한 프로세스만 적용한다.
+
+    python init_db.py            # create_all + migrate
+    python init_db.py migrate
+"""
+from datetime import date
+from sqlalchemy import text
+from app.database.partitions import ensure_partitions, is_partitioned, month_start, add_months
+
+MIGRATION_LOCK_ID = 7402118  # pg_advisory_xact_lock 키
+
+# 이전 변경에서 모델에 추가된 enum 값 (_add_enum_values가 트랜잭션 밖에서 추가)
+ENUM_VALUES = [
+    ("batchstatus", ("ROLLED_BACK", "QUEUED")),
+]
+
+
+def _add_enum_values(engine):
+    """ENUM_VALUES를 autocommit 연결에서 추가
+
+    PostgreSQL 12 미만은 ALTER TYPE ... ADD VALUE를 트랜잭션 블록 안에서 실행할 수 없으므로
+    advisory lock 트랜잭션 밖에서 실행한다. IF NOT EXISTS라 여러 프로세스가 동시에 실행해도 된다.
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for type_name, values in ENUM_VALUES:
+            if conn.execute(text("SELECT 1 FROM pg_type WHERE typname = :name"), {"name": type_name}).first() is None:
+                continue  # create_all 전이면 모델 정의대로 만들어짐
+            for value in values:
+                conn.execute(text(f"ALTER TYPE {type_name} ADD VALUE IF NOT EXISTS '{value}'"))
+
+
+def _catch_up_columns(conn):
+    """이전 변경에서 모델에 추가된 컬럼을 기존 DB에 반영 (enum 값은 _add_enum_values)"""
+    conn.execute(text("""
+        ALTER TABLE created_resources
+            ADD COLUMN IF NOT EXISTS node_key VARCHAR,
+            ADD COLUMN IF NOT EXISTS payload_hash VARCHAR,
+            ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMPTZ
+    """))
+    conn.execute(text("""
+        ALTER TABLE sync_batches
+            ADD COLUMN IF NOT EXISTS payload JSON,
+            ADD COLUMN IF NOT EXISTS group_id VARCHAR,
+            ADD COLUMN IF NOT EXISTS worker_id VARCHAR,
+            ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ,
+            ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMPTZ,
+            ADD COLUMN IF NOT EXISTS attempts INTEGER DEFAULT 0,
+            ADD COLUMN IF NOT EXISTS error VARCHAR
+    """))
+    conn.execute(text("ALTER TABLE plane_projects ADD COLUMN IF NOT EXISTS workspace_id VARCHAR"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_created_resources_node_key ON created_resources (node_key)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_sync_batches_group_id ON sync_batches (group_id)"))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_sync_batches_status_created_at ON sync_batches (status, created_at)"
+    ))
+
+
+def _lookup_indexes(conn):
+    """조회 경로 인덱스와 프로젝트 slug 유일 제약"""
+    duplicates = conn.execute(text("""
+        SELECT workspace_id, slug, count(*) FROM plane_projects
+        WHERE workspace_id IS NOT NULL AND slug IS NOT NULL
+        GROUP BY workspace_id, slug HAVING count(*) > 1
+    """)).fetchall()
+    if duplicates:
+        raise RuntimeError(
+            f"plane_projects에 중복 (workspace_id, slug)가 있습니다: {duplicates[:5]} "
+            "- sync_project_list(detect_deletions=True)로 정리한 뒤 다시 실행하세요"
+        )
+    for statement in (
+        "CREATE INDEX IF NOT EXISTS ix_plane_projects_slug ON plane_projects (slug)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_plane_projects_workspace_slug ON plane_projects (workspace_id, slug)",
+        'CREATE INDEX IF NOT EXISTS ix_plane_states_project_group ON plane_states (project_id, "group")',
+        "CREATE INDEX IF NOT EXISTS ix_sync_batches_template_name ON sync_batches (template_name)",
+        "CREATE INDEX IF NOT EXISTS ix_created_resources_batch_type ON created_resources (batch_id, resource_type)",
+        "CREATE INDEX IF NOT EXISTS ix_created_resources_plane_id ON created_resources (plane_id)",
+        "CREATE INDEX IF NOT EXISTS ix_operation_logs_batch_id ON operation_logs (batch_id)",
+        "CREATE INDEX IF NOT EXISTS ix_operation_logs_created_at ON operation_logs (created_at)",
+    ):
+        conn.execute(text(statement))
+
+
+def _partition_table(conn, table, indexes, foreign_keys=()):
+    """table을 created_at 월별 RANGE 파티션 테이블로 전환 (기존 행 복사, id 시퀀스 유지)
+
+    파티션 테이블의 PK에는 파티션 키가 포함되어야 하므로 PK는 (id, created_at)이 된다.
+    """
+    if is_partitioned(conn, table):
+        return
+
+    old = f"{table}_unpartitioned"
+    sequence = conn.execute(text("SELECT pg_get_serial_sequence(:table, 'id')"), {"table": table}).scalar()
+    conn.execute(text(f"UPDATE {table} SET created_at = now() WHERE created_at IS NULL"))
+    conn.execute(text(f"ALTER TABLE {table} RENAME TO {old}"))
+    conn.execute(text(f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)"))
+    conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN created_at SET NOT NULL"))
+    conn.execute(text(f"ALTER TABLE {table} ADD PRIMARY KEY (id, created_at)"))
+    for column, reference in foreign_keys:
+        conn.execute(text(f"ALTER TABLE {table} ADD FOREIGN KEY ({column}) REFERENCES {reference}"))
+
+    # 가장 오래된 행의 달부터 앞으로 쓸 달까지 파티션 생성 (범위 밖은 default 파티션)
+    oldest = conn.execute(text(f"SELECT min(created_at) FROM {old}")).scalar()
+    start = month_start(oldest.date() if oldest else date.today())
+    months = 0
+    while add_months(start, months) <= month_start(date.today()):
+        months += 1
+    ensure_partitions(conn, table, start=start, months=months + 2)
+
+    conn.execute(text(f"INSERT INTO {table} SELECT * FROM {old}"))
+    if sequence:
+        conn.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY NONE"))
+    conn.execute(text(f"DROP TABLE {old}"))
+    if sequence:
+        conn.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {table}.id"))
+    for name, columns in indexes:
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
+
+
+def _partition_operation_logs(conn):
+    _partition_table(conn, "operation_logs", [
+        ("ix_operation_logs_batch_id", "batch_id"),
+        ("ix_operation_logs_created_at", "created_at"),
+    ])
+
+
+def _partition_created_resources(conn):
+    _partition_table(conn, "created_resources", [
+        ("ix_created_resources_node_key", "node_key"),
+        ("ix_created_resources_batch_type", "batch_id, resource_type"),
+        ("ix_created_resources_plane_id", "plane_id"),
+    ], foreign_keys=[("batch_id", "sync_batches (id)")])
+
+
+def _created_resources_parent_index(conn):
+    # 파티션 테이블이면 각 파티션에도 같은 인덱스가 만들어짐
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_created_resources_parent_id ON created_resources (parent_id)"))
+
+
+# (버전, 이름, 함수) - 버전 순서대로 한 번씩 적용, 이미 배포된 항목은 수정하지 않고 새 버전을 추가
+MIGRATIONS = [
+    (1, "catch_up_columns", _catch_up_columns),
+    (2, "lookup_indexes", _lookup_indexes),
+    (3, "partition_operation_logs", _partition_operation_logs),
+    (4, "partition_created_resources", _partition_created_resources),
+    (5, "created_resources_parent_index", _created_resources_parent_index),
+]
+
+
+def migrate(engine):
+    """적용하지 않은 마이그레이션을 각각의 트랜잭션으로 적용하고 적용한 버전 목록을 반환"""
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                name VARCHAR NOT NULL,
+                applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            )
+        """))
+    _add_enum_values(engine)
+
+    applied = []
+    for version, name, apply in MIGRATIONS:
+        with engine.begin() as conn:
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_ID})
+            done = conn.execute(
+                text("SELECT 1 FROM schema_migrations WHERE version = :version"), {"version": version}
+            ).first()
+            if done:
+                continue
+            print(f"🔧 마이그레이션 {version:03d}_{name} 적용 중...")
+            apply(conn)
+            conn.execute(
+                text("INSERT INTO schema_migrations (version, name) VALUES (:version, :name)"),
+                {"version": version, "name": name},
+            )
+            applied.append(version)
+    return applied
@@ -1,5 +1,5 @@
 # app/database/models.py
-from sqlalchemy import Column, String, DateTime, JSON, ForeignKey, Integer, BigInteger, Enum
+from sqlalchemy import Column, String, DateTime, JSON, ForeignKey, Integer, BigInteger, Enum, Index
 import enum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -13,8 +13,9 @@ class LogTable(Base):
     step = Column(String)   # CONNECTION, CREATE, DELETE
     message = Column(String)
     details = Column(JSON, nullable=True)
-    batch_id = Column(String, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    batch_id = Column(String, nullable=True, index=True)
+    # 월별 파티션 키 (app/database/migrations.py에서 created_at 기준 RANGE 파티션으로 전환)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
 
 class PlaneMember(Base):
     __tablename__ = "plane_members"
@@ -29,31 +30,76 @@ class PlaneState(Base):
     name = Column(String) # 예: Todo, In Progress
     group = Column(String) # 예: backlog, unstarted, started, completed
 
+    # 기본 상태 선택 (project_id + group)
+    __table_args__ = (Index("ix_plane_states_project_group", "project_id", "group"),)
+
 class PlaneProject(Base):
     __tablename__ = "plane_projects"
     id = Column(String, primary_key=True) # Project UUID
     name = Column(String)
-    slug = Column(String)
+    slug = Column(String, index=True)
     workspace_id = Column(String, nullable=True)  # 선택적 필드로 변경
 
+    # 워크스페이스 안에서 identifier(slug)는 유일 (workspace_id를 모르는 행은 제외됨)
+    __table_args__ = (Index("uq_plane_projects_workspace_slug", "workspace_id", "slug", unique=True),)
+
+class SyncState(Base):
+    """메타데이터 동기화 watermark (워크스페이스/프로젝트 + 리소스 종류별)"""
+    __tablename__ = "sync_states"
+    workspace_slug = Column(String, primary_key=True)
+    project_id = Column(String, primary_key=True, default="")  # 워크스페이스 단위 리소스는 ""
+    resource_type = Column(String, primary_key=True)  # MEMBER, STATE, PROJECT
+    watermark = Column(DateTime(timezone=True), nullable=True)  # 마지막으로 본 updated_at
+    etag = Column(String, nullable=True)  # 한 페이지로 끝난 목록의 ETag
+    synced_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
 class BatchStatus(enum.Enum):
+    QUEUED = "QUEUED"  # BatchQueue에 등록되어 워커를 기다리는 중
     RUNNING = "RUNNING"
     COMPLETED = "COMPLETED"
     FAILED = "FAILED"
+    ROLLED_BACK = "ROLLED_BACK"  # TeardownEngine으로 생성한 리소스를 모두 삭제함
 
 class SyncBatch(Base):
     __tablename__ = "sync_batches"
     id = Column(String, primary_key=True) # UUID
-    template_name = Column(String)
+    template_name = Column(String, index=True)
     status = Column(Enum(BatchStatus), default=BatchStatus.RUNNING)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # BatchQueue 작업 큐 필드 (직접 실행한 배치는 비어 있음)
+    payload = Column(JSON, nullable=True)           # 실행할 YAML 데이터 (프로젝트별 분할 시 프로젝트 하나)
+    group_id = Column(String, nullable=True, index=True)  # 같은 YAML에서 분할된 배치 묶음
+    worker_id = Column(String, nullable=True)       # 현재 lease를 가진 워커 (host:pid)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    attempts = Column(Integer, default=0)
+    error = Column(String, nullable=True)
+
+    __table_args__ = (Index("ix_sync_batches_status_created_at", "status", "created_at"),)
 
 class CreatedResource(Base):
     __tablename__ = "created_resources"
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     batch_id = Column(String, ForeignKey("sync_batches.id"))
     resource_type = Column(String) # PROJECT, CYCLE, MODULE, ISSUE
-    plane_id = Column(String)      # Plane API에서 받은 UUID
+    plane_id = Column(String, index=True)  # Plane API에서 받은 UUID
     project_slug = Column(String)
-    parent_id = Column(String, nullable=True) # 하위 이슈 연결용
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    parent_id = Column(String, nullable=True, index=True) # 하위 이슈 연결용 (리포트 트리 조회 시 조인)
+    node_key = Column(String, nullable=True, index=True) # YAML 노드의 안정적인 키 (resume 시 중복 생성 방지)
+    payload_hash = Column(String, nullable=True) # 생성/수정 당시 YAML 노드 내용의 해시 (변경 감지용)
+    deleted_at = Column(DateTime(timezone=True), nullable=True) # TeardownEngine으로 Plane에서 삭제한 시각
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)  # 월별 파티션 키
+
+    __table_args__ = (Index("ix_created_resources_batch_type", "batch_id", "resource_type"),)
+
+class PendingLink(Base):
+    """보내지 못한 Cycle/Module 이슈 연결 (같은 배치/template을 다시 실행할 때 먼저 재전송)"""
+    __tablename__ = "pending_links"
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    batch_id = Column(String, ForeignKey("sync_batches.id"), index=True)
+    project_id = Column(String)
+    resource_type = Column(String)  # CYCLE, MODULE
+    target_id = Column(String)      # Cycle/Module UUID
+    issue_ids = Column(JSON)        # 연결할 이슈 UUID 목록
+    error = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
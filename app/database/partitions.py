@@ -0,0 +1,89 @@
+# app/database/partitions.py
+"""created_at 월별 파티션 생성과 보관 기간 정리 (Postgres)
+
+파티션 이름은 {table}_yYYYYmMM, 범위 밖의 행은 {table}_default에 들어간다.
+보관 기간이 지난 달은 DELETE 대신 파티션을 통째로 DROP 하므로 테이블이 커져도 정리 비용이 일정하다.
+"""
+from datetime import date, datetime, timedelta, timezone
+from sqlalchemy import text
+
+PARTITIONED_TABLES = ("operation_logs", "created_resources")
+
+
+def month_start(day: date):
+    return day.replace(day=1)
+
+
+def add_months(day: date, months: int):
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date):
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+def is_partitioned(conn, table: str):
+    return conn.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = :table)"
+    ), {"table": table}).scalar()
+
+
+def ensure_partitions(conn, table: str, start: date = None, months: int = 3):
+    """start가 속한 달부터 months개 월 파티션과 default 파티션을 (없으면) 생성"""
+    start = month_start(start or date.today())
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"))
+    for i in range(months):
+        lower = add_months(start, i)
+        upper = add_months(start, i + 1)
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {partition_name(table, lower)} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+        ))
+
+
+def apply_retention(conn, table: str, keep_days: int):
+    """keep_days보다 오래된 행 정리, 삭제한 파티션 이름 목록을 반환
+
+    상한이 기준일 이전인 월 파티션은 DROP, default 파티션과 파티션이 아닌 테이블은 DELETE.
+    """
+    if keep_days <= 0:
+        return []
+    cutoff = datetime.now(timezone.utc) - timedelta(days=keep_days)
+    if not is_partitioned(conn, table):
+        conn.execute(text(f"DELETE FROM {table} WHERE created_at < :cutoff"), {"cutoff": cutoff})
+        return []
+
+    children = conn.execute(text("""
+        SELECT c.relname FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class p ON p.oid = i.inhparent
+        WHERE p.relname = :table
+    """), {"table": table}).scalars()
+    dropped = []
+    for name in children:
+        suffix = name[len(table) + 1:]
+        if not (len(suffix) == 8 and suffix[0] == "y" and suffix[5] == "m"):
+            continue
+        upper = add_months(date(int(suffix[1:5]), int(suffix[6:8]), 1), 1)
+        if upper <= cutoff.date():
+            conn.execute(text(f"DROP TABLE {name}"))
+            dropped.append(name)
+    conn.execute(text(f"DELETE FROM {table}_default WHERE created_at < :cutoff"), {"cutoff": cutoff})
+    return dropped
+
+
+def run_maintenance(engine, settings):
+    """다음 달 파티션을 미리 만들고 보관 기간이 지난 파티션을 정리"""
+    retention = {
+        "operation_logs": settings.LOG_RETENTION_DAYS,
+        "created_resources": settings.CREATED_RESOURCES_RETENTION_DAYS,
+    }
+    for table in PARTITIONED_TABLES:
+        with engine.begin() as conn:
+            if is_partitioned(conn, table):
+                ensure_partitions(conn, table, months=settings.PARTITION_MONTHS_AHEAD + 1)
+            dropped = apply_retention(conn, table, retention[table])
+        if dropped:
+            print(f"🧹 {table}: 보관 기간이 지난 파티션 {len(dropped)}개 삭제 ({', '.join(dropped)})")
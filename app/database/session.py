@@ -1,8 +1,79 @@
 # app/database/session.py
+import threading
+from contextlib import contextmanager
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-from app.core.config import settings
+from sqlalchemy.orm import sessionmaker, scoped_session, declarative_base
+from app.core.config import get_settings
 
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def _pool_options():
+    """DB_POOL_* 설정으로 만든 커넥션 풀 옵션 (동기/비동기 엔진 공통)"""
+    settings = get_settings()
+    return dict(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """동기 엔진 (처음 호출할 때 설정을 읽고 생성)"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = create_engine(get_settings().DATABASE_URL, **_pool_options())
+    return _engine
+
+
+class _LazySessionmaker(sessionmaker):
+    """처음 Session을 만들 때 엔진을 생성해 bind (import만으로는 DB 설정을 읽지 않음)"""
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
+
+SessionLocal = _LazySessionmaker(autocommit=False, autoflush=False)
+# 스레드마다 하나의 Session (큐 워커, API 워커 스레드처럼 스레드가 오래 사는 경우)
+ScopedSession = scoped_session(SessionLocal)
 Base = declarative_base()
+
+
+def __getattr__(name):
+    # 기존 `from app.database.session import engine` 호환
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@contextmanager
+def session_scope(factory=SessionLocal):
+    """commit/rollback/close를 처리하는 Session 컨텍스트"""
+    db = factory()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+_async_sessionmaker = None
+
+
+def get_async_sessionmaker():
+    """asyncpg 기반 AsyncSession 팩토리 (처음 호출할 때 엔진 생성, asyncpg가 필요)"""
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+        async_engine = create_async_engine(get_settings().ASYNC_DATABASE_URL, **_pool_options())
+        _async_sessionmaker = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    return _async_sessionmaker
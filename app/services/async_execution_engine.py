@@ -0,0 +1,294 @@
+import asyncio
+from sqlalchemy import insert
+from app.database.models import CreatedResource
+from app.services.execution_engine import ExecutionEngine, child_keys, node_hash
+
+
+class _Skipped(Exception):
+    """배치에서 요청이 실패한 뒤라 보내지 않은 요청 (원래 오류 대신 올리지 않음)"""
+
+
+def _first_error(results):
+    """gather(return_exceptions=True) 결과에서 올릴 예외 (_Skipped보다 실제 오류 우선, 없으면 None)"""
+    errors = [r for r in results if isinstance(r, BaseException)]
+    return next((e for e in errors if not isinstance(e, _Skipped)), errors[0] if errors else None)
+
+
+class AsyncExecutionEngine(ExecutionEngine):
+    """asyncio 기반 ExecutionEngine
+
+    프로젝트, 그리고 각 프로젝트의 Cycle/Module/Issue 요청을 하나의 이벤트 루프에서
+    동시에 실행한다. 동시 요청 수는 AsyncPlaneClient의 max_in_flight로 제한된다.
+    DB 작업은 await 없이 루프 스레드에서만 실행되므로 하나의 Session을 공유해도 안전하다.
+    max_projects를 주면 projects를 그만큼씩만 꺼내 실행하므로, BatchStream처럼 프로젝트를
+    하나씩 파싱하는 입력에서도 메모리에 올라와 있는 프로젝트 수가 제한된다.
+    async_sessionmaker(asyncpg)를 주면 CreatedResource chunk 저장을 별도 AsyncSession 작업으로
+    넘겨, DB 왕복 동안에도 루프가 Plane 요청을 계속 처리한다.
+    """
+    def __init__(self, client, db, max_projects: int = None, async_sessionmaker=None, **kwargs):
+        super().__init__(client, db, **kwargs)
+        self.max_projects = max_projects  # 동시에 실행할 프로젝트 수 (None이면 전체)
+        self.async_sessionmaker = async_sessionmaker
+        self._flush_tasks = set()
+        self._failed = False  # 요청이 한 번이라도 실패하면 새 요청을 보내지 않음 (_request)
+
+    def execute_yaml(self, yaml_data: dict, batch_id: str = None, lease=None):
+        """동기 호출용 래퍼 (main.run_yaml_batch 호환)"""
+        async def run():
+            try:
+                return await self.execute_yaml_async(yaml_data, batch_id, lease)
+            finally:
+                await self.client.aclose()
+        return asyncio.run(run())
+
+    def execute_compiled(self, compiled, batch_id: str = None):
+        """CompiledBatch를 프로젝트 단위 중첩 dict로 되돌려 실행 (프로젝트 하나씩 만들어 max_projects 제한 유지)"""
+        return self.execute_yaml(compiled.as_yaml_data(), batch_id)
+
+    async def execute_yaml_async(self, yaml_data: dict, batch_id: str = None, lease=None):
+        workspace_slug = yaml_data.get("Workspace Slug")
+        self._lease = lease
+        batch = self._start_batch(yaml_data, batch_id)
+        batch_id = batch.id
+        self._failed = False
+
+        try:
+            rows = self._pending_links(batch)
+            if rows:
+                await self._send_links_async()
+                self._drop_pending_links(rows)
+            coros = (
+                self._execute_project_async(workspace_slug, p_data, batch_id)
+                for p_data in self.metrics.timed_iter(yaml_data.get("projects", []), "parse")
+            )
+            if self.max_projects:
+                await self._gather_bounded(coros, self.max_projects)
+            else:
+                await self._gather(*coros)
+            await self._drain_flushes()
+            self._complete_batch(batch)
+        except Exception as e:
+            try:
+                await self._send_links_async()
+                await self._drain_flushes()
+            except Exception as flush_error:
+                print(f"⚠️ CreatedResource 저장 실패: {flush_error}")
+            self._fail_batch(batch, e)
+            raise
+
+    async def _request(self, method: str, url: str, payload: dict):
+        """Plane 요청, 배치에서 이미 실패가 있었으면 보내지 않고 _Skipped (lease를 잃었으면 LeaseLostError)
+
+        실패 후에도 이미 보낸 요청은 취소하지 않는다. Plane이 받은 POST를 취소하면 CreatedResource를
+        기록하지 못해 resume 때 같은 노드를 다시 생성하기 때문이다 (스레드 _create_issues와 같은 방식).
+        """
+        if self._failed:
+            raise _Skipped()
+        if self._lease_lost():
+            self._failed = True
+            self._check_lease()
+        try:
+            return await getattr(self.client, method)(url, payload)
+        except Exception:
+            self._failed = True
+            raise
+
+    async def _gather(self, *coros):
+        """모든 작업이 끝날 때까지 기다린 뒤 결과 리스트 반환, 실패가 있으면 첫 오류를 올림"""
+        results = await asyncio.gather(*coros, return_exceptions=True)
+        error = _first_error(results)
+        if error is not None:
+            self._failed = True
+            raise error
+        return results
+
+    async def _gather_bounded(self, coros, limit: int):
+        """coros 이터레이터를 필요할 때만 꺼내며 최대 limit개씩 동시에 실행
+
+        실패하면 새 작업은 꺼내지 않고, 실행 중인 작업이 끝나기를 기다린 뒤 첫 오류를 올린다.
+        """
+        pending, results = set(), []
+
+        async def wait_one():
+            nonlocal pending
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                results.append(task.exception())
+                if task.exception() is not None:
+                    self._failed = True
+
+        for coro in coros:
+            while len(pending) >= limit:
+                await wait_one()
+            if self._failed:
+                coro.close()
+                break
+            pending.add(asyncio.ensure_future(coro))
+        while pending:
+            await wait_one()
+        error = _first_error(results)
+        if error is not None:
+            raise error
+
+    def _flush_resources(self):
+        """async_sessionmaker가 있으면 버퍼를 비동기 저장 작업으로 넘김 (완료는 _drain_flushes에서 대기)"""
+        if self.async_sessionmaker is None or not (self._pending_resources or self._pending_hashes):
+            return super()._flush_resources()
+        # 동기 Session의 변경(PlaneProject 등)은 바로 커밋해 트랜잭션을 오래 잡고 있지 않게 함
+        self.db.commit()
+        self._release_session_objects()
+        rows, self._pending_resources = self._pending_resources, []
+        hashes, self._pending_hashes = self._pending_hashes, []
+        task = asyncio.ensure_future(self._flush_async(rows, hashes))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush_async(self, rows, hashes):
+        with self.metrics.phase("db_flush"):
+            async with self.async_sessionmaker() as session:
+                if rows:
+                    await session.execute(insert(CreatedResource), rows)
+                if hashes:
+                    connection = await session.connection()
+                    await connection.execute(self._hash_update, hashes)
+                await session.commit()
+
+    async def _drain_flushes(self):
+        """남은 버퍼를 저장하고 진행 중인 저장 작업이 모두 끝날 때까지 대기"""
+        if self.async_sessionmaker is None:
+            return
+        self._flush_resources()
+        if self._flush_tasks:
+            await asyncio.gather(*list(self._flush_tasks))
+
+    async def _execute_project_async(self, workspace_slug, p_data, batch_id):
+        with self.metrics.phase("project"):
+            project_key = self._project_key(workspace_slug, p_data)
+            project_id = self._known.get(project_key) or self._query_project_by_slug(workspace_slug, p_data["slug"])
+            if not project_id:
+                url = f"{self.client.base_url}/workspaces/{workspace_slug}/projects/"
+                res = await self._request("post", url, self._project_payload(p_data))
+                self._save_project(res, p_data, batch_id, workspace_slug)
+                project_id = res['id']
+
+            state_id = await self._default_state_id_async(project_id)
+            project_slug = self._project_slug(project_id)
+
+        cycle_map, module_map = await self._gather(
+            self._create_cycles_async(workspace_slug, project_id, p_data.get("cycles", []), batch_id, p_data["slug"]),
+            self._create_modules_async(workspace_slug, project_id, p_data.get("modules", []), batch_id, p_data["slug"]),
+        )
+
+        url = f"{self.client.base_url}/workspaces/{workspace_slug}/projects/{project_id}/work-items/"
+        issues = p_data.get("issues", [])
+        with self.metrics.phase("issues"):
+            await self._gather(*(
+                self._create_issue_tree_async(url, i_data, batch_id, project_slug, state_id, cycle_map, module_map,
+                                              key=key, project_id=project_id)
+                for i_data, key in zip(issues, child_keys(project_key, "issue", issues))
+            ))
+        await self._send_links_async(project_id)
+
+    async def _send_links_async(self, project_id=None):
+        """_send_links의 비동기 버전 (다른 프로젝트가 동시에 실행 중이므로 이 프로젝트의 연결만 전송)"""
+        requests = self._link_requests(project_id)
+        if not requests:
+            return
+        with self.metrics.phase("links"):
+            results = await asyncio.gather(
+                *(self.client.post(url, payload) for *_, url, payload in requests), return_exceptions=True
+            )
+        for (*request, _, _), result in zip(requests, results):
+            if isinstance(result, Exception):
+                self._record_link_failure(*request, result)
+
+    async def _default_state_id_async(self, project_id):
+        """_default_state_id와 같지만 상태 동기화(동기 client)는 스레드에서 실행해 루프를 막지 않음"""
+        state_id = self.cache.default_state_id(self.db, project_id)
+        if state_id is None and self._needs_state_sync(project_id):
+            with self.metrics.phase("state_sync"):
+                await asyncio.to_thread(self.state_sync, self._workspace_slug, [project_id])
+                self._metadata_dirty = True
+            state_id = self.cache.default_state_id(self.db, project_id)
+        return state_id
+
+    async def _create_cycles_async(self, workspace_slug, project_id, cycles_data, batch_id, project_slug):
+        """Cycles를 동시에 생성하고 이름->ID 매핑 반환 (이미 생성된 Cycle은 기록된 ID 사용)"""
+        url = f"{self.client.base_url}/workspaces/{workspace_slug}/projects/{project_id}/cycles/"
+        keys = child_keys(f"{workspace_slug}/{project_slug}", "cycle", cycles_data)
+        cycle_map = {data["name"]: self._known[key] for data, key in zip(cycles_data, keys) if key in self._known}
+        todo = [(data, key) for data, key in zip(cycles_data, keys) if key not in self._known]
+        updates = [(data, key) for data, key in zip(cycles_data, keys) if key in self._updates]
+        with self.metrics.phase("cycles"):
+            # 하나가 실패해도 나머지 응답은 기다려 기록한 뒤 오류를 올림
+            results = await asyncio.gather(
+                *(self._request("post", url, self._cycle_payload(project_id, cycle_data)) for cycle_data, _ in todo),
+                *(self._request("patch", f"{url}{self._known[key]}/", self._cycle_payload(project_id, cycle_data))
+                  for cycle_data, key in updates),
+                return_exceptions=True,
+            )
+        for (cycle_data, key), res in zip(todo, results):
+            if not isinstance(res, BaseException):
+                cycle_map[cycle_data["name"]] = res.get('id')
+                self._record_resource(batch_id, "CYCLE", res.get('id'), project_slug, node_key=key,
+                                      payload_hash=node_hash(cycle_data))
+        for (cycle_data, key), res in zip(updates, results[len(todo):]):
+            if not isinstance(res, BaseException):
+                self._record_update(key, node_hash(cycle_data))
+        error = _first_error(results)
+        if error is not None:
+            raise error
+        return cycle_map
+
+    async def _create_modules_async(self, workspace_slug, project_id, modules_data, batch_id, project_slug):
+        """Modules를 동시에 생성하고 이름->ID 매핑 반환 (이미 생성된 Module은 기록된 ID 사용)"""
+        url = f"{self.client.base_url}/workspaces/{workspace_slug}/projects/{project_id}/modules/"
+        keys = child_keys(f"{workspace_slug}/{project_slug}", "module", modules_data)
+        module_map = {data["name"]: self._known[key] for data, key in zip(modules_data, keys) if key in self._known}
+        todo = [(data, key) for data, key in zip(modules_data, keys) if key not in self._known]
+        updates = [(data, key) for data, key in zip(modules_data, keys) if key in self._updates]
+        with self.metrics.phase("modules"):
+            # 하나가 실패해도 나머지 응답은 기다려 기록한 뒤 오류를 올림
+            results = await asyncio.gather(
+                *(self._request("post", url, self._module_payload(module_data)) for module_data, _ in todo),
+                *(self._request("patch", f"{url}{self._known[key]}/", self._module_payload(module_data))
+                  for module_data, key in updates),
+                return_exceptions=True,
+            )
+        for (module_data, key), res in zip(todo, results):
+            if not isinstance(res, BaseException):
+                module_map[module_data["name"]] = res.get('id')
+                self._record_resource(batch_id, "MODULE", res.get('id'), project_slug, node_key=key,
+                                      payload_hash=node_hash(module_data))
+        for (module_data, key), res in zip(updates, results[len(todo):]):
+            if not isinstance(res, BaseException):
+                self._record_update(key, node_hash(module_data))
+        error = _first_error(results)
+        if error is not None:
+            raise error
+        return module_map
+
+    async def _create_issue_tree_async(self, url, i_data, batch_id, project_slug, state_id, cycle_map, module_map,
+                                       parent_id=None, key=None, project_id=None):
+        """이슈를 생성한 뒤 하위 이슈들을 동시에 생성 (이미 생성된 이슈는 기록된 ID 사용, 변경된 경우만 PATCH)"""
+        if key in self._known:
+            issue_id = self._known[key]
+            if key in self._updates:
+                await self._request("patch", f"{url}{issue_id}/", self._issue_update_payload(i_data, cycle_map, module_map, parent_id))
+                self._record_update(key, node_hash(i_data))
+                self._link_issue(project_id, issue_id, cycle_map.get(i_data.get("cycle")),
+                                 module_map.get(i_data.get("module")))
+        else:
+            res = await self._request("post", url, self._issue_payload(i_data, state_id, cycle_map, module_map, parent_id))
+            issue_id = res['id']
+            self._record_resource(batch_id, "ISSUE", issue_id, project_slug, parent_id, node_key=key,
+                                  payload_hash=node_hash(i_data))
+            self._link_issue(project_id, issue_id, cycle_map.get(i_data.get("cycle")),
+                             module_map.get(i_data.get("module")))
+
+        children = i_data.get("sub_issues", [])
+        await self._gather(*(
+            self._create_issue_tree_async(url, child, batch_id, project_slug, state_id, cycle_map, module_map,
+                                          issue_id, child_key, project_id)
+            for child, child_key in zip(children, child_keys(key, "issue", children))
+        ))
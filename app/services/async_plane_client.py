@@ -0,0 +1,148 @@
+# app/services/async_plane_client.py
+import asyncio
+import time
+import httpx
+from app.core.errors import APIConnectionError
+from app.services.rate_limiter import RateLimiter
+from app.services.metrics import Metrics
+
+class AsyncPlaneClient:
+    """PlaneClient의 asyncio 버전
+
+    하나의 이벤트 루프에서 동시에 처리 중인 요청 수를 max_in_flight로 제한한다.
+    httpx.AsyncClient는 처음 사용하는 이벤트 루프에 묶이므로, 루프가 바뀌면 다시 만든다.
+    """
+    def __init__(self, base_url: str, api_key: str, max_in_flight: int = 100,
+                 keep_alive: bool = True, timeout: float = 30, limiter: RateLimiter = None, metrics: Metrics = None):
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.headers = {"x-api-key": api_key}
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+        self.metrics = metrics  # None이면 요청 시간을 재지 않음
+        self.limiter = limiter
+        self.limits = httpx.Limits(
+            max_connections=max_in_flight,
+            max_keepalive_connections=max_in_flight if keep_alive else 0,
+        )
+        self._http = None
+        self._semaphore = None
+        self._loop = None
+
+    @classmethod
+    def from_settings(cls, settings, limiter: RateLimiter = None, metrics: Metrics = None):
+        """Settings 값으로 클라이언트 생성"""
+        return cls(
+            settings.PLANE_API_BASE_URL,
+            settings.PLANE_API_KEY,
+            max_in_flight=settings.PLANE_ASYNC_MAX_IN_FLIGHT,
+            keep_alive=settings.PLANE_HTTP_KEEP_ALIVE,
+            timeout=settings.PLANE_HTTP_TIMEOUT,
+            limiter=limiter or RateLimiter.from_settings(settings),
+            metrics=metrics,
+        )
+
+    def _session(self):
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._loop is not loop:
+            self._http = httpx.AsyncClient(headers=self.headers, limits=self.limits, timeout=self.timeout)
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._loop = loop
+        return self._http
+
+    async def aclose(self):
+        if self._http is not None:
+            await self._http.aclose()
+        self._http = None
+        self._semaphore = None
+        self._loop = None
+
+    def close(self):
+        """동기 코드용 정리 (execute_yaml 래퍼는 종료 시 이미 aclose를 호출함)"""
+        if self._http is not None and not self._loop.is_closed():
+            self._loop.run_until_complete(self.aclose())
+        self._http = None
+        self._semaphore = None
+        self._loop = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def test_connection(self, workspace_slug: str):
+        """Workspace 정보를 조회하여 연결 확인"""
+        url = f"{self.base_url}/workspaces/{workspace_slug}/projects/"
+        try:
+            return await self.get(url)
+        except APIConnectionError as e:
+            raise APIConnectionError(f"Plane 연결 실패: {e.message}", {"slug": workspace_slug})
+
+    async def request(self, method: str, url: str, payload: dict = None, params: dict = None, headers: dict = None):
+        """요청을 보내고 JSON 응답을 반환 (본문이 없으면 None)
+
+        limiter가 있으면 토큰/동시성 제한을 거치고, 429/503은 Retry-After 또는 백오프 후 재시도한다.
+        POST는 429, 또는 Retry-After가 있는 503만 재시도한다 (RateLimiter.should_retry).
+        """
+        http = self._session()
+        metrics = self.metrics
+        started = time.perf_counter() if metrics is not None else 0.0
+        attempt = 0
+        while True:
+            response = None
+            try:
+                response = await self._send(http, method, url, payload, params, headers)
+                if self.limiter is not None and self.limiter.should_retry(
+                        method, response.status_code, response.headers.get("Retry-After"), attempt):
+                    delay = self.limiter.on_throttle(url, response.headers.get("Retry-After"), attempt)
+                    print(f"⏳ Plane {response.status_code} 응답, {delay:.1f}초 후 재시도 ({attempt + 1}/{self.limiter.max_retries}): {url}")
+                    attempt += 1
+                    continue
+                response.raise_for_status()
+                if metrics is not None:
+                    metrics.record_request(method, url, response.status_code, time.perf_counter() - started, attempt)
+                if not response.content:
+                    return None
+                return response.json()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                details = {"url": url, "method": method, "payload": payload, "attempts": attempt + 1}
+                if response is not None:
+                    details["status_code"] = response.status_code
+                if metrics is not None:
+                    metrics.record_request(method, url, details.get("status_code", "error"),
+                                           time.perf_counter() - started, attempt)
+                raise APIConnectionError(f"Plane {method} 요청 실패: {str(e)}", details)
+
+    async def _send(self, http, method, url, payload, params, headers):
+        async with self._semaphore:
+            if self.limiter is None:
+                return await http.request(method, url, json=payload, params=params, headers=headers)
+
+            # 버킷 차단(Retry-After) 또는 토큰 부족 시 대기
+            wait = self.limiter.bucket(url).reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            await self.limiter.acquire_async()
+            try:
+                started = time.monotonic()
+                response = await http.request(method, url, json=payload, params=params, headers=headers)
+            finally:
+                self.limiter.release()
+            if response.status_code not in self.limiter.RETRY_STATUS:
+                self.limiter.on_success(time.monotonic() - started)
+            return response
+
+    async def get(self, url: str, params: dict = None, headers: dict = None):
+        return await self.request("GET", url, params=params, headers=headers)
+
+    async def post(self, url: str, payload: dict, headers: dict = None):
+        return await self.request("POST", url, payload=payload, headers=headers)
+
+    async def patch(self, url: str, payload: dict, headers: dict = None):
+        return await self.request("PATCH", url, payload=payload, headers=headers)
+
+    async def delete(self, url: str, headers: dict = None):
+        return await self.request("DELETE", url, headers=headers)
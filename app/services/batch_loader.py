@@ -0,0 +1,150 @@
+# app/services/batch_loader.py
+import sys
+import yaml
+from yaml.events import (
+    AliasEvent, ScalarEvent, SequenceStartEvent, SequenceEndEvent, MappingStartEvent, MappingEndEvent,
+)
+from yaml.nodes import ScalarNode
+
+# libyaml이 설치되어 있으면 C 파서 사용
+try:
+    from yaml import CSafeLoader as Loader
+except ImportError:
+    from yaml import SafeLoader as Loader
+
+STR_TAG = "tag:yaml.org,2002:str"
+MERGE_TAG = "tag:yaml.org,2002:merge"
+_MERGE = object()
+
+# 스트리밍을 시작하려면 projects보다 먼저 나와야 하는 헤더 필드
+REQUIRED_HEADER = ("Workspace Slug",)
+
+
+class BatchStream:
+    """YAML 배치 파일을 프로젝트 단위로 읽는 스트리밍 로더
+
+    projects 이전의 최상위 필드(Workspace Slug, batch_name 등)는 header로 먼저 읽고,
+    projects 항목은 하나씩 파싱해서 yield한다. 파싱은 이벤트에서 바로 dict/list를 만들며
+    (노드 트리를 만들지 않음) 매핑 키는 intern해서 수만 개 이슈의 중복 문자열을 공유한다.
+    헤더 필드가 projects 뒤에 있는 등 스트리밍할 수 없는 파일은 전체를 한 번에 읽는다.
+
+        with BatchStream("data/batch.yaml") as stream:
+            engine.execute_yaml(stream.as_yaml_data())
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.header = {}
+        self._file = open(path, 'r', encoding='utf-8')
+        self._loader = Loader(self._file)
+        self._anchors = {}
+        self._projects = None   # 스트리밍할 수 없을 때 전체 로드한 projects 리스트
+        try:
+            self._streaming = self._read_header()
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        self._loader.dispose()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def as_yaml_data(self):
+        """execute_yaml에 넘길 dict (projects는 한 번만 순회 가능한 제너레이터)"""
+        return dict(self.header, projects=self.projects())
+
+    def projects(self):
+        """projects 항목을 하나씩 파싱해서 yield"""
+        if not self._streaming:
+            yield from self._projects or []
+            return
+        self._streaming = False
+        loader = self._loader
+        while not loader.check_event(SequenceEndEvent):
+            yield self._build()
+        loader.get_event()
+        # projects 뒤에 남은 최상위 필드
+        while not loader.check_event(MappingEndEvent):
+            key = self._build()
+            self.header[key] = self._build()
+
+    def _read_header(self):
+        """projects 시퀀스 직전까지 읽고, 프로젝트를 스트리밍할 수 있으면 True"""
+        loader = self._loader
+        loader.get_event()  # StreamStart
+        if loader.check_event(yaml.DocumentStartEvent):
+            loader.get_event()
+            if loader.check_event(MappingStartEvent):
+                loader.get_event()
+                while not loader.check_event(MappingEndEvent):
+                    key = self._build()
+                    if key == "projects" and loader.check_event(SequenceStartEvent):
+                        if all(field in self.header for field in REQUIRED_HEADER):
+                            loader.get_event()
+                            return True
+                        break
+                    self.header[key] = self._build()
+                else:
+                    return False
+        # 스트리밍할 수 없는 구조이면 처음부터 전체 로드
+        self._file.seek(0)
+        data = yaml.load(self._file, Loader=Loader) or {}
+        if not isinstance(data, dict):
+            raise ValueError(f"YAML 최상위는 매핑이어야 합니다: {self.path}")
+        self._projects = data.pop("projects", None)
+        self.header = data
+        return False
+
+    def _build(self):
+        """다음 이벤트부터 값 하나를 Python 객체로 만듦"""
+        loader = self._loader
+        event = loader.get_event()
+        if isinstance(event, AliasEvent):
+            return self._anchors[event.anchor]
+        if isinstance(event, ScalarEvent):
+            value = self._scalar(event)
+        elif isinstance(event, SequenceStartEvent):
+            value = []
+            if event.anchor:
+                self._anchors[event.anchor] = value
+            while not loader.check_event(SequenceEndEvent):
+                value.append(self._build())
+            loader.get_event()
+        elif isinstance(event, MappingStartEvent):
+            value = {}
+            if event.anchor:
+                self._anchors[event.anchor] = value
+            while not loader.check_event(MappingEndEvent):
+                key = self._build()
+                item = self._build()
+                if key is _MERGE:
+                    # << 병합: 명시된 키가 우선
+                    for merged in (item if isinstance(item, list) else [item]):
+                        for k, v in merged.items():
+                            value.setdefault(k, v)
+                else:
+                    value[sys.intern(key) if isinstance(key, str) else key] = item
+            loader.get_event()
+        else:
+            raise yaml.YAMLError(f"예상하지 못한 YAML 이벤트: {event}")
+        if event.anchor and isinstance(event, ScalarEvent):
+            self._anchors[event.anchor] = value
+        return value
+
+    def _scalar(self, event):
+        loader = self._loader
+        tag = event.tag
+        if tag is None or tag == "!":
+            tag = loader.resolve(ScalarNode, event.value, event.implicit)
+        if tag == STR_TAG:
+            return event.value
+        if tag == MERGE_TAG:
+            return _MERGE
+        node = ScalarNode(tag, event.value, event.start_mark, event.end_mark, event.style)
+        constructor = loader.yaml_constructors.get(tag, loader.yaml_constructors[None])
+        return constructor(loader, node)
@@ -0,0 +1,308 @@
+# app/services/batch_queue.py
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import namedtuple
+from datetime import timedelta
+from sqlalchemy import or_, and_, func
+from app.database.models import SyncBatch, CreatedResource, BatchStatus
+
+# claim으로 가져온 배치 (세션과 분리된 값)
+ClaimedBatch = namedtuple("ClaimedBatch", "id template_name payload attempts")
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class BatchLease:
+    """워커가 잡은 배치의 lease (ExecutionEngine.execute_yaml에 넘김)
+
+    heartbeat 스레드가 lease를 잃었다고 판단하면 lost를 set하고, 엔진은 다음 프로젝트/이슈 요청 전에 멈춘다.
+    """
+    def __init__(self, batch_id: str, worker_id: str):
+        self.batch_id = batch_id
+        self.worker_id = worker_id
+        self.lost = threading.Event()
+
+
+class BatchQueue:
+    """sync_batches를 작업 큐로 사용
+
+    enqueue는 YAML 데이터를 QUEUED 배치로 저장하고(split_projects이면 프로젝트마다 한 행),
+    워커는 claim에서 SELECT ... FOR UPDATE SKIP LOCKED로 배치 하나를 잡아 lease를 건다.
+    lease는 heartbeat로 연장하며, 워커가 죽어 lease가 만료된 배치는 다른 워커가 다시 잡아
+    같은 batch_id로 이어서 실행한다 (이미 기록된 노드는 ExecutionEngine이 건너뜀).
+    시각은 모두 DB의 now() 기준이라 여러 호스트의 시계 차이에 영향을 받지 않는다.
+    """
+    def __init__(self, session_factory, lease_seconds: float = 300, max_attempts: int = 3):
+        self.session_factory = session_factory
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+    @classmethod
+    def from_settings(cls, settings, session_factory):
+        return cls(
+            session_factory,
+            lease_seconds=settings.BATCH_QUEUE_LEASE_SECONDS,
+            max_attempts=settings.BATCH_QUEUE_MAX_ATTEMPTS,
+        )
+
+    def _lease_deadline(self):
+        return func.now() + timedelta(seconds=self.lease_seconds)
+
+    def enqueue(self, yaml_data: dict, split_projects: bool = False, group_id: str = None):
+        """YAML 데이터를 큐에 넣고 생성한 batch id 목록을 반환
+
+        split_projects이면 프로젝트마다 배치를 만들어 여러 워커가 나눠 실행한다.
+        projects가 BatchStream 제너레이터여도 프로젝트 하나씩만 메모리에 올린다.
+        """
+        header = {k: v for k, v in yaml_data.items() if k != "projects"}
+        template_name = yaml_data.get("batch_name")
+        group_id = group_id or str(uuid.uuid4())
+        db = self.session_factory()
+        try:
+            if split_projects:
+                payloads = (dict(header, projects=[p_data]) for p_data in yaml_data.get("projects", []))
+            else:
+                payloads = [dict(header, projects=list(yaml_data.get("projects", [])))]
+            ids = []
+            for payload in payloads:
+                batch = SyncBatch(
+                    id=str(uuid.uuid4()), template_name=template_name, status=BatchStatus.QUEUED,
+                    payload=_json_safe(payload), group_id=group_id, attempts=0,
+                )
+                db.add(batch)
+                ids.append(batch.id)
+            db.commit()
+            return ids
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def claim(self, worker_id: str):
+        """대기 중이거나 lease가 만료된 배치 하나에 lease를 걸고 반환 (없으면 None)"""
+        db = self.session_factory()
+        try:
+            # lease가 만료됐지만 재시도 한도를 넘은 배치는 실패 처리
+            db.query(SyncBatch).filter(
+                SyncBatch.status == BatchStatus.RUNNING,
+                SyncBatch.lease_expires_at < func.now(),
+                SyncBatch.attempts >= self.max_attempts,
+            ).update({
+                SyncBatch.status: BatchStatus.FAILED,
+                SyncBatch.worker_id: None,
+                SyncBatch.lease_expires_at: None,
+                SyncBatch.error: "lease 만료 (재시도 한도 초과)",
+            }, synchronize_session=False)
+
+            batch = (
+                db.query(SyncBatch)
+                .filter(
+                    SyncBatch.payload.isnot(None),
+                    or_(
+                        SyncBatch.status == BatchStatus.QUEUED,
+                        and_(SyncBatch.status == BatchStatus.RUNNING, SyncBatch.lease_expires_at < func.now()),
+                    ),
+                )
+                .order_by(SyncBatch.created_at)
+                .with_for_update(skip_locked=True)
+                .first()
+            )
+            if batch is None:
+                db.commit()
+                return None
+            if batch.worker_id:
+                print(f"⚠️ 워커 {batch.worker_id}의 lease가 만료된 배치를 이어서 실행합니다: {batch.id}")
+            batch.status = BatchStatus.RUNNING
+            batch.worker_id = worker_id
+            batch.attempts = (batch.attempts or 0) + 1
+            batch.heartbeat_at = func.now()
+            batch.lease_expires_at = self._lease_deadline()
+            claimed = ClaimedBatch(batch.id, batch.template_name, batch.payload, batch.attempts)
+            db.commit()
+            return claimed
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def heartbeat(self, batch_id: str, worker_id: str):
+        """lease 연장, 다른 워커에게 넘어갔으면 False"""
+        db = self.session_factory()
+        try:
+            renewed = db.query(SyncBatch).filter(
+                SyncBatch.id == batch_id, SyncBatch.worker_id == worker_id, SyncBatch.status == BatchStatus.RUNNING,
+            ).update({
+                SyncBatch.heartbeat_at: func.now(),
+                SyncBatch.lease_expires_at: self._lease_deadline(),
+            }, synchronize_session=False)
+            db.commit()
+            return renewed == 1
+        finally:
+            db.close()
+
+    def finish(self, batch_id: str, worker_id: str, error: Exception = None):
+        """lease 해제, 실패했고 재시도 한도가 남았으면 다시 QUEUED로"""
+        db = self.session_factory()
+        try:
+            batch = (
+                db.query(SyncBatch)
+                .filter(SyncBatch.id == batch_id, SyncBatch.worker_id == worker_id)
+                .with_for_update()
+                .first()
+            )
+            if batch is None:
+                print(f"⚠️ lease를 잃은 배치입니다 (다른 워커가 이어서 실행): {batch_id}")
+                return
+            batch.worker_id = None
+            batch.lease_expires_at = None
+            if error is not None:
+                batch.error = str(error)[:2000]
+                if batch.attempts < self.max_attempts:
+                    batch.status = BatchStatus.QUEUED
+                else:
+                    batch.status = BatchStatus.FAILED
+            db.commit()
+        finally:
+            db.close()
+
+    def batch_status(self, batch_id: str):
+        """배치 상태와 리소스 종류별 생성 개수 (없으면 None)"""
+        db = self.session_factory()
+        try:
+            batch = db.get(SyncBatch, batch_id)
+            if batch is None:
+                return None
+            counts = (
+                db.query(CreatedResource.resource_type, func.count(CreatedResource.id))
+                .filter(CreatedResource.batch_id == batch_id, CreatedResource.deleted_at.is_(None))
+                .group_by(CreatedResource.resource_type)
+            )
+            return dict(_batch_row(batch), created={resource_type: count for resource_type, count in counts})
+        finally:
+            db.close()
+
+    def recent_batches(self, limit: int = 20):
+        """최근 생성된 배치 목록 (생성 개수 제외)"""
+        db = self.session_factory()
+        try:
+            batches = db.query(SyncBatch).order_by(SyncBatch.created_at.desc()).limit(limit)
+            return [_batch_row(batch) for batch in batches]
+        finally:
+            db.close()
+
+    def group_status(self, group_id: str):
+        """분할된 배치 묶음의 상태별 개수, 예) {"COMPLETED": 3, "RUNNING": 1}"""
+        db = self.session_factory()
+        try:
+            rows = (
+                db.query(SyncBatch.status, func.count(SyncBatch.id))
+                .filter(SyncBatch.group_id == group_id)
+                .group_by(SyncBatch.status)
+            )
+            return {status.value: count for status, count in rows}
+        finally:
+            db.close()
+
+
+class QueueWorker:
+    """BatchQueue에서 배치를 하나씩 잡아 실행하는 워커 (프로세스/호스트마다 하나씩 띄움)
+
+    engine_factory(db)는 (client, engine)을 반환해야 한다 (main._build_engine).
+    실행 중에는 별도 스레드가 heartbeat_interval마다 lease를 연장하고, 다른 워커가 가져갔거나
+    연장하지 못한 채 만료가 다가오면 BatchLease.lost로 엔진을 멈춘다.
+    close_client=False이면 배치가 끝나도 client를 닫지 않는다 (서비스에서 공유하는 client).
+    """
+    def __init__(self, queue: BatchQueue, engine_factory, worker_id: str = None,
+                 poll_interval: float = 5.0, heartbeat_interval: float = 30.0, close_client: bool = True):
+        self.queue = queue
+        self.engine_factory = engine_factory
+        self.close_client = close_client
+        self.worker_id = worker_id or default_worker_id()
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self._stop = threading.Event()
+
+    def stop(self):
+        """현재 배치를 마친 뒤 run 루프 종료"""
+        self._stop.set()
+
+    def run(self, max_batches: int = None, stop_when_idle: bool = False):
+        """배치를 처리하고 처리한 개수를 반환"""
+        processed = 0
+        print(f"👷 워커 시작: {self.worker_id}")
+        while not self._stop.is_set() and (max_batches is None or processed < max_batches):
+            claimed = self.queue.claim(self.worker_id)
+            if claimed is None:
+                if stop_when_idle:
+                    break
+                self._stop.wait(self.poll_interval)
+                continue
+            self.run_one(claimed)
+            processed += 1
+        return processed
+
+    def run_one(self, claimed: ClaimedBatch):
+        print(f"--- 배치 실행 ({claimed.attempts}번째 시도): {claimed.id} ---")
+        db = self.queue.session_factory()
+        client, engine = self.engine_factory(db)
+        lease = BatchLease(claimed.id, self.worker_id)
+        done = threading.Event()
+        beat = threading.Thread(target=self._heartbeat, args=(lease, done), daemon=True)
+        beat.start()
+        error = None
+        try:
+            engine.execute_yaml(claimed.payload, batch_id=claimed.id, lease=lease)
+            print(f"✅ 배치 완료: {claimed.id}")
+        except Exception as e:
+            error = e
+            print(f"❌ 배치 실패: {claimed.id} ({e})")
+        finally:
+            done.set()
+            beat.join()
+            db.close()
+            if self.close_client:
+                client.close()
+            self.queue.finish(claimed.id, self.worker_id, error)
+
+    def _heartbeat(self, lease: BatchLease, done):
+        # 마지막으로 연장한 lease가 끝나는 시각 (로컬 시계, 다음 heartbeat 전에 끝나면 먼저 멈춤)
+        deadline = time.monotonic() + self.queue.lease_seconds
+        while not done.wait(self.heartbeat_interval):
+            try:
+                if not self.queue.heartbeat(lease.batch_id, lease.worker_id):
+                    print(f"⚠️ 배치 lease를 잃었습니다: {lease.batch_id}")
+                    lease.lost.set()
+                    return
+                deadline = time.monotonic() + self.queue.lease_seconds
+            except Exception as e:
+                if time.monotonic() + self.heartbeat_interval >= deadline:
+                    print(f"⚠️ heartbeat 실패로 lease가 만료되기 전에 배치를 멈춥니다: {lease.batch_id} ({e})")
+                    lease.lost.set()
+                    return
+                print(f"⚠️ heartbeat 실패 (다음 주기에 재시도): {e}")
+
+
+def _batch_row(batch: SyncBatch):
+    return {
+        "id": batch.id,
+        "template_name": batch.template_name,
+        "group_id": batch.group_id,
+        "status": batch.status.value,
+        "attempts": batch.attempts,
+        "worker_id": batch.worker_id,
+        "heartbeat_at": batch.heartbeat_at.isoformat() if batch.heartbeat_at else None,
+        "error": batch.error,
+    }
+
+
+def _json_safe(data):
+    """JSON 컬럼에 넣을 수 있게 변환 (YAML의 date 등은 문자열로, node_hash와 같은 규칙)"""
+    return json.loads(json.dumps(data, default=str))
@@ -0,0 +1,165 @@
+# app/services/batch_report.py
+"""created_resources 리포트 / 내보내기
+
+배치(batch_id) 또는 생성 시각 범위의 created_resources를 ORM 객체 없이 컬럼 튜플로,
+서버 측 커서(stream_results + yield_per)로 fetch_size개씩 받아 바로 내보낸다.
+행 수와 관계없이 메모리에는 한 묶음만 올라온다.
+
+- iter_rows: 행 dict (tree이면 parent_id로 이은 트리를 깊이 우선 순서로, depth 포함)
+- iter_jsonl / iter_csv: 여러 행을 모은 텍스트 조각 (파일이나 StreamingResponse로 그대로 씀)
+- summary: resource_type별 개수 (삭제된 리소스 수 포함), GROUP BY 한 번
+
+트리 순서는 재귀 CTE로 DB에서 정렬하므로 클라이언트가 전체 트리를 모아 둘 필요가 없다.
+"""
+import csv
+import io
+import json
+from sqlalchemy import select, func, and_, or_, cast, String, literal, exists
+from sqlalchemy.orm import aliased
+from app.database.models import CreatedResource
+
+COLUMNS = ("id", "batch_id", "resource_type", "plane_id", "project_slug", "parent_id",
+           "node_key", "payload_hash", "created_at", "deleted_at")
+TREE_COLUMNS = COLUMNS + ("depth",)
+FORMATS = ("jsonl", "csv")
+
+# 트리 정렬 경로에서 id를 고정 폭 문자열로 만들기 위한 오프셋 (DB마다 다른 lpad/printf 대신)
+_PATH_OFFSET = 10 ** 15
+
+
+class BatchReport:
+    def __init__(self, session_factory, fetch_size: int = 1000):
+        self.session_factory = session_factory
+        self.fetch_size = max(fetch_size, 1)
+
+    @classmethod
+    def from_settings(cls, settings, session_factory):
+        return cls(session_factory, fetch_size=settings.REPORT_FETCH_SIZE)
+
+    def _filters(self, table, batch_id=None, since=None, until=None, resource_type=None):
+        conditions = []
+        if batch_id:
+            conditions.append(table.batch_id == batch_id)
+        if since:
+            conditions.append(table.created_at >= since)
+        if until:
+            conditions.append(table.created_at < until)
+        if resource_type:
+            conditions.append(table.resource_type == resource_type)
+        return and_(*conditions)
+
+    def summary(self, batch_id: str = None, since=None, until=None):
+        """{"total": n, "deleted": n, "by_type": {type: n}, "deleted_by_type": {type: n}}"""
+        db = self.session_factory()
+        try:
+            rows = db.execute(
+                select(CreatedResource.resource_type, func.count(CreatedResource.id), func.count(CreatedResource.deleted_at))
+                .where(self._filters(CreatedResource, batch_id, since, until))
+                .group_by(CreatedResource.resource_type)
+            )
+            by_type, deleted_by_type = {}, {}
+            for resource_type, count, deleted in rows:
+                by_type[resource_type] = count
+                if deleted:
+                    deleted_by_type[resource_type] = deleted
+            return {
+                "total": sum(by_type.values()), "deleted": sum(deleted_by_type.values()),
+                "by_type": by_type, "deleted_by_type": deleted_by_type,
+            }
+        finally:
+            db.close()
+
+    def iter_rows(self, batch_id: str = None, since=None, until=None, resource_type: str = None, tree: bool = False):
+        """조건에 맞는 행 dict를 id 순서(tree이면 트리 순서)로 yield"""
+        if tree:
+            stmt, columns = self._tree_query(batch_id, since, until, resource_type), TREE_COLUMNS
+        else:
+            stmt = (
+                select(*(getattr(CreatedResource, name) for name in COLUMNS))
+                .where(self._filters(CreatedResource, batch_id, since, until, resource_type))
+                .order_by(CreatedResource.id)
+            )
+            columns = COLUMNS
+        db = self.session_factory()
+        try:
+            result = db.execute(stmt.execution_options(stream_results=True, yield_per=self.fetch_size))
+            for partition in result.partitions():
+                for row in partition:
+                    yield dict(zip(columns, row))
+        finally:
+            db.close()
+
+    def _tree_query(self, batch_id, since, until, resource_type):
+        """parent_id(부모 이슈의 plane_id)로 이은 트리를 재귀 CTE로 조회
+
+        범위 안에 부모가 없는 행(프로젝트/Cycle/Module/최상위 이슈, 범위 밖 부모의 하위 이슈)이 루트이며,
+        경로(프로젝트 slug + 고정 폭 id)로 정렬해 같은 프로젝트의 루트와 하위 이슈가 깊이 우선으로 이어진다.
+        """
+        scope = self._filters(CreatedResource, batch_id, since, until, resource_type)
+        parent = aliased(CreatedResource)
+        columns = [getattr(CreatedResource, name) for name in COLUMNS]
+
+        def segment(table):
+            return cast(table.id + _PATH_OFFSET, String)
+
+        roots = select(
+            *columns, literal(0).label("depth"),
+            (func.coalesce(CreatedResource.project_slug, "") + "/" + segment(CreatedResource)).label("path"),
+        ).where(scope, or_(
+            CreatedResource.parent_id.is_(None),
+            ~exists().where(parent.plane_id == CreatedResource.parent_id,
+                            self._filters(parent, batch_id, since, until, resource_type)),
+        ))
+        tree = roots.cte("resource_tree", recursive=True)
+        child = aliased(CreatedResource)
+        tree = tree.union_all(
+            select(
+                *(getattr(child, name) for name in COLUMNS), (tree.c.depth + 1).label("depth"),
+                (tree.c.path + "/" + segment(child)).label("path"),
+            ).where(child.parent_id == tree.c.plane_id, self._filters(child, batch_id, since, until, resource_type))
+        )
+        return select(*(tree.c[name] for name in TREE_COLUMNS)).order_by(tree.c.path)
+
+    def iter_jsonl(self, rows):
+        """행 dict들을 fetch_size줄씩 묶은 JSON Lines 텍스트로"""
+        lines = []
+        for row in rows:
+            lines.append(json.dumps(row, default=_isoformat, ensure_ascii=False))
+            if len(lines) >= self.fetch_size:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+    def iter_csv(self, rows, tree: bool = False):
+        """행 dict들을 헤더가 있는 CSV 텍스트로 (fetch_size줄씩)"""
+        columns = TREE_COLUMNS if tree else COLUMNS
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        count = 0
+        for row in rows:
+            writer.writerow([_csv_value(row[name]) for name in columns])
+            count += 1
+            if count % self.fetch_size == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    def export(self, fmt: str = "jsonl", tree: bool = False, **filters):
+        """fmt(jsonl/csv) 텍스트 조각 제너레이터, filters는 iter_rows 인자 (batch_id, since, until, resource_type)"""
+        if fmt not in FORMATS:
+            raise ValueError(f"지원하지 않는 형식입니다: {fmt} ({', '.join(FORMATS)})")
+        rows = self.iter_rows(tree=tree, **filters)
+        return self.iter_csv(rows, tree=tree) if fmt == "csv" else self.iter_jsonl(rows)
+
+
+def _isoformat(value):
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    return value.isoformat() if hasattr(value, "isoformat") else value
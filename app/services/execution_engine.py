@@ -1,69 +1,374 @@
+import hashlib
+import json
 import uuid
-from app.database.models import SyncBatch, CreatedResource, BatchStatus, PlaneState, PlaneProject
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import quote
+from sqlalchemy import insert, update, select, bindparam, or_
+from app.core.errors import LeaseLostError
+from app.database.models import SyncBatch, CreatedResource, BatchStatus, PlaneProject, LogTable, PendingLink
+from app.services.metadata_cache import MetadataCache
+from app.services.metadata_service import drop_replaced_projects, workspace_id_of
+from app.services.metrics import Metrics, NullMetrics
+
+
+# 이슈를 Cycle/Module에 한 번에 추가하는 엔드포인트: 종류 -> (리소스 경로, 하위 경로)
+LINK_PATHS = {"CYCLE": ("cycles", "cycle-issues"), "MODULE": ("modules", "module-issues")}
+
+
+def node_key(parent_key: str, kind: str, name: str):
+    """YAML 노드의 안정적인 키, 예) gopedia/GPD/issue:Wiki%20POC/issue:Dataset"""
+    return f"{parent_key}/{kind}:{quote(str(name), safe='')}"
+
+
+def project_key(workspace_slug: str, p_data: dict):
+    return f"{workspace_slug}/{p_data['slug']}"
+
+
+def child_keys(parent_key: str, kind: str, items: list):
+    """형제 노드들의 키 목록 (노드에 key가 있으면 name 대신 사용, 같은 이름은 #2, #3... 으로 구분)"""
+    counts = {}
+    keys = []
+    for item in items:
+        name = item.get("key") or item["name"]
+        counts[name] = counts.get(name, 0) + 1
+        key = node_key(parent_key, kind, name)
+        keys.append(key if counts[name] == 1 else f"{key}#{counts[name]}")
+    return keys
+
+
+# 노드 해시에서 제외할 필드 (키 지정과 하위 노드)
+_CHILD_FIELDS = ("key", "sub_issues", "cycles", "modules", "issues")
+
+
+def node_hash(data: dict):
+    """YAML 노드 자신의 필드(하위 노드 제외)의 해시, 다음 실행에서 변경 여부 판단에 사용"""
+    fields = {k: v for k, v in data.items() if k not in _CHILD_FIELDS}
+    return hashlib.sha1(json.dumps(fields, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def load_node_records(db, template_name: str, batch_id: str = None):
+    """같은 template 또는 batch_id 배치에서 기록된 (삭제되지 않은) node_key -> (plane_id, payload_hash)"""
+    conditions = []
+    if batch_id:
+        conditions.append(SyncBatch.id == batch_id)
+    if template_name:
+        conditions.append(SyncBatch.template_name == template_name)
+    if not conditions:
+        return {}
+    rows = (
+        db.query(CreatedResource.node_key, CreatedResource.plane_id, CreatedResource.payload_hash)
+        .join(SyncBatch, CreatedResource.batch_id == SyncBatch.id)
+        .filter(or_(*conditions), CreatedResource.node_key.isnot(None), CreatedResource.deleted_at.is_(None))
+    )
+    return {key: (plane_id, payload_hash) for key, plane_id, payload_hash in rows}
+
+
+def load_pending_links(db, template_name: str, batch_id: str = None):
+    """같은 template 또는 batch_id 배치에서 보내지 못한 PendingLink 행 (load_node_records와 같은 범위)"""
+    conditions = []
+    if batch_id:
+        conditions.append(SyncBatch.id == batch_id)
+    if template_name:
+        conditions.append(SyncBatch.template_name == template_name)
+    if not conditions:
+        return []
+    return (
+        db.query(PendingLink)
+        .join(SyncBatch, PendingLink.batch_id == SyncBatch.id)
+        .filter(or_(*conditions))
+        .order_by(PendingLink.id)
+        .all()
+    )
+
+
+def payload_hash_update(batch_id: str, template_name: str = None):
+    """PATCH한 노드의 payload_hash 갱신문 (executemany 파라미터: key, b_plane_id, hash)
+
+    load_node_records와 같은 범위(같은 배치 또는 같은 template의 배치, 삭제되지 않은 행)에서
+    node_key와 plane_id가 모두 같은 행만 갱신한다 (다른 template/배치의 같은 node_key는 건드리지 않음).
+    """
+    table = CreatedResource.__table__
+    scope = SyncBatch.id == batch_id
+    if template_name:
+        scope = or_(scope, SyncBatch.template_name == template_name)
+    return update(table).where(
+        table.c.node_key == bindparam("key"),
+        table.c.plane_id == bindparam("b_plane_id"),
+        table.c.deleted_at.is_(None),
+        table.c.batch_id.in_(select(SyncBatch.id).where(scope)),
+    ).values(payload_hash=bindparam("hash"))
+
 
 class ExecutionEngine:
-    def __init__(self, client, db):
+    def __init__(self, client, db, max_workers: int = 8, chunk_size: int = 500,
+                 cache: MetadataCache = None, cycle_owner_email: str = None, metrics: Metrics = None,
+                 bulk_membership: bool = True, state_sync=None, metadata_changed=None):
         self.client = client
         self.db = db
+        self.max_workers = max_workers  # 이슈 생성 동시 요청 수
+        self.chunk_size = chunk_size    # CreatedResource bulk insert 단위
+        self.cache = cache or MetadataCache()  # 프로젝트/상태/멤버 이름 -> id 조회
+        self.cycle_owner_email = cycle_owner_email  # YAML에 owner가 없을 때 쓸 Cycle 소유자
+        self.metrics = metrics or NullMetrics()     # 단계별 시간 (client와 같은 Metrics를 넘기면 요청과 함께 집계)
+        # True이면 이슈 요청에 cycle/module을 넣지 않고, 프로젝트의 이슈를 다 만든 뒤
+        # cycle-issues / module-issues 엔드포인트로 Cycle/Module마다 한 번에 추가
+        self.bulk_membership = bulk_membership
+        self.link_failures = []         # 추가하지 못한 연결 {"type", "target", "issues", "error"}
+        self._link_logs = []            # 연결 실패 WARN 로그/PendingLink 행 (_fail_batch의 rollback 뒤 다시 추가)
+        self._links = {}                # (project_id, "CYCLE"/"MODULE", target_id) -> [issue id]
+        self._workspace_slug = None
+        # 기본 State가 없는 프로젝트(상태를 동기화한 적 없거나 이번 배치에서 만든 프로젝트)를 만나면
+        # state_sync(workspace_slug, [project_id])로 한 번 동기화 (예: MetadataService.sync_workspace)
+        self.state_sync = state_sync
+        self._state_synced = set()
+        # 프로젝트를 만들거나 상태를 동기화한 배치가 끝나면 metadata_changed(workspace_slug)를 한 번 호출
+        # (예: MetadataService.refresh_snapshot으로 스냅샷 재작성)
+        self.metadata_changed = metadata_changed
+        self._metadata_dirty = False
+        self._pending_resources = []    # 아직 DB로 보내지 않은 CreatedResource 행
+        self._known = {}                # node_key -> plane_id (이전 실행에서 이미 생성된 노드)
+        self._updates = set()           # 이미 생성됐지만 내용이 바뀌어 PATCH할 node_key
+        self._pending_hashes = []       # PATCH 후 갱신할 payload_hash
+        self._plan = None
+        # BatchQueue 워커가 넘긴 lease (worker_id, lost Event), lost이면 새 요청을 멈추고
+        # 배치 상태는 sync_batches.worker_id가 그대로일 때만 바꿈
+        self._lease = None
+
+    def execute_yaml(self, yaml_data: dict, batch_id: str = None, lease=None):
+        """YAML 배치 실행
 
-    def execute_yaml(self, yaml_data: dict):
+        같은 template(batch_name)의 이전 실행에서 이미 생성된 노드는 건너뛴다.
+        batch_id를 주면 새 배치 대신 해당 배치를 이어서 실행한다.
+        lease(BatchLease)를 주면 lease를 잃었을 때 프로젝트/이슈 사이에서 멈춘다.
+        """
         workspace_slug = yaml_data.get("Workspace Slug")
-        batch_id = str(uuid.uuid4())
-        
+        self._lease = lease
+
         # 1. Batch 시작 기록
-        batch = SyncBatch(id=batch_id, template_name=yaml_data.get("batch_name"))
-        self.db.add(batch)
-        try:
-            self.db.commit()
-        except Exception as e:
-            self.db.rollback()
-            print(f"❌ Batch 생성 실패: {e}")
-            raise
+        batch = self._start_batch(yaml_data, batch_id)
+        batch_id = batch.id
 
         try:
-            for p_data in yaml_data.get("projects", []):
+            self._replay_links(batch)
+            # BatchStream이면 프로젝트를 꺼낼 때마다 YAML을 파싱하므로 parse 단계로 기록
+            for p_data in self.metrics.timed_iter(yaml_data.get("projects", []), "parse"):
+                self._check_lease()
                 # 2. Project 생성
-                project_id = self._query_project_by_slug(workspace_slug, p_data["slug"])
-                if not project_id:
-                    project = self._create_project(workspace_slug, p_data, batch_id)
-                    project_id = project['id']
-                
-                # 3. 해당 프로젝트의 기본 State 확보 (예: Todo)
-                default_state = self.db.query(PlaneState).filter_by(project_id=project_id).first()
-                state_id = default_state.id if default_state else None
+                with self.metrics.phase("project"):
+                    project_key = self._project_key(workspace_slug, p_data)
+                    project_id = self._known.get(project_key) or self._query_project_by_slug(workspace_slug, p_data["slug"])
+                    if not project_id:
+                        project = self._create_project(workspace_slug, p_data, batch_id)
+                        project_id = project['id']
+
+                    # 3. 해당 프로젝트의 기본 State 확보 (예: Todo)
+                    state_id = self._default_state_id(project_id)
 
                 # 4. Cycles & Modules 생성 (매핑 정보 저장)
-                cycle_map = self._create_cycles(workspace_slug, project_id, p_data.get("cycles", []), batch_id, p_data["slug"])
-                module_map = self._create_modules(workspace_slug, project_id, p_data.get("modules", []), batch_id, p_data["slug"])
+                with self.metrics.phase("cycles"):
+                    cycle_map = self._create_cycles(workspace_slug, project_id, p_data.get("cycles", []), batch_id, p_data["slug"])
+                with self.metrics.phase("modules"):
+                    module_map = self._create_modules(workspace_slug, project_id, p_data.get("modules", []), batch_id, p_data["slug"])
 
                 # 5. Issues (with Hierarchy)
-                self._create_issues(
-                    workspace_slug, project_id, p_data.get("issues", []), 
-                    batch_id, state_id, cycle_map, module_map
-                )
+                with self.metrics.phase("issues"):
+                    self._create_issues(
+                        workspace_slug, project_id, p_data.get("issues", []),
+                        batch_id, state_id, cycle_map, module_map, project_key=project_key
+                    )
+                # 6. Cycle/Module 연결 (bulk_membership)
+                self._send_links()
+                if self._lease is not None:
+                    # lease를 넘겨받은 워커가 이 프로젝트의 노드를 알 수 있도록 프로젝트마다 기록
+                    self._flush_resources()
 
-            batch.status = BatchStatus.COMPLETED
+            self._complete_batch(batch)
+        except Exception as e:
+            self._send_links_on_failure()
+            self._fail_batch(batch, e)
+            raise
+
+    def execute_compiled(self, compiled, batch_id: str = None):
+        """TemplateCompiler가 만든 CompiledBatch 실행
+
+        노드 배열을 index로 순회하고 생성된 Plane id도 노드 index별 리스트에 둔다 (중첩 dict 순회 없음).
+        node_key/node_hash가 execute_yaml과 같으므로 어느 쪽으로 실행한 배치든 이어서 실행할 수 있다.
+        """
+        workspace_slug = compiled.workspace_slug
+        self._lease = None
+        batch = self._start_batch(compiled.header, batch_id)
+        batch_id = batch.id
+        ids = [None] * len(compiled)
+
+        try:
+            self._replay_links(batch)
+            for start, end in compiled.project_ranges():
+                p_data = compiled.payloads[start]
+                with self.metrics.phase("project"):
+                    project_id = self._known.get(compiled.keys[start]) or self._query_project_by_slug(workspace_slug, p_data["slug"])
+                    if not project_id:
+                        project_id = self._create_project(workspace_slug, p_data, batch_id)['id']
+                    ids[start] = project_id
+                    state_id = self._default_state_id(project_id)
+
+                cycles, modules, issues = compiled.project_nodes(start, end)
+                base = f"{self.client.base_url}/workspaces/{workspace_slug}/projects/{project_id}"
+                with self.metrics.phase("cycles"):
+                    self._create_compiled_nodes(compiled, ids, cycles, f"{base}/cycles/", "CYCLE", batch_id, p_data["slug"],
+                                                lambda data: self._cycle_payload(project_id, data))
+                with self.metrics.phase("modules"):
+                    self._create_compiled_nodes(compiled, ids, modules, f"{base}/modules/", "MODULE", batch_id, p_data["slug"],
+                                                self._module_payload)
+                with self.metrics.phase("issues"):
+                    self._create_compiled_issues(compiled, ids, start, issues, f"{base}/work-items/", batch_id, state_id)
+                self._send_links()
+
+            self._complete_batch(batch)
+        except Exception as e:
+            self._send_links_on_failure()
+            self._fail_batch(batch, e)
+            raise
+
+    def execute_plan(self, plan, batch_id: str = None):
+        """BatchPlanner가 만든 ExecutionPlan의 생성/수정 단계만 실행 (할 일이 없으면 배치를 만들지 않음)"""
+        if plan.is_empty:
+            print("✅ 변경 사항이 없어 실행할 요청이 없습니다")
+            return None
+        self._plan = plan
+        try:
+            return self.execute_yaml(plan.yaml_data, batch_id=batch_id)
+        finally:
+            self._plan = None
+
+    def resume(self, batch_id: str, yaml_data: dict):
+        """실패한 배치를 같은 YAML로 이어서 실행 (이미 생성된 노드는 건너뜀)"""
+        return self.execute_yaml(yaml_data, batch_id=batch_id)
+
+    def _start_batch(self, yaml_data: dict, batch_id: str = None):
+        if batch_id:
+            batch = self.db.get(SyncBatch, batch_id)
+            if batch is None:
+                raise ValueError(f"Batch를 찾을 수 없습니다: {batch_id}")
+            if not self._set_status(batch, BatchStatus.RUNNING):
+                self.db.rollback()
+                raise LeaseLostError(f"다른 워커가 실행 중인 배치입니다: {batch_id}", {"batch_id": batch_id})
+        else:
+            batch = SyncBatch(id=str(uuid.uuid4()), template_name=yaml_data.get("batch_name"))
+            self.db.add(batch)
+        try:
             self.db.commit()
         except Exception as e:
             self.db.rollback()
-            batch.status = BatchStatus.FAILED
-            # Batch 상태 업데이트를 위해 다시 조회
-            try:
-                self.db.merge(batch)
-                self.db.commit()
-            except:
-                self.db.rollback()
-            print(f"Execution Error: {e}")
-            import traceback
-            traceback.print_exc()
+            print(f"❌ Batch 생성 실패: {e}")
             raise
+        self.metrics.batch_id = batch.id
+        self._hash_update = payload_hash_update(batch.id, batch.template_name)
+        self._workspace_slug = yaml_data.get("Workspace Slug")
+        self._links = {}
+        self.link_failures = []
+        self._link_logs = []
+        if self._plan is not None:
+            self._known = dict(self._plan.known)
+            self._updates = set(self._plan.updates)
+        else:
+            self._known = self._load_known_nodes(batch)
+            self._updates = set()
+        if self._known:
+            print(f"↩️ 이전 실행에서 생성된 노드 {len(self._known)}개는 건너뜁니다")
+        return batch
 
-    def _create_project(self, workspace_slug, data, batch_id):
-        headers = {
-            "Content-Type": "application/json",
-            "x-api-key": self.client.api_key
-        }
-        payload = {
+    def _load_known_nodes(self, batch):
+        """같은 template 또는 같은 배치에서 이미 기록된 node_key -> plane_id"""
+        records = load_node_records(self.db, batch.template_name, batch.id)
+        return {key: plane_id for key, (plane_id, _) in records.items()}
+
+    def _project_key(self, workspace_slug, p_data):
+        return project_key(workspace_slug, p_data)
+
+    def _complete_batch(self, batch):
+        self._flush_resources()
+        if not self._set_status(batch, BatchStatus.COMPLETED):
+            raise LeaseLostError(f"배치 lease를 잃어 완료로 기록하지 않습니다: {batch.id}", {"batch_id": batch.id})
+        self._log_metrics(batch)
+        self.db.commit()
+        self._notify_metadata_changed()
+
+    def _notify_metadata_changed(self):
+        if self._metadata_dirty and self.metadata_changed is not None:
+            self._metadata_dirty = False
+            self.metadata_changed(self._workspace_slug)
+
+    def _set_status(self, batch, status):
+        """배치 상태 변경, lease가 있으면 sync_batches.worker_id가 이 워커일 때만 (바꿨으면 True)"""
+        if self._lease is None:
+            batch.status = status
+            return True
+        changed = (
+            self.db.query(SyncBatch)
+            .filter(SyncBatch.id == batch.id, SyncBatch.worker_id == self._lease.worker_id)
+            .update({SyncBatch.status: status}, synchronize_session="fetch")
+        )
+        return changed == 1
+
+    def _lease_lost(self):
+        return self._lease is not None and self._lease.lost.is_set()
+
+    def _check_lease(self):
+        if self._lease_lost():
+            raise LeaseLostError(f"배치 lease를 잃어 실행을 멈춥니다: {self.metrics.batch_id}",
+                                 {"batch_id": self.metrics.batch_id})
+
+    def _log_metrics(self, batch):
+        """집계한 요청/단계 시간을 operation_logs에 요약 행으로 추가 (metrics가 꺼져 있으면 없음)"""
+        entry = self.metrics.log_entry(batch.id)
+        if entry is not None:
+            entry.message = f"[{batch.status.value}] {entry.message}"
+            self.db.add(entry)
+
+    def _fail_batch(self, batch, error):
+        # 이미 Plane에 생성된 리소스는 resume을 위해 버퍼에 남은 행까지 기록
+        self.db.rollback()
+        # rollback으로 버려진 연결 실패 로그를 다시 추가 (이미 커밋된 행은 add해도 그대로)
+        self.db.add_all(self._link_logs)
+        # Batch 상태 업데이트를 위해 다시 조회
+        try:
+            self._flush_resources()
+            batch = self.db.merge(batch)
+            if self._set_status(batch, BatchStatus.FAILED):
+                self._log_metrics(batch)
+            else:
+                print(f"⚠️ 배치 lease를 잃어 실패로 기록하지 않습니다: {batch.id}")
+            self.db.commit()
+        except:
+            self._pending_resources.clear()
+            self._pending_hashes.clear()
+            self.db.rollback()
+        self._notify_metadata_changed()
+        print(f"Execution Error: {error}")
+        import traceback
+        traceback.print_exc()
+
+    def _default_state_id(self, project_id):
+        state_id = self.cache.default_state_id(self.db, project_id)
+        if state_id is None and self._needs_state_sync(project_id):
+            with self.metrics.phase("state_sync"):
+                self.state_sync(self._workspace_slug, [project_id])
+                self._metadata_dirty = True
+            state_id = self.cache.default_state_id(self.db, project_id)
+        return state_id
+
+    def _needs_state_sync(self, project_id):
+        if self.state_sync is None or project_id in self._state_synced:
+            return False
+        self._state_synced.add(project_id)
+        return True
+
+    def _project_slug(self, project_id):
+        """프로젝트 slug 조회 (DB에 없으면 project_id 사용)"""
+        return self.cache.project_slug(self.db, project_id) or project_id
+
+    def _project_payload(self, data):
+        return {
             "name": data["name"],
             "identifier": data["slug"],
             "module_view": True,
@@ -72,117 +377,406 @@ class ExecutionEngine:
             "page_view": True,
             "inbox_view": True
         }
+
+    def _create_project(self, workspace_slug, data, batch_id):
         url = f"{self.client.base_url}/workspaces/{workspace_slug}/projects/"
-        res = self.client.post(url, payload, headers=headers)
-        
+        res = self.client.post(url, self._project_payload(data))
+        self._save_project(res, data, batch_id, workspace_slug)
+        return res
+
+    def _save_project(self, res, data, batch_id, workspace_slug=None):
         # 생성된 프로젝트를 DB에 저장
         project = PlaneProject(
             id=res.get('id'),
             name=res.get('name'),
-            slug=res.get('slug') or data["slug"]
+            slug=res.get('slug') or data["slug"],
+            workspace_id=workspace_id_of(res)
         )
+        drop_replaced_projects(self.db, [{"id": project.id, "slug": project.slug, "workspace_id": project.workspace_id}])
         self.db.merge(project)
         self.db.flush()
-        
-        self._record_resource(batch_id, "PROJECT", res['id'], data["slug"])
-        return res
+        self.cache.put_project(project.id, project.slug)
+        self._metadata_dirty = True
+
+        node = self._project_key(workspace_slug, data) if workspace_slug else None
+        self._record_resource(batch_id, "PROJECT", res['id'], data["slug"], node_key=node,
+                              payload_hash=node_hash(data))
 
-    def _create_issues(self, ws_slug, proj_id, issues_data, batch_id, state_id, cycle_map, module_map, parent_id=None):
-        for i_data in issues_data:
-            headers = {
-                "Content-Type": "application/json",
-                "x-api-key": self.client.api_key
-            }
-            payload = {
-                "name": i_data["name"],
-                "state": state_id,
-                "priority": i_data.get("priority", "none"),
-                "parent": parent_id
-            }
-            # Cycle/Module 매핑 (이름 기반 ID 매칭)
+    def _issue_payload(self, i_data, state_id, cycle_map, module_map, parent_id=None):
+        payload = {
+            "name": i_data["name"],
+            "state": state_id,
+            "priority": i_data.get("priority", "none"),
+            "parent": parent_id
+        }
+        # Cycle/Module 매핑 (이름 기반 ID 매칭), bulk_membership이면 _link_issue로 모아서 따로 추가
+        if not self.bulk_membership:
             if "cycle" in i_data: payload["cycle"] = cycle_map.get(i_data["cycle"])
             if "module" in i_data: payload["module"] = module_map.get(i_data["module"])
+        return payload
 
-            url = f"{self.client.base_url}/workspaces/{ws_slug}/projects/{proj_id}/work-items/"
-            res = self.client.post(url, payload, headers=headers)
-            
-            # 프로젝트 slug를 얻기 위해 프로젝트 정보 조회
-            project = self.db.query(PlaneProject).filter_by(id=proj_id).first()
-            project_slug = project.slug if project else proj_id
-            self._record_resource(batch_id, "ISSUE", res['id'], project_slug, parent_id)
-
-            # 하위 이슈 재귀 생성
-            if "sub_issues" in i_data:
-                self._create_issues(ws_slug, proj_id, i_data["sub_issues"], batch_id, state_id, cycle_map, module_map, res['id'])
-
-    def _record_resource(self, batch_id, r_type, plane_id, slug, parent_id=None):
-        resource = CreatedResource(
-            batch_id=batch_id,
-            resource_type=r_type,
-            plane_id=plane_id,
-            project_slug=slug,
-            parent_id=parent_id
-        )
-        self.db.add(resource)
-        self.db.flush() # ID 확정 위해 flush
+    def _issue_update_payload(self, i_data, cycle_map, module_map, parent_id=None):
+        # 수정 시에는 Plane에서 바뀌었을 수 있는 state는 건드리지 않음
+        payload = self._issue_payload(i_data, None, cycle_map, module_map, parent_id)
+        del payload["state"]
+        return payload
+
+    def _create_issues(self, ws_slug, proj_id, issues_data, batch_id, state_id, cycle_map, module_map,
+                       parent_id=None, project_key=None):
+        """이슈 트리를 워커 풀에서 생성
+
+        HTTP 요청만 워커 스레드에서 실행하고, DB 기록은 호출 스레드에서 처리한다.
+        부모 이슈의 Plane id가 확정되는 즉시 하위 이슈 생성을 시작한다.
+        이전 실행에서 이미 생성된 이슈는 요청 없이 기존 id로 하위 이슈만 이어서 처리한다.
+        """
+        url = f"{self.client.base_url}/workspaces/{ws_slug}/projects/{proj_id}/work-items/"
+        project_slug = self._project_slug(proj_id)
+        pending = {}
+        error = None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            def submit(items, parent, parent_key):
+                keys = child_keys(parent_key, "issue", items) if parent_key else [None] * len(items)
+                for i_data, key in zip(items, keys):
+                    if key in self._known:
+                        issue_id = self._known[key]
+                        if key in self._updates:
+                            payload = self._issue_update_payload(i_data, cycle_map, module_map, parent)
+                            pending[pool.submit(self.client.patch, f"{url}{issue_id}/", payload)] = (i_data, parent, key, issue_id)
+                        submit(i_data.get("sub_issues", []), issue_id, key)
+                        continue
+                    payload = self._issue_payload(i_data, state_id, cycle_map, module_map, parent)
+                    pending[pool.submit(self.client.post, url, payload)] = (i_data, parent, key, None)
+
+            submit(issues_data, parent_id, project_key)
+            while pending:
+                if error is None and self._lease_lost():
+                    # lease를 잃으면 대기 중인 요청은 취소하고 이미 나간 요청만 마무리
+                    error = LeaseLostError(f"배치 lease를 잃어 실행을 멈춥니다: {batch_id}", {"batch_id": batch_id})
+                    for f in pending:
+                        f.cancel()
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i_data, parent, key, updated_id = pending.pop(future)
+                    try:
+                        res = future.result()
+                    except Exception as e:
+                        # 첫 실패 이후에는 대기 중인 요청을 취소하고, 이미 나간 요청만 마무리
+                        if error is None:
+                            error = e
+                            for f in pending:
+                                f.cancel()
+                        continue
+
+                    if updated_id is not None:
+                        self._record_update(key, node_hash(i_data))
+                        self._link_issue(proj_id, updated_id, cycle_map.get(i_data.get("cycle")),
+                                         module_map.get(i_data.get("module")))
+                        continue
+
+                    self._record_resource(batch_id, "ISSUE", res['id'], project_slug, parent, node_key=key,
+                                          payload_hash=node_hash(i_data))
+                    self._link_issue(proj_id, res['id'], cycle_map.get(i_data.get("cycle")),
+                                     module_map.get(i_data.get("module")))
+
+                    # 하위 이슈는 부모 id 확정 후 바로 제출
+                    if error is None and "sub_issues" in i_data:
+                        submit(i_data["sub_issues"], res['id'], key)
+
+        if error is not None:
+            raise error
+
+    def _create_compiled_nodes(self, compiled, ids, indices, url, r_type, batch_id, project_slug, to_payload):
+        """CompiledBatch의 Cycle/Module 노드를 순서대로 생성 (이미 생성된 노드는 기록된 id, 바뀐 경우만 PATCH)"""
+        for i in indices:
+            key = compiled.keys[i]
+            if key in self._known:
+                ids[i] = self._known[key]
+                if key in self._updates:
+                    self.client.patch(f"{url}{ids[i]}/", to_payload(compiled.payloads[i]))
+                    self._record_update(key, compiled.hashes[i])
+                continue
+            res = self.client.post(url, to_payload(compiled.payloads[i]))
+            ids[i] = res.get('id')
+            self._record_resource(batch_id, r_type, ids[i], project_slug, node_key=key, payload_hash=compiled.hashes[i])
+
+    def _compiled_issue_payload(self, compiled, ids, i, state_id, parent_id):
+        payload = self._issue_payload(compiled.payloads[i], state_id, {}, {}, parent_id)
+        # Cycle/Module은 이름 대신 컴파일 때 정한 노드 index로 연결
+        if "cycle" in payload:
+            payload["cycle"] = ids[compiled.cycles[i]] if compiled.cycles[i] >= 0 else None
+        if "module" in payload:
+            payload["module"] = ids[compiled.modules[i]] if compiled.modules[i] >= 0 else None
+        return payload
+
+    def _create_compiled_issues(self, compiled, ids, project_index, indices, url, batch_id, state_id):
+        """CompiledBatch의 이슈 노드를 워커 풀에서 생성 (_create_issues와 같은 방식, 부모 id가 정해지면 하위 이슈 제출)"""
+        project_slug = self._project_slug(ids[project_index])
+        children = {}
+        for i in indices:
+            children.setdefault(compiled.parents[i], []).append(i)
+        pending = {}
+        error = None
+
+        def parent_id_of(i):
+            parent = compiled.parents[i]
+            return None if parent == project_index else ids[parent]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            def submit(parent):
+                for i in children.get(parent, ()):
+                    key = compiled.keys[i]
+                    if key in self._known:
+                        ids[i] = self._known[key]
+                        if key in self._updates:
+                            payload = self._compiled_issue_payload(compiled, ids, i, None, parent_id_of(i))
+                            del payload["state"]  # 수정 시에는 state를 건드리지 않음
+                            pending[pool.submit(self.client.patch, f"{url}{ids[i]}/", payload)] = (i, True)
+                        submit(i)
+                        continue
+                    payload = self._compiled_issue_payload(compiled, ids, i, state_id, parent_id_of(i))
+                    pending[pool.submit(self.client.post, url, payload)] = (i, False)
+
+            submit(project_index)
+            while pending:
+                if error is None and self._lease_lost():
+                    # lease를 잃으면 대기 중인 요청은 취소하고 이미 나간 요청만 마무리
+                    error = LeaseLostError(f"배치 lease를 잃어 실행을 멈춥니다: {batch_id}", {"batch_id": batch_id})
+                    for f in pending:
+                        f.cancel()
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i, updated = pending.pop(future)
+                    try:
+                        res = future.result()
+                    except Exception as e:
+                        if error is None:
+                            error = e
+                            for f in pending:
+                                f.cancel()
+                        continue
+
+                    if not updated:
+                        ids[i] = res['id']
+                    self._link_issue(
+                        ids[project_index], ids[i],
+                        ids[compiled.cycles[i]] if compiled.cycles[i] >= 0 else None,
+                        ids[compiled.modules[i]] if compiled.modules[i] >= 0 else None,
+                    )
+                    if updated:
+                        self._record_update(compiled.keys[i], compiled.hashes[i])
+                        continue
+                    self._record_resource(batch_id, "ISSUE", ids[i], project_slug, parent_id_of(i),
+                                          node_key=compiled.keys[i], payload_hash=compiled.hashes[i])
+                    if error is None:
+                        submit(i)
+
+        if error is not None:
+            raise error
+
+    def _link_issue(self, project_id, issue_id, cycle_id=None, module_id=None):
+        """bulk_membership이면 이슈의 Cycle/Module 연결을 모아 둠 (_send_links에서 전송)"""
+        if not self.bulk_membership:
+            return
+        if cycle_id:
+            self._links.setdefault((project_id, "CYCLE", cycle_id), []).append(issue_id)
+        if module_id:
+            self._links.setdefault((project_id, "MODULE", module_id), []).append(issue_id)
+
+    def _link_requests(self, project_id=None):
+        """모아 둔 연결(project_id를 주면 그 프로젝트 것만)을 꺼내 (프로젝트 id, 종류, 대상 id, 이슈 id들, url, payload) 목록으로 반환"""
+        keys = [key for key in self._links if project_id is None or key[0] == project_id]
+        requests = []
+        for key in keys:
+            project_id, r_type, target_id = key
+            issue_ids = list(dict.fromkeys(self._links.pop(key)))
+            path, sub_path = LINK_PATHS[r_type]
+            url = (f"{self.client.base_url}/workspaces/{self._workspace_slug}/projects/{project_id}"
+                   f"/{path}/{target_id}/{sub_path}/")
+            requests.append((project_id, r_type, target_id, issue_ids, url, {"issues": issue_ids}))
+        return requests
+
+    def _pending_links(self, batch):
+        """이전 실행에서 보내지 못한 연결(pending_links)을 _links에 다시 모으고 그 행들을 반환"""
+        rows = load_pending_links(self.db, batch.template_name, batch.id)
+        for row in rows:
+            self._links.setdefault((row.project_id, row.resource_type, row.target_id), []).extend(row.issue_ids)
+        if rows:
+            print(f"↩️ 이전 실행에서 보내지 못한 Cycle/Module 연결 {len(rows)}개를 다시 보냅니다")
+        return rows
+
+    def _replay_links(self, batch):
+        rows = self._pending_links(batch)
+        if rows:
+            self._send_links()
+            self._drop_pending_links(rows)
+
+    def _drop_pending_links(self, rows):
+        # 다시 보낸 행 삭제 (다시 실패한 연결은 _record_link_failure가 새 행으로 기록, 같은 커밋)
+        for row in rows:
+            self.db.delete(row)
+        self.db.commit()
+
+    def _send_links(self):
+        """Cycle/Module마다 요청 한 번으로 이슈를 추가하고, 실패한 연결은 기록만 함 (배치는 계속)"""
+        requests = self._link_requests()
+        if not requests:
+            return
+        with self.metrics.phase("links"):
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = [(pool.submit(self.client.post, url, payload), request[:4])
+                           for *request, url, payload in requests]
+                for future, request in futures:
+                    try:
+                        future.result()
+                    except Exception as e:
+                        self._record_link_failure(*request, e)
+
+    def _send_links_on_failure(self):
+        """배치가 실패해도 이미 생성된 이슈의 연결은 보냄 (resume 시 기존 이슈는 다시 연결하지 않으므로)"""
+        try:
+            self._send_links()
+        except Exception as e:
+            print(f"⚠️ Cycle/Module 연결 전송 실패: {e}")
+
+    def _record_link_failure(self, project_id, r_type, target_id, issue_ids, error):
+        """연결 실패를 WARN 로그와 pending_links에 기록 (다음 실행/resume이 다시 보냄, 404는 대상이 없어 기록만)"""
+        failure = {"project": project_id, "type": r_type, "target": target_id, "issues": issue_ids, "error": str(error)}
+        self.link_failures.append(failure)
+        print(f"⚠️ {r_type} {target_id}에 이슈 {len(issue_ids)}개 연결 실패: {error}")
+        rows = [LogTable(
+            level="WARN", step=f"LINK_{r_type}", batch_id=self.metrics.batch_id,
+            message=f"{r_type} {target_id}에 이슈 {len(issue_ids)}개 연결 실패", details=failure,
+        )]
+        if getattr(error, "details", {}).get("status_code") != 404:
+            rows.append(PendingLink(batch_id=self.metrics.batch_id, project_id=project_id, resource_type=r_type,
+                                    target_id=target_id, issue_ids=issue_ids, error=str(error)))
+        self._link_logs.extend(rows)
+        self.db.add_all(rows)
+
+    def _record_resource(self, batch_id, r_type, plane_id, slug, parent_id=None, node_key=None, payload_hash=None):
+        """CreatedResource 행을 버퍼에 쌓고, chunk_size마다 bulk insert"""
+        self._pending_resources.append({
+            "batch_id": batch_id,
+            "resource_type": r_type,
+            "plane_id": plane_id,
+            "project_slug": slug,
+            "parent_id": parent_id,
+            "node_key": node_key,
+            "payload_hash": payload_hash
+        })
+        if node_key:
+            self._known[node_key] = plane_id
+        if len(self._pending_resources) >= self.chunk_size:
+            self._flush_resources()
+
+    def _record_update(self, node_key, payload_hash):
+        """PATCH한 노드의 payload_hash 갱신을 버퍼에 쌓음 (_flush_resources에서 함께 저장)"""
+        self._pending_hashes.append({"key": node_key, "b_plane_id": self._known.get(node_key), "hash": payload_hash})
+        if len(self._pending_hashes) >= self.chunk_size:
+            self._flush_resources()
+
+    def _flush_resources(self):
+        """버퍼의 CreatedResource 행을 한 번의 executemany INSERT로 저장하고 커밋
+
+        chunk 단위로 커밋해 두어야 배치가 중간에 실패해도 resume 시 이미 생성된 노드를 알 수 있다.
+        커밋 후에는 배치 행을 제외한 객체를 Session에서 떼어내 긴 배치에서도 identity map이 커지지 않게 한다.
+        """
+        if not self._pending_resources and not self._pending_hashes:
+            return
+        rows, self._pending_resources = self._pending_resources, []
+        hashes, self._pending_hashes = self._pending_hashes, []
+        with self.metrics.phase("db_flush"):
+            if rows:
+                self.db.execute(insert(CreatedResource), rows)
+            if hashes:
+                self.db.connection().execute(self._hash_update, hashes)
+            self.db.commit()
+        self._release_session_objects()
+
+    def _release_session_objects(self):
+        for obj in list(self.db.identity_map.values()):
+            if not isinstance(obj, SyncBatch):
+                self.db.expunge(obj)
 
     def _query_project_by_slug(self, workspace_slug: str, project_slug: str):
         try:
-            project = self.db.query(PlaneProject).filter_by(slug=project_slug).first()
-            return project.id if project else None
+            return self.cache.project_id(self.db, project_slug)
         except Exception as e:
             # 에러 발생 시 None 반환 (프로젝트가 없거나 쿼리 실패)
             print(f"⚠️ 프로젝트 조회 중 오류 (slug: {project_slug}): {e}")
             return None
 
+    def _cycle_owner_id(self, cycle_data):
+        """YAML의 owner(email) 또는 기본 소유자 email을 멤버 id로 변환 (없으면 None)"""
+        email = cycle_data.get("owner") or self.cycle_owner_email
+        owner_id = self.cache.member_id(self.db, email)
+        if email and not owner_id:
+            print(f"⚠️ Cycle 소유자를 찾을 수 없습니다 (email: {email}), API 키 사용자로 생성합니다")
+        return owner_id
+
+    def _cycle_payload(self, project_id, cycle_data):
+        payload = {
+            "name": cycle_data["name"],
+            "project_id": project_id
+        }
+        owner_id = self._cycle_owner_id(cycle_data)
+        if owner_id:
+            payload["owned_by"] = owner_id
+        # 선택적 필드 추가
+        if cycle_data.get("start_date"):
+            payload["start_date"] = cycle_data.get("start_date")
+        if cycle_data.get("end_date"):
+            payload["end_date"] = cycle_data.get("end_date")
+        if cycle_data.get("description"):
+            payload["description"] = cycle_data.get("description")
+        return payload
+
     def _create_cycles(self, workspace_slug: str, project_id: str, cycles_data: list, batch_id: str, project_slug: str):
-        """Cycles를 생성하고 이름->ID 매핑 반환"""
+        """Cycles를 생성하고 이름->ID 매핑 반환 (이미 생성된 Cycle은 기록된 ID 사용)"""
         cycle_map = {}
-        for cycle_data in cycles_data:
-            headers = {
-                "Content-Type": "application/json",
-                "x-api-key": self.client.api_key
-            }
-            payload = {
-                "name": cycle_data["name"],
-                "owned_by": "45c205c7-05fe-420c-b323-f2b1c54adbbf",
-                "project_id": project_id
-            }
-            # 선택적 필드 추가
-            if cycle_data.get("start_date"):
-                payload["start_date"] = cycle_data.get("start_date")
-            if cycle_data.get("end_date"):
-                payload["end_date"] = cycle_data.get("end_date")
-            if cycle_data.get("description"):
-                payload["description"] = cycle_data.get("description")
-            
+        keys = child_keys(f"{workspace_slug}/{project_slug}", "cycle", cycles_data)
+        for cycle_data, key in zip(cycles_data, keys):
             url = f"{self.client.base_url}/workspaces/{workspace_slug}/projects/{project_id}/cycles/"
-            res = self.client.post(url, payload, headers=headers)
+            if key in self._known:
+                cycle_map[cycle_data["name"]] = self._known[key]
+                if key in self._updates:
+                    self.client.patch(f"{url}{self._known[key]}/", self._cycle_payload(project_id, cycle_data))
+                    self._record_update(key, node_hash(cycle_data))
+                continue
+            res = self.client.post(url, self._cycle_payload(project_id, cycle_data))
             
             cycle_id = res.get('id')
             cycle_name = cycle_data["name"]
             cycle_map[cycle_name] = cycle_id
             
-            self._record_resource(batch_id, "CYCLE", cycle_id, project_slug)
+            self._record_resource(batch_id, "CYCLE", cycle_id, project_slug, node_key=key,
+                                  payload_hash=node_hash(cycle_data))
         return cycle_map
 
+    def _module_payload(self, module_data):
+        return {
+            "name": module_data["name"]
+        }
+
     def _create_modules(self, workspace_slug: str, project_id: str, modules_data: list, batch_id: str, project_slug: str):
-        """Modules를 생성하고 이름->ID 매핑 반환"""
+        """Modules를 생성하고 이름->ID 매핑 반환 (이미 생성된 Module은 기록된 ID 사용)"""
         module_map = {}
-        for module_data in modules_data:
-            headers = {
-                "Content-Type": "application/json",
-                "x-api-key": self.client.api_key
-            }
-            payload = {
-                "name": module_data["name"]
-            }
+        keys = child_keys(f"{workspace_slug}/{project_slug}", "module", modules_data)
+        for module_data, key in zip(modules_data, keys):
             url = f"{self.client.base_url}/workspaces/{workspace_slug}/projects/{project_id}/modules/"
-            res = self.client.post(url, payload, headers=headers)
+            if key in self._known:
+                module_map[module_data["name"]] = self._known[key]
+                if key in self._updates:
+                    self.client.patch(f"{url}{self._known[key]}/", self._module_payload(module_data))
+                    self._record_update(key, node_hash(module_data))
+                continue
+            res = self.client.post(url, self._module_payload(module_data))
             
             module_id = res.get('id')
             module_name = module_data["name"]
             module_map[module_name] = module_id
             
-            self._record_resource(batch_id, "MODULE", module_id, project_slug)
-        return module_map
\ No newline at end of file
+            self._record_resource(batch_id, "MODULE", module_id, project_slug, node_key=key,
+                                  payload_hash=node_hash(module_data))
+        return module_map
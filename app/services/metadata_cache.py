@@ -0,0 +1,201 @@
+# app/services/metadata_cache.py
+import threading
+import time
+from collections import OrderedDict
+from app.database.models import PlaneMember, PlaneState, PlaneProject
+
+# 기본 State로 우선 선택할 group 순서 (예: Todo)
+DEFAULT_STATE_GROUPS = ("unstarted", "backlog")
+
+
+class MetadataCache:
+    """plane_projects / plane_states / plane_members 테이블의 프로세스 내 캐시
+
+    - 프로젝트: slug -> id, id -> slug 인덱스 (테이블 전체를 한 번에 로드)
+    - 멤버: email -> id 인덱스 (테이블 전체를 한 번에 로드)
+    - 상태: project_id별로 필요할 때 로드하고 group -> [state id] 인덱스 유지,
+      max_projects를 넘으면 가장 오래 쓰지 않은 프로젝트부터 제거 (LRU)
+    모든 항목은 ttl초가 지나면 다음 조회 때 DB에서 다시 읽는다 (ttl이 0이면 만료 없음).
+    MetadataService.sync_* 가 끝나면 invalidate_* 로 해당 항목을 비운다.
+    warm(snapshot)으로 채운 항목도 ttl이 지나면 DB에서 다시 읽고, 조회가 빗나가면
+    (스냅샷 이후 생성된 프로젝트 등) 한 번은 DB에서 다시 읽어 확인한다.
+    """
+    def __init__(self, ttl: float = 300, max_projects: int = 256):
+        self.ttl = ttl
+        self.max_projects = max(max_projects, 1)
+        self._projects = None        # (loaded_at, {slug: id}, {id: slug})
+        self._members = None         # (loaded_at, {email: id})
+        self._states = OrderedDict() # project_id -> (loaded_at, {group: [state id, ...]}, [state id, ...])
+        self._from_snapshot = set()  # 스냅샷으로 채운 항목 ("projects", "members", ("states", project_id))
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_settings(cls, settings):
+        """METADATA_SNAPSHOT_PATH가 있으면 모든 워크스페이스의 스냅샷으로 warm (DB 조회 없음)"""
+        cache = cls(ttl=settings.METADATA_CACHE_TTL, max_projects=settings.METADATA_CACHE_MAX_PROJECTS)
+        if settings.METADATA_SNAPSHOT_PATH:
+            from app.services.metadata_snapshot import MetadataSnapshot
+            snapshots = MetadataSnapshot.load_all(settings.METADATA_SNAPSHOT_PATH,
+                                                  max_age=settings.METADATA_SNAPSHOT_MAX_AGE)
+            if snapshots:
+                cache.warm(*snapshots)
+        return cache
+
+    def warm(self, *snapshots):
+        """MetadataSnapshot(워크스페이스별)들로 프로젝트/멤버/상태 인덱스를 채움 (DB 조회 없음)"""
+        loaded_at = time.monotonic()  # 스냅샷 자체의 신선도는 METADATA_SNAPSHOT_MAX_AGE로 판단
+        by_slug, by_id, by_email, states = {}, {}, {}, {}
+        for snapshot in snapshots:
+            for project_id, slug in snapshot.projects:
+                if slug:
+                    by_slug[slug] = project_id
+                by_id[project_id] = slug
+            by_email.update((email.lower(), member_id) for member_id, email in snapshot.members if email)
+            states.update(snapshot.states)
+        with self._lock:
+            self._projects = (loaded_at, by_slug, by_id)
+            self._members = (loaded_at, by_email)
+            self._from_snapshot = {"projects", "members"}
+            self._states.clear()
+            for project_id, rows in list(states.items())[-self.max_projects:]:
+                by_group, ordered = {}, []
+                for state_id, group in rows:
+                    by_group.setdefault(group, []).append(state_id)
+                    ordered.append(state_id)
+                self._states[project_id] = (loaded_at, by_group, ordered)
+                self._from_snapshot.add(("states", project_id))
+
+    def _drop_snapshot_entry(self, key):
+        """스냅샷에서 온 항목이면 비우고 True (호출한 쪽이 DB에서 다시 조회)"""
+        with self._lock:
+            if key not in self._from_snapshot:
+                return False
+            self._from_snapshot.discard(key)
+            if key == "projects":
+                self._projects = None
+            elif key == "members":
+                self._members = None
+            else:
+                self._states.pop(key[1], None)
+            return True
+
+    def _fresh(self, loaded_at):
+        return not self.ttl or time.monotonic() - loaded_at < self.ttl
+
+    # --- 프로젝트 ---
+
+    def _project_index(self, db):
+        with self._lock:
+            if self._projects is None or not self._fresh(self._projects[0]):
+                by_slug, by_id = {}, {}
+                for project_id, slug in db.query(PlaneProject.id, PlaneProject.slug):
+                    if slug:
+                        by_slug[slug] = project_id
+                    by_id[project_id] = slug
+                self._projects = (time.monotonic(), by_slug, by_id)
+                self._from_snapshot.discard("projects")
+            return self._projects
+
+    def project_id(self, db, slug: str):
+        """slug로 프로젝트 id 조회 (없으면 None)"""
+        project_id = self._project_index(db)[1].get(slug)
+        if project_id is None and self._drop_snapshot_entry("projects"):
+            project_id = self._project_index(db)[1].get(slug)
+        return project_id
+
+    def project_slug(self, db, project_id: str):
+        """프로젝트 id로 slug 조회 (없으면 None)"""
+        by_id = self._project_index(db)[2]
+        if project_id not in by_id and self._drop_snapshot_entry("projects"):
+            by_id = self._project_index(db)[2]
+        return by_id.get(project_id)
+
+    def put_project(self, project_id: str, slug: str):
+        """새로 생성/저장한 프로젝트를 인덱스에 반영 (아직 로드 전이면 다음 로드 때 DB에서 읽음)"""
+        with self._lock:
+            if self._projects is not None:
+                if slug:
+                    self._projects[1][slug] = project_id
+                self._projects[2][project_id] = slug
+
+    def invalidate_projects(self):
+        with self._lock:
+            self._projects = None
+            self._from_snapshot.discard("projects")
+
+    # --- 상태 ---
+
+    def _state_index(self, db, project_id):
+        with self._lock:
+            entry = self._states.get(project_id)
+            if entry is None or not self._fresh(entry[0]):
+                by_group, ordered = {}, []
+                rows = db.query(PlaneState.id, PlaneState.group).filter_by(project_id=project_id)
+                for state_id, group in rows:
+                    by_group.setdefault(group, []).append(state_id)
+                    ordered.append(state_id)
+                entry = (time.monotonic(), by_group, ordered)
+                self._states[project_id] = entry
+                self._from_snapshot.discard(("states", project_id))
+                while len(self._states) > self.max_projects:
+                    self._states.popitem(last=False)
+            self._states.move_to_end(project_id)
+            return entry
+
+    def state_id(self, db, project_id: str, group: str):
+        """project_id + group으로 첫 번째 상태 id 조회 (없으면 None)"""
+        ids = self._state_index(db, project_id)[1].get(group)
+        if not ids and self._drop_snapshot_entry(("states", project_id)):
+            ids = self._state_index(db, project_id)[1].get(group)
+        return ids[0] if ids else None
+
+    def default_state_id(self, db, project_id: str, groups=DEFAULT_STATE_GROUPS):
+        """groups 순서대로 찾은 첫 상태 id, 없으면 프로젝트의 아무 상태 id (상태가 없으면 None)"""
+        _, by_group, ordered = self._state_index(db, project_id)
+        if not ordered and self._drop_snapshot_entry(("states", project_id)):
+            _, by_group, ordered = self._state_index(db, project_id)
+        for group in groups:
+            if by_group.get(group):
+                return by_group[group][0]
+        return ordered[0] if ordered else None
+
+    def invalidate_states(self, project_id: str = None):
+        """project_id의 상태 캐시를 비움 (None이면 전체)"""
+        with self._lock:
+            if project_id is None:
+                self._states.clear()
+                self._from_snapshot = {key for key in self._from_snapshot if not isinstance(key, tuple)}
+            else:
+                self._states.pop(project_id, None)
+                self._from_snapshot.discard(("states", project_id))
+
+    # --- 멤버 ---
+
+    def member_id(self, db, email: str):
+        """email로 멤버 id 조회 (대소문자 무시, 없으면 None)"""
+        if not email:
+            return None
+        with self._lock:
+            if self._members is None or not self._fresh(self._members[0]):
+                by_email = {
+                    member_email.lower(): member_id
+                    for member_id, member_email in db.query(PlaneMember.id, PlaneMember.email)
+                    if member_email
+                }
+                self._members = (time.monotonic(), by_email)
+                self._from_snapshot.discard("members")
+            member_id = self._members[1].get(email.lower())
+        if member_id is None and self._drop_snapshot_entry("members"):
+            return self.member_id(db, email)
+        return member_id
+
+    def invalidate_members(self):
+        with self._lock:
+            self._members = None
+            self._from_snapshot.discard("members")
+
+    def invalidate(self):
+        """모든 항목을 비움"""
+        self.invalidate_projects()
+        self.invalidate_states()
+        self.invalidate_members()
@@ -1,85 +1,311 @@
-import requests
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from sqlalchemy import func, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app.core.errors import APIConnectionError
-from app.database.models import PlaneMember, PlaneState, PlaneProject
+from app.database.models import PlaneMember, PlaneState, PlaneProject, SyncState
+from app.services.metadata_cache import MetadataCache
+from app.services.metadata_snapshot import MetadataSnapshot, snapshot_path
 
 
 class MetadataService:
-    def __init__(self, client):
+    def __init__(self, client, cache: MetadataCache = None, page_size: int = 100, snapshot_path: str = None):
         self.client = client # 1단계에서 만든 PlaneClient 활용
+        self.cache = cache   # 동기화 후 비울 MetadataCache (ExecutionEngine과 공유)
+        self.page_size = page_size  # 목록 조회 시 페이지당 항목 수 (per_page)
+        self.snapshot_path = snapshot_path  # METADATA_SNAPSHOT_PATH, 있으면 sync/프로젝트 생성 후 스냅샷을 다시 씀
+
+    def iter_pages(self, url: str, params: dict = None, etag: str = None):
+        """Plane 목록 API를 cursor 페이지 단위로 순회하며 (항목 리스트, ETag)를 yield
+
+        API가 { "results": [...], "next_cursor": ..., "next_page_results": ... } 형태거나
+        페이지네이션 없는 [...] 리스트 형태일 수 있음.
+        etag를 주면 첫 페이지를 If-None-Match로 요청하고, 304이면 아무것도 yield하지 않는다.
+        ETag는 목록이 한 페이지로 끝났을 때만 함께 yield한다 (그 외에는 None).
+        """
+        base = dict(params or {}, per_page=self.page_size)
+        data, page_etag = self.client.get_conditional(url, params=base, etag=etag)
+        if data is None:
+            return
+        first = True
+        while True:
+            if not isinstance(data, dict):
+                yield (data or []), (page_etag if first else None)
+                return
+            has_next = data.get('next_page_results') and data.get('next_cursor')
+            yield data.get('results', []), (page_etag if first and not has_next else None)
+            if not has_next:
+                return
+            first = False
+            data = self.client.get(url, params=dict(base, cursor=data['next_cursor']))
+
+    def _upsert(self, db, model, rows):
+        """rows를 한 번의 INSERT ... ON CONFLICT (id) DO UPDATE로 저장"""
+        # 같은 문장에서 같은 id를 두 번 갱신할 수 없으므로 마지막 값만 남김
+        rows = list({row["id"]: row for row in rows}.values())
+        if not rows:
+            return 0
+        if model is PlaneProject:
+            drop_replaced_projects(db, rows)
+        stmt = pg_insert(model).values(rows)
+        set_ = {key: stmt.excluded[key] for key in rows[0] if key != "id"}
+        if "workspace_id" in set_:
+            # 응답에 워크스페이스가 없으면 저장된 workspace_id를 유지
+            set_["workspace_id"] = func.coalesce(stmt.excluded.workspace_id, model.workspace_id)
+        stmt = stmt.on_conflict_do_update(index_elements=[model.id], set_=set_)
+        db.execute(stmt)
+        return len(rows)
+
+    def _sync_pages(self, db, url: str, model, to_rows, label: str, workspace_slug: str, resource_type: str,
+                    project_id: str = "", detect_deletions: bool = False, prune=None, seen: set = None,
+                    raise_errors: bool = False):
+        """변경된 항목만 페이지 단위로 upsert하고 저장한 행 수를 반환 (커밋은 마지막에 한 번)
+
+        SyncState의 watermark(마지막 updated_at) 이후 항목만 요청(updated_at__gte)하고,
+        서버가 필터를 무시하더라도 watermark 이전 항목은 쓰지 않는다. ETag가 있으면 조건부 요청.
+        detect_deletions이면 전체 목록을 받아, 목록에 없는 행을 prune(db, seen_ids)로 삭제한다.
+        seen(set)을 주면 전체 목록을 받아 응답의 모든 id를 채운다 (prune은 detect_deletions일 때만).
+        API 오류는 출력하고 0을 반환하며, raise_errors이면 다시 올린다.
+        """
+        state = db.get(SyncState, (workspace_slug, project_id, resource_type)) or SyncState(
+            workspace_slug=workspace_slug, project_id=project_id, resource_type=resource_type
+        )
+        full = detect_deletions or seen is not None
+        since = None if full else _as_utc(state.watermark)
+        params = {"updated_at__gte": since.isoformat()} if since else None
+        etag = None if full else state.etag
+
+        count, pages, newest = 0, 0, since
+        seen = set() if seen is None else seen
+        try:
+            for page, page_etag in self.iter_pages(url, params=params, etag=etag):
+                pages += 1
+                changed = []
+                for item in page:
+                    updated_at = _updated_at(item)
+                    if updated_at is not None:
+                        newest = max(newest, updated_at) if newest else updated_at
+                    if since is None or updated_at is None or updated_at >= since:
+                        changed.append(item)
+                rows = list(to_rows(changed))
+                seen.update(row["id"] for row in rows)
+                count += self._upsert(db, model, rows)
+            if pages == 0:
+                print(f"✅ {label} 변경 없음 (304 Not Modified)")
+                return 0
+            if detect_deletions and prune is not None:
+                deleted = prune(db, seen)
+                if deleted:
+                    print(f"🗑️ 삭제된 {label} {deleted}개 정리")
+        except APIConnectionError as e:
+            db.rollback()
+            print(f"❌ {label} 조회 실패: {e.message}")
+            if raise_errors:
+                raise
+            return 0
+
+        state.watermark = newest
+        state.etag = page_etag
+        db.merge(state)
+        db.commit()
+        return count
 
     def sync_members(self, db, workspace_slug: str):
-        """워크스페이스 멤버 목록 동기화"""
+        """워크스페이스 멤버 목록 동기화 (변경분만)
+
+        plane_members는 워크스페이스별로 나뉘어 있지 않으므로 삭제 감지는 지원하지 않는다.
+        """
         url = f"{self.client.base_url}/workspaces/{workspace_slug}/members/"
-        response = requests.get(url, headers=self.client.headers)
-        
-        if response.status_code == 200:
-            data = response.json()
-            # API가 { "results": [...] } 형태거나 [...] 리스트 형태일 수 있음
-            members = data.get('results', []) if isinstance(data, dict) else data
-            
-            for m in members:
-                # API 응답 구조에 따라 'member' 키 안에 데이터가 있을 수도, 직접 있을 수도 있음
-                user = m.get('member', m) if isinstance(m, dict) else {}
-                if not user.get('id'):
-                    continue
-                    
-                obj = PlaneMember(
-                    id=user.get('id'),
-                    email=user.get('email'),
-                    display_name=user.get('display_name')
-                )
-                db.merge(obj)
-            db.commit()
-            return len(members)
-        return 0
-
-    def sync_project_states(self, db, workspace_slug: str, project_id: str):
-        """특정 프로젝트의 상태(States) 목록 동기화"""
+
+        def to_rows(page):
+            return filter(None, map(_member_row, page))
+
+        count = self._sync_pages(db, url, PlaneMember, to_rows, "멤버", workspace_slug, "MEMBER")
+        if self.cache:
+            self.cache.invalidate_members()
+        return count
+
+    def sync_project_states(self, db, workspace_slug: str, project_id: str, detect_deletions: bool = False,
+                            raise_errors: bool = False):
+        """특정 프로젝트의 상태(States) 목록 동기화 (변경분만, detect_deletions이면 전체 비교 후 삭제 반영)"""
         url = f"{self.client.base_url}/workspaces/{workspace_slug}/projects/{project_id}/states/"
-        response = requests.get(url, headers=self.client.headers)
-        
-        if response.status_code == 200:
-            data = response.json()
-            states = data.get('results', []) if isinstance(data, dict) else data
-            
-            for s in states:
-                if not isinstance(s, dict) or not s.get('id'):
-                    continue
-                    
-                obj = PlaneState(
-                    id=s.get('id'),
-                    project_id=project_id,
-                    name=s.get('name'),
-                    group=s.get('group')
-                )
-                db.merge(obj)
-            db.commit()
-            return len(states)
-        return 0
-    
-    def sync_project_list(self, db, workspace_slug: str):
-        """워크스페이스의 프로젝트 목록 동기화"""
+
+        def to_rows(page):
+            return filter(None, (_state_row(s, project_id) for s in page))
+
+        def prune(db, seen):
+            query = db.query(PlaneState).filter(PlaneState.project_id == project_id)
+            if seen:
+                query = query.filter(PlaneState.id.notin_(seen))
+            return query.delete(synchronize_session=False)
+
+        count = self._sync_pages(db, url, PlaneState, to_rows, "상태", workspace_slug, "STATE",
+                                 project_id=project_id, detect_deletions=detect_deletions, prune=prune,
+                                 raise_errors=raise_errors)
+        if self.cache:
+            self.cache.invalidate_states(project_id)
+        return count
+
+    def sync_project_list(self, db, workspace_slug: str, detect_deletions: bool = False, project_ids: set = None):
+        """워크스페이스의 프로젝트 목록 동기화 (변경분만, detect_deletions이면 전체 비교 후 삭제 반영)
+
+        project_ids(set)를 주면 전체 목록을 받아 워크스페이스의 모든 프로젝트 id를 채운다.
+        """
         url = f"{self.client.base_url}/workspaces/{workspace_slug}/projects/"
-        response = requests.get(url, headers=self.client.headers)
-        
-        if response.status_code == 200:
-            data = response.json()
-            projects = data.get('results', []) if isinstance(data, dict) else data
-            print(f"Response Data: {data}")
-            print(f"Projects: {projects}")
-            for p in projects:
-                if not isinstance(p, dict) or not p.get('id'):
-                    continue
-                    
-                obj = PlaneProject(
-                    id=p.get('id'),
-                    name=p.get('name'),
-                    slug=p.get('slug')
-                )
-                db.merge(obj)
-            db.commit()
-            return len(projects)
-        return 0
+        workspace_ids = set()
+
+        def to_rows(page):
+            for row in filter(None, map(_project_row, page)):
+                if row["workspace_id"]:
+                    workspace_ids.add(row["workspace_id"])
+                yield row
+
+        def prune(db, seen):
+            # 응답에서 확인한 워크스페이스에 속한 행만 정리 (workspace_id를 모르면 건드리지 않음)
+            if not workspace_ids:
+                return 0
+            return db.query(PlaneProject).filter(
+                PlaneProject.workspace_id.in_(workspace_ids), PlaneProject.id.notin_(seen)
+            ).delete(synchronize_session=False)
+
+        count = self._sync_pages(db, url, PlaneProject, to_rows, "프로젝트", workspace_slug, "PROJECT",
+                                 detect_deletions=detect_deletions, prune=prune, seen=project_ids,
+                                 raise_errors=project_ids is not None)
+        if self.cache:
+            self.cache.invalidate_projects()
+        return count
+
+    def sync_workspace(self, session_factory, workspace_slug: str, project_ids=None, max_workers: int = 8,
+                       detect_deletions: bool = False, members: bool = True, snapshot: bool = True):
+        """워크스페이스 메타데이터 전체 동기화: 멤버, 프로젝트 목록(한 번), 프로젝트별 상태(동시에)
+
+        project_ids를 주면 목록 조회 없이 그 프로젝트들의 상태만 동기화한다.
+        프로젝트별 동기화는 최대 max_workers개씩 워커 스레드에서 각자 session_factory()의 Session으로 실행하며,
+        한 프로젝트가 실패해도 나머지는 계속한다. 끝나면 (snapshot이고 snapshot_path가 있으면) 스냅샷을 다시 쓴다.
+        반환: {"members", "projects", "states", "seconds", "timings": {project_id: 초}, "failures": {project_id: 오류}}
+        """
+        started = time.perf_counter()
+        report = {"members": 0, "projects": 0, "states": 0, "timings": {}, "failures": {}}
+        if members or project_ids is None:
+            db = session_factory()
+            try:
+                if members:
+                    report["members"] = self.sync_members(db, workspace_slug)
+                if project_ids is None:
+                    project_ids = set()
+                    report["projects"] = self.sync_project_list(db, workspace_slug, detect_deletions, project_ids)
+            finally:
+                db.close()
+
+        def sync_states(project_id):
+            db = session_factory()
+            project_started = time.perf_counter()
+            try:
+                return self.sync_project_states(db, workspace_slug, project_id, detect_deletions, raise_errors=True), None
+            except Exception as e:
+                db.rollback()
+                return 0, e
+            finally:
+                report["timings"][project_id] = round(time.perf_counter() - project_started, 3)
+                db.close()
+
+        project_ids = sorted(project_ids)
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(project_ids) or 1))) as pool:
+            for project_id, (count, error) in zip(project_ids, pool.map(sync_states, project_ids)):
+                report["states"] += count or 0
+                if error is not None:
+                    report["failures"][project_id] = getattr(error, "message", None) or str(error)
+
+        report["seconds"] = round(time.perf_counter() - started, 3)
+        print(f"✅ {workspace_slug} 동기화: 프로젝트 {len(project_ids)}개, 상태 {report['states']}개, "
+              f"실패 {len(report['failures'])}개 ({report['seconds']}초)")
+        if snapshot:
+            self.refresh_snapshot(session_factory, workspace_slug)
+        return report
+
+    def apply_event(self, db, event: str, action: str, data: dict):
+        """웹훅 이벤트 하나를 plane_projects / plane_states / plane_members에 upsert/delete로 반영
+
+        반영한 행 수를 반환한다 (project/state/member 외의 이벤트는 0). 반영 후 관련 캐시를 비운다.
+        project가 없는 state 이벤트는 저장된 행의 프로젝트로 반영하고, 저장된 행도 없으면 무시한다.
+        plane_members는 워크스페이스 구분이 없어 한 워크스페이스의 멤버 삭제를 반영할 수 없으므로 member delete는 무시한다.
+        sync_states의 watermark는 건드리지 않으므로, 놓친 이벤트는 주기적인 sync가 그대로 맞춘다.
+        스냅샷은 호출한 쪽이 이벤트를 모아 write_snapshots로 다시 쓴다.
+        """
+        if event == "project":
+            model, row = PlaneProject, _project_row(data)
+        elif event == "state":
+            model, row = PlaneState, _state_row(data, data.get("project") or data.get("project_id"))
+        elif event in ("member", "workspace_member"):
+            model, row = PlaneMember, _member_row(data)
+        else:
+            return 0
+        if row is None:
+            return 0
+        if model is PlaneMember and action == "delete":
+            return 0
+        if model is PlaneState and not row["project_id"]:
+            stored = db.get(PlaneState, row["id"])
+            if stored is None:
+                return 0
+            row["project_id"] = stored.project_id
+
+        if action == "delete":
+            count = self._delete_row(db, model, row)
+        else:
+            # update 본문에 없는 필드(None)는 기존 값을 유지
+            values = {k: v for k, v in row.items() if v is not None}
+            if len(values) == 1:
+                return 0
+            count = self._upsert(db, model, [values])
+        db.commit()
+
+        if self.cache:
+            if model is PlaneProject:
+                self.cache.invalidate_projects()
+                self.cache.invalidate_states(row["id"])
+            elif model is PlaneState:
+                self.cache.invalidate_states(row["project_id"])
+            else:
+                self.cache.invalidate_members()
+        return count
+
+    def _delete_row(self, db, model, row):
+        count = db.query(model).filter(model.id == row["id"]).delete(synchronize_session=False)
+        if model is PlaneProject:
+            db.query(PlaneState).filter(PlaneState.project_id == row["id"]).delete(synchronize_session=False)
+        return count
+
+    def write_snapshot(self, db, workspace_slug: str):
+        """workspace_slug의 메타데이터를 스냅샷 파일로 저장 (MetadataCache.from_settings가 읽음, snapshot_path가 없으면 None)"""
+        if not self.snapshot_path:
+            return None
+        path = snapshot_path(self.snapshot_path, workspace_slug)
+        snapshot = MetadataSnapshot.build(db, workspace_slug)
+        snapshot.write(path)
+        print(f"✅ 메타데이터 스냅샷 저장: {path} (프로젝트 {len(snapshot.projects)}개, 멤버 {len(snapshot.members)}명)")
+        return snapshot
+
+    def write_snapshots(self, db):
+        """동기화한 적 있는 모든 워크스페이스의 스냅샷을 다시 저장 (웹훅처럼 워크스페이스를 모를 때)"""
+        if not self.snapshot_path:
+            return []
+        workspaces = [slug for (slug,) in db.query(SyncState.workspace_slug).distinct()]
+        return [self.write_snapshot(db, workspace_slug) for workspace_slug in sorted(workspaces)]
+
+    def refresh_snapshot(self, session_factory, workspace_slug: str):
+        """새 Session으로 write_snapshot (실패해도 출력만 하고 계속)"""
+        if not self.snapshot_path:
+            return None
+        db = session_factory()
+        try:
+            return self.write_snapshot(db, workspace_slug)
+        except Exception as e:
+            print(f"⚠️ 메타데이터 스냅샷 저장 실패: {e}")
+        finally:
+            db.close()
+
     def create_project(self, db, workspace_slug: str, project_name: str, identifier: str = None):
         """새 프로젝트 생성"""
         if identifier is None:
@@ -93,26 +319,27 @@ class MetadataService:
             "identifier": identifier,
             "network": 2  # Public
         }
-        headers = {
-            "Content-Type": "application/json",
-            "x-api-key": self.client.api_key
-        }
-        response = requests.post(url, headers=headers, json=payload)
-        res_json = response.json()
-        print(f"Response create Project: {res_json}")
-        
-        if response.status_code in [201, 200]:
-            data = res_json
-            # 생성된 프로젝트 정보를 DB에도 저장
-            obj = PlaneProject(
-                id=data.get('id'),
-                name=data.get('name'),
-                slug=data.get('slug')
-            )
-            db.merge(obj)
-            db.commit()
-            return data.get('id')
-        return None
+        try:
+            data = self.client.post(url, payload)
+        except APIConnectionError as e:
+            print(f"❌ 프로젝트 생성 실패: {e.message}")
+            return None
+        print(f"Response create Project: {data}")
+
+        # 생성된 프로젝트 정보를 DB에도 저장
+        obj = PlaneProject(
+            id=data.get('id'),
+            name=data.get('name'),
+            slug=data.get('slug'),
+            workspace_id=workspace_id_of(data)
+        )
+        drop_replaced_projects(db, [{"id": obj.id, "slug": obj.slug, "workspace_id": obj.workspace_id}])
+        db.merge(obj)
+        db.commit()
+        if self.cache:
+            self.cache.put_project(obj.id, obj.slug)
+        self.write_snapshot(db, workspace_slug)
+        return data.get('id')
 
     def create_workitem(self, db, workspace_slug: str, project_id: str, title: str, state_id: str = None):
         """새 워크아이템 생성"""
@@ -120,14 +347,16 @@ class MetadataService:
         payload = {
             "name": title
         }
-        
-        response = requests.post(url, headers=self.client.headers, json=payload)
-        res_json = response.json()
+        if state_id:
+            payload["state"] = state_id
+
+        try:
+            res_json = self.client.post(url, payload)
+        except APIConnectionError as e:
+            print(f"❌ 워크아이템 생성 실패: {e.message}")
+            return None
         print(f"Response create Workitem: {res_json}")
-        
-        if response.status_code in [201, 200]:
-            return res_json.get('id')
-        return None
+        return res_json.get('id')
 
     def create_cycle(self, db, workspace_slug: str, project_id: str, name: str, 
                      start_date: str = None, end_date: str = None, description: str = None,
@@ -150,18 +379,67 @@ class MetadataService:
             payload["owned_by"] = owned_by
         if timezone:
             payload["timezone"] = timezone
-        
-        headers = {
-            "Content-Type": "application/json",
-            "x-api-key": self.client.api_key
-        }
-        
-        response = requests.post(url, headers=headers, json=payload)
-        res_json = response.json()
+
+        try:
+            res_json = self.client.post(url, payload)
+        except APIConnectionError as e:
+            print(f"❌ Cycle 생성 실패: {e.details.get('status_code')} - {e.message}")
+            return None
         print(f"Response create Cycle: {res_json}")
-        
-        if response.status_code in [201, 200]:
-            return res_json.get('id')
-        else:
-            print(f"❌ Cycle 생성 실패: {response.status_code} - {res_json}")
-            return None
\ No newline at end of file
+        return res_json.get('id')
+
+
+def drop_replaced_projects(db, rows):
+    """같은 (workspace_id, slug)의 다른 id 행 삭제 (Plane에서 지우고 같은 identifier로 다시 만든 프로젝트)
+
+    uq_plane_projects_workspace_slug는 ON CONFLICT (id) 대상이 아니므로 upsert/merge 전에 호출한다.
+    """
+    keys = [(row["workspace_id"], row["slug"]) for row in rows if row.get("workspace_id") and row.get("slug")]
+    if keys:
+        db.query(PlaneProject).filter(
+            tuple_(PlaneProject.workspace_id, PlaneProject.slug).in_(keys),
+            PlaneProject.id.notin_([row["id"] for row in rows]),
+        ).delete(synchronize_session=False)
+
+
+def workspace_id_of(p):
+    # Plane 프로젝트 응답의 workspace는 UUID (웹훅 본문 등에서는 workspace_id일 수 있음)
+    workspace = p.get('workspace') or p.get('workspace_id')
+    return workspace.get('id') if isinstance(workspace, dict) else workspace
+
+
+def _project_row(p):
+    if isinstance(p, dict) and p.get('id'):
+        return {"id": p['id'], "name": p.get('name'), "slug": p.get('slug'), "workspace_id": workspace_id_of(p)}
+
+
+def _state_row(s, project_id):
+    if isinstance(s, dict) and s.get('id'):
+        return {"id": s['id'], "project_id": project_id, "name": s.get('name'), "group": s.get('group')}
+
+
+def _member_row(m):
+    # API 응답 구조에 따라 'member' 키 안에 데이터가 있을 수도, 직접 있을 수도 있음
+    user = m.get('member', m) if isinstance(m, dict) else {}
+    if isinstance(user, dict) and user.get('id'):
+        return {"id": user['id'], "email": user.get('email'), "display_name": user.get('display_name')}
+
+
+def _as_utc(value):
+    # timezone 정보가 없는 값은 UTC로 간주
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _updated_at(item):
+    """목록 항목의 updated_at (멤버는 'member' 안에 있을 수 있음)을 datetime으로 변환"""
+    if not isinstance(item, dict):
+        return None
+    value = item.get('updated_at')
+    if value is None and isinstance(item.get('member'), dict):
+        value = item['member'].get('updated_at')
+    try:
+        return _as_utc(datetime.fromisoformat(value.replace('Z', '+00:00')))
+    except (AttributeError, ValueError):
+        return None
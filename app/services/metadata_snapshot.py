@@ -0,0 +1,126 @@
+# app/services/metadata_snapshot.py
+import glob
+import marshal
+import os
+import sys
+import time
+from sqlalchemy import or_
+from app.database.models import PlaneMember, PlaneState, PlaneProject, SyncState
+
+# 파일 형식: MAGIC + FORMAT_VERSION(2바이트) + 파이썬 버전(2바이트) + marshal(dict)
+MAGIC = b"GQMETA"
+FORMAT_VERSION = 2
+_HEADER_SIZE = len(MAGIC) + 4
+
+
+class MetadataSnapshot:
+    """워크스페이스 하나의 plane_projects / plane_states와 plane_members 파일 스냅샷
+
+    MetadataService가 메타데이터를 바꿀 때마다(sync, 웹훅 반영, 프로젝트 생성) 워크스페이스별
+    파일(snapshot_path)로 다시 쓰고, 새 프로세스는 MetadataCache.from_settings에서 모든 워크스페이스의
+    파일을 읽어 테이블 조회 없이 캐시를 채운다 (DB와 비교하지 않으므로 다른 호스트의 변경은
+    METADATA_SNAPSHOT_MAX_AGE와 캐시 ttl 안에서만 늦게 반영될 수 있음).
+    marshal 형식이라 수천 행도 수 ms 안에 읽지만 파이썬 버전마다 형식이 다를 수 있어,
+    버전이 다르면 없는 스냅샷으로 취급한다.
+    """
+    def __init__(self, workspace_slug, projects, members, states, created_at: float = None):
+        self.workspace_slug = workspace_slug
+        self.projects = projects      # [(id, slug), ...]
+        self.members = members        # [(id, email), ...]
+        self.states = states          # {project_id: [(id, group), ...]}
+        self.created_at = created_at or time.time()
+
+    @property
+    def age(self):
+        return time.time() - self.created_at
+
+    @classmethod
+    def build(cls, db, workspace_slug: str):
+        """현재 메타데이터 테이블로 workspace_slug의 스냅샷 생성 (멤버는 워크스페이스 구분이 없어 전체)"""
+        projects = [tuple(row) for row in _workspace_projects(db, workspace_slug)]
+        project_ids = [project_id for project_id, _ in projects]
+        states = {}
+        if project_ids:
+            rows = db.query(PlaneState.id, PlaneState.project_id, PlaneState.group).filter(
+                PlaneState.project_id.in_(project_ids))
+            for state_id, project_id, group in rows:
+                states.setdefault(project_id, []).append((state_id, group))
+        return cls(
+            workspace_slug=workspace_slug,
+            projects=projects,
+            members=[tuple(row) for row in db.query(PlaneMember.id, PlaneMember.email)],
+            states=states,
+        )
+
+    def write(self, path: str):
+        """임시 파일에 쓴 뒤 교체 (읽는 프로세스는 항상 완전한 파일을 봄)"""
+        payload = marshal.dumps({
+            "workspace_slug": self.workspace_slug,
+            "created_at": self.created_at,
+            "projects": self.projects,
+            "members": self.members,
+            "states": self.states,
+        })
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_header() + payload)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, max_age: float = None):
+        """스냅샷을 읽음, 없거나 형식/파이썬 버전이 다르거나 max_age초보다 오래됐으면 None"""
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        if data[:_HEADER_SIZE] != _header():
+            print(f"⚠️ 메타데이터 스냅샷 형식이 달라 무시합니다: {path}")
+            return None
+        try:
+            payload = marshal.loads(data[_HEADER_SIZE:])
+        except (EOFError, ValueError, TypeError):
+            print(f"⚠️ 메타데이터 스냅샷을 읽을 수 없어 무시합니다: {path}")
+            return None
+        snapshot = cls(
+            workspace_slug=payload["workspace_slug"],
+            projects=payload["projects"],
+            members=payload["members"],
+            states=payload["states"],
+            created_at=payload["created_at"],
+        )
+        if max_age and snapshot.age > max_age:
+            return None
+        return snapshot
+
+    @classmethod
+    def load_all(cls, path: str, max_age: float = None):
+        """path(METADATA_SNAPSHOT_PATH)로 저장된 모든 워크스페이스의 스냅샷 (읽을 수 없는 파일은 제외)"""
+        paths = sorted(glob.glob(snapshot_path(glob.escape(path), "*")))
+        return [snapshot for snapshot in (cls.load(p, max_age=max_age) for p in paths) if snapshot is not None]
+
+
+def snapshot_path(path: str, workspace_slug: str):
+    """워크스페이스별 스냅샷 파일 경로: path의 {workspace}를 채움 (없으면 확장자 앞에 .<workspace_slug>)"""
+    if "{workspace}" not in path:
+        root, ext = os.path.splitext(path)
+        path = f"{root}.{{workspace}}{ext}"
+    return path.replace("{workspace}", workspace_slug)
+
+
+def _header():
+    return MAGIC + FORMAT_VERSION.to_bytes(2, "big") + bytes(sys.version_info[:2])
+
+
+def _workspace_projects(db, workspace_slug):
+    # plane_projects에는 워크스페이스 slug가 없으므로, 이 워크스페이스로 상태를 동기화한 프로젝트와
+    # 그 프로젝트들과 workspace_id가 같은 프로젝트
+    synced = db.query(SyncState.project_id).filter(
+        SyncState.workspace_slug == workspace_slug, SyncState.resource_type == "STATE")
+    workspace_ids = db.query(PlaneProject.workspace_id).filter(
+        PlaneProject.id.in_(synced), PlaneProject.workspace_id.isnot(None))
+    return db.query(PlaneProject.id, PlaneProject.slug).filter(
+        or_(PlaneProject.id.in_(synced), PlaneProject.workspace_id.in_(workspace_ids)))
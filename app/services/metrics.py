@@ -0,0 +1,258 @@
+# app/services/metrics.py
+import re
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from app.database.models import LogTable
+
+# 지연 시간 히스토그램 버킷 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# URL 경로의 UUID를 {id}로 바꿔 엔드포인트별로 모음
+_UUID = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+
+
+def endpoint_of(url: str, base_url: str = ""):
+    """요청 URL -> 엔드포인트 라벨, 예) /workspaces/gopedia/projects/{id}/work-items/"""
+    path = url[len(base_url):] if base_url and url.startswith(base_url) else url
+    return _UUID.sub("{id}", path.split("?", 1)[0])
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막은 +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        i = 0
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                break
+        else:
+            i = len(self.buckets)
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float):
+        """버킷 상한으로 근사한 분위수"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 4),
+            "avg": round(self.sum / self.count, 4) if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "max": round(self.max, 4),
+        }
+
+
+class Metrics:
+    """배치 실행의 요청/단계별 시간을 히스토그램으로 집계
+
+    PlaneClient는 record_request로 요청마다 (method, endpoint, status, 지연, 재시도 수)를,
+    ExecutionEngine은 phase()로 project/cycles/modules/issues/parse/db_flush 단계 시간을 기록한다.
+    모든 시계열에 batch_id 라벨이 붙으며, summary()는 operation_logs.details용 dict,
+    to_prometheus()는 Prometheus 텍스트 형식을 반환한다.
+    child()로 만든 배치용 Metrics는 기록할 때마다 부모(프로세스 전체 Metrics)에도 batch_id 없이 함께 기록한다.
+    비활성화할 때는 NullMetrics(또는 클라이언트에 None)를 넘기면 기록 비용이 없다.
+    """
+    enabled = True
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, base_url: str = ""):
+        self.buckets = buckets
+        self.base_url = base_url  # 엔드포인트 라벨에서 뺄 접두사
+        self.batch_id = None
+        self.parent = None        # child()로 만든 경우 함께 기록할 Metrics
+        self._histograms = {}     # (name, labels) -> Histogram
+        self._counters = {}       # (name, labels) -> int
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings):
+        """PLANE_METRICS_ENABLED이면 Metrics, 아니면 None (클라이언트/엔진은 None을 기록 안 함으로 처리)"""
+        if not settings.PLANE_METRICS_ENABLED:
+            return None
+        return cls(base_url=settings.PLANE_API_BASE_URL.rstrip('/'))
+
+    def child(self):
+        """배치용 Metrics (summary/log_entry는 이 배치만, 기록은 이 Metrics에도 batch_id 없이 반영)"""
+        child = Metrics(self.buckets, self.base_url)
+        child.parent = self
+        return child
+
+    def observe(self, name: str, value: float, **labels):
+        if self.parent is not None:
+            self.parent.observe(name, value, **labels)
+        key = (name, self._labels(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def inc(self, name: str, amount: int = 1, **labels):
+        if self.parent is not None:
+            self.parent.inc(name, amount, **labels)
+        key = (name, self._labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def _labels(self, labels):
+        if self.batch_id:
+            labels["batch_id"] = self.batch_id
+        return tuple(sorted(labels.items()))
+
+    def record_request(self, method: str, url: str, status, seconds: float, retries: int = 0):
+        endpoint = endpoint_of(url, self.base_url)
+        self.observe("plane_request_seconds", seconds, method=method, endpoint=endpoint, status=str(status))
+        if retries:
+            self.inc("plane_request_retries_total", retries, method=method, endpoint=endpoint)
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("phase_seconds", time.perf_counter() - started, phase=name)
+
+    def timed_iter(self, iterable, phase: str):
+        """이터레이터의 다음 항목을 꺼내는 시간을 phase로 기록 (BatchStream 파싱 시간 측정용)"""
+        iterator = iter(iterable)
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.observe("phase_seconds", time.perf_counter() - started, phase=phase)
+                return
+            self.observe("phase_seconds", time.perf_counter() - started, phase=phase)
+            yield item
+
+    def summary(self, batch_id: str = None):
+        """batch_id(기본은 현재 배치) 시계열의 집계
+
+        {"batch_id": ..., "requests": {"POST /... 201": {...}}, "phases": {...}, "retries": {...}}
+        """
+        batch_id = batch_id or self.batch_id
+        with self._lock:
+            histograms = list(self._histograms.items())
+            counters = list(self._counters.items())
+        result = {"batch_id": batch_id, "requests": {}, "phases": {}, "retries": {}}
+        for (name, labels), histogram in histograms:
+            labels = dict(labels)
+            if labels.get("batch_id") != batch_id:
+                continue
+            if name == "plane_request_seconds":
+                key = f"{labels['method']} {labels['endpoint']} {labels['status']}"
+                result["requests"][key] = histogram.summary()
+            elif name == "phase_seconds":
+                result["phases"][labels["phase"]] = histogram.summary()
+        for (name, labels), value in counters:
+            labels = dict(labels)
+            if labels.get("batch_id") != batch_id:
+                continue
+            if name == "plane_request_retries_total":
+                result["retries"][f"{labels['method']} {labels['endpoint']}"] = value
+        return result
+
+    def log_entry(self, batch_id: str = None, step: str = "METRICS"):
+        """summary()를 details로 담은 LogTable 행 (호출한 쪽에서 add/commit)"""
+        summary = self.summary(batch_id)
+        total = sum(r["count"] for r in summary["requests"].values())
+        return LogTable(
+            level="INFO", step=step, batch_id=batch_id or self.batch_id,
+            message=f"Plane 요청 {total}건, 단계 {len(summary['phases'])}개 집계", details=summary,
+        )
+
+    def to_prometheus(self, prefix: str = "goquest_"):
+        """Prometheus 텍스트 노출 형식"""
+        with self._lock:
+            histograms = sorted(self._histograms.items(), key=lambda kv: kv[0])
+            counters = sorted(self._counters.items(), key=lambda kv: kv[0])
+        lines, typed = [], set()
+        for (name, labels), histogram in histograms:
+            metric = prefix + name
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} histogram")
+                typed.add(metric)
+            cumulative = 0
+            for bound, n in zip(histogram.buckets + ("+Inf",), histogram.counts):
+                cumulative += n
+                lines.append(f"{metric}_bucket{_format_labels(labels + (('le', str(bound)),))} {cumulative}")
+            lines.append(f"{metric}_sum{_format_labels(labels)} {histogram.sum}")
+            lines.append(f"{metric}_count{_format_labels(labels)} {histogram.count}")
+        for (name, labels), value in counters:
+            metric = prefix + name
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} counter")
+                typed.add(metric)
+            lines.append(f"{metric}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str, prefix: str = "goquest_"):
+        """to_prometheus() 결과를 파일로 저장 (node_exporter textfile collector 등에서 수집)"""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus(prefix))
+
+
+class NullMetrics:
+    """기록하지 않는 Metrics (비활성화 시 기본값)"""
+    enabled = False
+    batch_id = None
+
+    def observe(self, name, value, **labels):
+        pass
+
+    def inc(self, name, amount=1, **labels):
+        pass
+
+    def record_request(self, method, url, status, seconds, retries=0):
+        pass
+
+    def phase(self, name):
+        return _NULL_PHASE
+
+    def timed_iter(self, iterable, phase):
+        return iterable
+
+    def summary(self, batch_id=None):
+        return {}
+
+    def log_entry(self, batch_id=None, step="METRICS"):
+        return None
+
+    def to_prometheus(self, prefix="goquest_"):
+        return ""
+
+    def write_prometheus(self, path, prefix="goquest_"):
+        pass
+
+
+_NULL_PHASE = nullcontext()
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (f'{k}="{_escape(v)}"' for k, v in labels)
+    return "{" + ",".join(escaped) + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -1,30 +1,179 @@
 # app/services/plane_client.py
+import copy
+import threading
+import time
+import weakref
 import requests
+from requests.adapters import HTTPAdapter
 from app.core.errors import APIConnectionError
+from app.services.rate_limiter import RateLimiter
+from app.services.metrics import Metrics
 
 class PlaneClient:
-    def __init__(self, base_url: str, api_key: str):
+    def __init__(self, base_url: str, api_key: str, pool_connections: int = 10, pool_maxsize: int = 20,
+                 pool_block: bool = False, keep_alive: bool = True, timeout: float = 30,
+                 limiter: RateLimiter = None, metrics: Metrics = None):
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key
         self.headers = {"x-api-key": api_key}
+        self.timeout = timeout
+        self.metrics = metrics  # None이면 요청 시간을 재지 않음
+        self.limiter = limiter  # 여러 클라이언트가 같은 RateLimiter를 공유할 수 있음
+        self.keep_alive = keep_alive
+        # pool_connections: 캐시할 호스트별 풀 개수, pool_maxsize: 호스트당 최대 커넥션 수,
+        # pool_block: True면 호스트당 한도를 넘을 때 새 커넥션 대신 대기
+        self._adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self._local = threading.local()       # 스레드별 Session
+        self._sessions = weakref.WeakSet()    # close()로 닫을 Session (끝난 스레드의 Session은 자동으로 빠짐)
+        self._sessions_lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings, limiter: RateLimiter = None, metrics: Metrics = None):
+        """Settings의 PLANE_HTTP_* / PLANE_RATE_* 값으로 클라이언트 생성"""
+        return cls(
+            settings.PLANE_API_BASE_URL,
+            settings.PLANE_API_KEY,
+            pool_connections=settings.PLANE_HTTP_POOL_CONNECTIONS,
+            pool_maxsize=settings.PLANE_HTTP_POOL_MAXSIZE,
+            pool_block=settings.PLANE_HTTP_POOL_BLOCK,
+            keep_alive=settings.PLANE_HTTP_KEEP_ALIVE,
+            timeout=settings.PLANE_HTTP_TIMEOUT,
+            limiter=limiter or RateLimiter.from_settings(settings),
+            metrics=metrics,
+        )
+
+    @property
+    def session(self):
+        """현재 스레드의 requests.Session
+
+        Session은 쿠키/헤더 등 상태를 가져 스레드 간 공유가 보장되지 않으므로 스레드마다 하나씩 만들고,
+        커넥션 풀(HTTPAdapter)은 모든 스레드가 공유한다 (urllib3 풀은 스레드 안전).
+        """
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._build_session()
+            with self._sessions_lock:
+                self._sessions.add(session)
+        return session
+
+    def _build_session(self):
+        """공유 커넥션 풀(HTTPAdapter)을 마운트한 Session 생성"""
+        session = requests.Session()
+        session.mount("http://", self._adapter)
+        session.mount("https://", self._adapter)
+        session.headers.update(self.headers)
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def with_metrics(self, metrics: Metrics):
+        """같은 Session/limiter를 쓰면서 요청 시간은 metrics에 기록하는 클라이언트 (배치별 Metrics용, 닫지 않음)"""
+        client = copy.copy(self)
+        client.metrics = metrics
+        return client
+
+    def close(self):
+        with self._sessions_lock:
+            sessions = list(self._sessions)
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+        self._adapter.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
     def test_connection(self, workspace_slug: str):
         """Workspace 정보를 조회하여 연결 확인"""
         url = f"{self.base_url}/workspaces/{workspace_slug}/projects/"
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()
             return response.json()
         except Exception as e:
             raise APIConnectionError(f"Plane 연결 실패: {str(e)}", {"slug": workspace_slug})
 
+    def request(self, method: str, url: str, payload: dict = None, params: dict = None, headers: dict = None):
+        """공용 Session으로 요청을 보내고 JSON 응답을 반환 (본문이 없으면 None)"""
+        response = self._request(method, url, payload, params, headers)
+        if not response.content:
+            return None
+        return response.json()
+
+    def _request(self, method, url, payload=None, params=None, headers=None):
+        """요청을 보내고 성공한 Response를 반환
+
+        limiter가 있으면 토큰/동시성 제한을 거치고, 429/503은 Retry-After 또는 백오프 후 재시도한다.
+        POST는 429, 또는 Retry-After가 있는 503만 재시도한다 (RateLimiter.should_retry).
+        """
+        metrics = self.metrics
+        started = time.perf_counter() if metrics is not None else 0.0
+        attempt = 0
+        while True:
+            response = None
+            try:
+                # headers가 제공되면 기본 headers 위에 덮어씀
+                response = self._send(method, url, payload, params, headers)
+                if self.limiter is not None and self.limiter.should_retry(
+                        method, response.status_code, response.headers.get("Retry-After"), attempt):
+                    delay = self.limiter.on_throttle(url, response.headers.get("Retry-After"), attempt)
+                    print(f"⏳ Plane {response.status_code} 응답, {delay:.1f}초 후 재시도 ({attempt + 1}/{self.limiter.max_retries}): {url}")
+                    attempt += 1
+                    continue
+                response.raise_for_status()
+                if metrics is not None:
+                    metrics.record_request(method, url, response.status_code, time.perf_counter() - started, attempt)
+                return response
+            except Exception as e:
+                details = {"url": url, "method": method, "payload": payload, "attempts": attempt + 1}
+                if response is not None:
+                    details["status_code"] = response.status_code
+                if metrics is not None:
+                    metrics.record_request(method, url, details.get("status_code", "error"),
+                                           time.perf_counter() - started, attempt)
+                raise APIConnectionError(f"Plane {method} 요청 실패: {str(e)}", details)
+
+    def _send(self, method, url, payload, params, headers):
+        if self.limiter is None:
+            return self.session.request(method, url, json=payload, params=params, headers=headers, timeout=self.timeout)
+
+        # 버킷 차단(Retry-After) 또는 토큰 부족 시 대기
+        wait = self.limiter.bucket(url).reserve()
+        if wait > 0:
+            time.sleep(wait)
+        self.limiter.acquire()
+        try:
+            started = time.monotonic()
+            response = self.session.request(method, url, json=payload, params=params, headers=headers, timeout=self.timeout)
+        finally:
+            self.limiter.release()
+        if response.status_code not in self.limiter.RETRY_STATUS:
+            self.limiter.on_success(time.monotonic() - started)
+        return response
+
+    def get(self, url: str, params: dict = None, headers: dict = None):
+        """GET 요청을 보내고 응답을 반환"""
+        return self.request("GET", url, params=params, headers=headers)
+
+    def get_conditional(self, url: str, params: dict = None, etag: str = None):
+        """If-None-Match 조건부 GET, (JSON 응답, ETag)를 반환 (304 Not Modified이면 응답은 None)"""
+        headers = {"If-None-Match": etag} if etag else None
+        response = self._request("GET", url, params=params, headers=headers)
+        if response.status_code == 304:
+            return None, response.headers.get("ETag") or etag
+        return (response.json() if response.content else []), response.headers.get("ETag")
+
     def post(self, url: str, payload: dict, headers: dict = None):
         """POST 요청을 보내고 응답을 반환"""
-        try:
-            # headers가 제공되면 사용하고, 없으면 기본 headers 사용
-            request_headers = headers if headers else self.headers
-            response = requests.post(url, headers=request_headers, json=payload, timeout=30)
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            raise APIConnectionError(f"Plane POST 요청 실패: {str(e)}", {"url": url, "payload": payload})
\ No newline at end of file
+        return self.request("POST", url, payload=payload, headers=headers)
+
+    def patch(self, url: str, payload: dict, headers: dict = None):
+        """PATCH 요청을 보내고 응답을 반환"""
+        return self.request("PATCH", url, payload=payload, headers=headers)
+
+    def delete(self, url: str, headers: dict = None):
+        """DELETE 요청을 보내고 응답을 반환"""
+        return self.request("DELETE", url, headers=headers)
@@ -0,0 +1,130 @@
+# app/services/planner.py
+from collections import Counter, namedtuple
+from app.services.execution_engine import project_key, child_keys, node_hash, load_node_records
+from app.services.metadata_cache import MetadataCache
+
+CREATE = "CREATE"
+UPDATE = "UPDATE"
+UNCHANGED = "UNCHANGED"
+
+RESOURCE_TYPES = ("PROJECT", "CYCLE", "MODULE", "ISSUE")
+
+# 계획의 한 단계: YAML 노드 하나에 대해 할 일
+PlanStep = namedtuple("PlanStep", ["action", "resource_type", "node_key", "name", "plane_id"])
+
+
+class ExecutionPlan:
+    """YAML 배치를 노드 단위로 펼쳐 기존 상태와 비교한 실행 계획
+
+    known/updates는 ExecutionEngine.execute_plan이 그대로 사용하므로,
+    UNCHANGED 노드는 요청 없이 기존 id로 처리되고 CREATE/UPDATE 노드만 요청을 보낸다.
+    """
+    def __init__(self, yaml_data: dict, steps: list, known: dict, updates: set,
+                 link_requests: int = 0, state_sync_requests: int = 0):
+        self.yaml_data = yaml_data  # projects를 리스트로 풀어 둔 원본 (execute_plan에서 재사용)
+        self.steps = steps
+        self.known = known          # node_key -> plane_id (이미 생성된 노드)
+        self.updates = updates      # 내용이 바뀌어 PATCH할 node_key
+        self.link_requests = link_requests              # cycle-issues / module-issues 요청 (대상 Cycle/Module마다 한 번)
+        self.state_sync_requests = state_sync_requests  # 기본 상태가 없어 자동 상태 동기화할 프로젝트 수
+
+    def counts(self):
+        """{resource_type: {action: 개수}}"""
+        counter = Counter((step.resource_type, step.action) for step in self.steps)
+        return {
+            r_type: {action: counter[(r_type, action)] for action in (CREATE, UPDATE, UNCHANGED)}
+            for r_type in RESOURCE_TYPES
+        }
+
+    @property
+    def step_requests(self):
+        """생성 + 수정 요청 수"""
+        return sum(1 for step in self.steps if step.action != UNCHANGED)
+
+    @property
+    def request_budget(self):
+        """실행 시 보낼 Plane API 요청 수 (생성 + 수정 + Cycle/Module 연결 + 상태 동기화)"""
+        return self.step_requests + self.link_requests + self.state_sync_requests
+
+    @property
+    def is_empty(self):
+        return self.step_requests == 0
+
+    def summary(self, rate: float = 0):
+        """사람이 읽을 요약 문자열 (rate는 초당 요청 제한, 주면 예상 소요 시간 포함)"""
+        lines = [f"📋 실행 계획: {self.yaml_data.get('batch_name')}"]
+        for r_type, counts in self.counts().items():
+            lines.append(f"  {r_type:<8} 생성 {counts[CREATE]} / 수정 {counts[UPDATE]} / 유지 {counts[UNCHANGED]}")
+        budget = f"  예상 요청 수: {self.request_budget}"
+        if self.link_requests or self.state_sync_requests:
+            budget += (f" (생성/수정 {self.step_requests}, 연결 {self.link_requests},"
+                       f" 상태 동기화 {self.state_sync_requests})")
+        if rate > 0:
+            budget += f" (초당 {rate:g}건 제한 시 약 {self.request_budget / rate:.0f}초)"
+        lines.append(budget)
+        return "\n".join(lines)
+
+
+class BatchPlanner:
+    """YAML 배치를 plane_projects / created_resources / MetadataCache와 비교해 ExecutionPlan 생성
+
+    include_updates이면 생성 당시와 YAML 내용(payload_hash)이 달라진 Cycle/Module/Issue를 UPDATE로 표시한다.
+    해시가 기록되지 않은 예전 행은 변경 여부를 알 수 없으므로 UNCHANGED로 본다.
+    bulk_membership / state_sync는 실행할 엔진 설정과 맞춰야 요청 수 예상이 맞는다.
+    """
+    def __init__(self, db, cache: MetadataCache = None, include_updates: bool = False,
+                 bulk_membership: bool = True, state_sync: bool = False):
+        self.db = db
+        self.cache = cache or MetadataCache()
+        self.include_updates = include_updates
+        self.bulk_membership = bulk_membership
+        self.state_sync = state_sync
+
+    def plan(self, yaml_data: dict):
+        workspace_slug = yaml_data.get("Workspace Slug")
+        projects = list(yaml_data.get("projects", []))
+        yaml_data = dict(yaml_data, projects=projects)
+        records = load_node_records(self.db, yaml_data.get("batch_name"))
+        steps, known, updates = [], {}, set()
+        links, state_syncs = set(), 0
+
+        def visit(r_type, key, data, existing_id=None):
+            record = records.get(key)
+            plane_id = record[0] if record else existing_id
+            if plane_id is None:
+                action = CREATE
+            elif (self.include_updates and r_type != "PROJECT" and record and record[1]
+                  and record[1] != node_hash(data)):
+                action = UPDATE
+                updates.add(key)
+            else:
+                action = UNCHANGED
+            if record:
+                known[key] = record[0]
+            steps.append(PlanStep(action, r_type, key, data.get("name"), plane_id))
+            return action
+
+        def visit_issues(p_key, parent_key, issues, targets):
+            for i_data, key in zip(issues, child_keys(parent_key, "issue", issues)):
+                # 생성/수정되는 이슈만 엔진이 Cycle/Module에 연결 (대상마다 요청 한 번으로 묶임)
+                if visit("ISSUE", key, i_data) != UNCHANGED and self.bulk_membership:
+                    for kind in ("cycle", "module"):
+                        if i_data.get(kind) in targets[kind]:
+                            links.add((p_key, kind, i_data[kind]))
+                visit_issues(p_key, key, i_data.get("sub_issues", []), targets)
+
+        for p_data in projects:
+            p_key = project_key(workspace_slug, p_data)
+            action = visit("PROJECT", p_key, p_data, self.cache.project_id(self.db, p_data["slug"]))
+            # 엔진은 프로젝트마다 기본 상태를 찾고, 없으면 그 프로젝트의 상태를 한 번 동기화
+            if self.state_sync and (action == CREATE or self.cache.default_state_id(self.db, steps[-1].plane_id) is None):
+                state_syncs += 1
+            targets = {}
+            for kind, field, r_type in (("cycle", "cycles", "CYCLE"), ("module", "modules", "MODULE")):
+                items = p_data.get(field, [])
+                targets[kind] = {data.get("name") for data in items}
+                for data, key in zip(items, child_keys(p_key, kind, items)):
+                    visit(r_type, key, data)
+            visit_issues(p_key, p_key, p_data.get("issues", []), targets)
+
+        return ExecutionPlan(yaml_data, steps, known, updates, len(links), state_syncs)
@@ -0,0 +1,237 @@
+# app/services/rate_limiter.py
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """초당 rate개, 최대 burst개까지 쌓이는 토큰 버킷 (rate가 0이면 무제한)"""
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens = float(self.burst)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """토큰 하나를 예약하고, 요청 전에 기다려야 할 시간(초)을 반환"""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self.blocked_until - now)
+            if self.rate > 0:
+                self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+                self.tokens -= 1
+                if self.tokens < 0:
+                    wait = max(wait, -self.tokens / self.rate)
+            self.updated_at = now
+            return wait
+
+    def block(self, seconds: float):
+        """Retry-After 등으로 지정된 시간 동안 버킷 전체를 막음"""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+class RateLimiter:
+    """PlaneClient / AsyncPlaneClient가 공유하는 클라이언트 측 요청 제한기
+
+    - 토큰 버킷: rules로 워크스페이스/엔드포인트별 초당 요청 수를 지정
+      키 형식은 "<workspace>:<endpoint>", "<workspace>", "*:<endpoint>" 이며 구체적인 것이 우선.
+      예) {"gopedia": 1.0, "gopedia:work-items": 0.5, "*:states": 5}
+    - 429/503 응답은 Retry-After(없으면 지수 백오프 + 지터) 후 재시도
+      (POST는 요청이 처리됐을 수 있어 429, 또는 Retry-After가 있는 503만 재시도)
+    - 동시 요청 수는 AIMD로 조절: 429가 오면 절반으로, 지연이 latency_target 이하이면 1씩 증가
+      스레드와 asyncio 대기자는 하나의 FIFO에서 기다리고, 빈 슬롯은 맨 앞 대기자 하나에게 바로 넘긴다
+    """
+    RETRY_STATUS = (429, 503)
+
+    def __init__(self, rate: float = 0, burst: int = 10, rules: dict = None, max_retries: int = 5,
+                 backoff_base: float = 0.5, backoff_max: float = 30.0,
+                 min_concurrency: int = 1, max_concurrency: int = 16, latency_target: float = 2.0):
+        self.default_rate = rate
+        self.burst = burst
+        self.rules = rules or {}
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.min_concurrency = max(min_concurrency, 1)
+        self.max_concurrency = max(max_concurrency, self.min_concurrency)
+        self.latency_target = latency_target
+
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._waiters = deque()  # 슬롯을 기다리는 _Waiter (스레드/asyncio 공통 FIFO)
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(
+            rate=settings.PLANE_RATE_LIMIT,
+            burst=settings.PLANE_RATE_BURST,
+            rules=settings.PLANE_RATE_LIMIT_RULES,
+            max_retries=settings.PLANE_MAX_RETRIES,
+            backoff_base=settings.PLANE_BACKOFF_BASE,
+            backoff_max=settings.PLANE_BACKOFF_MAX,
+            min_concurrency=settings.PLANE_MIN_CONCURRENCY,
+            max_concurrency=settings.PLANE_MAX_CONCURRENCY,
+            latency_target=settings.PLANE_LATENCY_TARGET,
+        )
+
+    # --- 토큰 버킷 ---
+
+    @staticmethod
+    def route(url: str):
+        """URL에서 (workspace_slug, endpoint) 추출
+
+        /workspaces/gopedia/projects/<id>/work-items/ -> ("gopedia", "work-items")
+        """
+        parts = [p for p in urlparse(url).path.split('/') if p]
+        if "workspaces" not in parts:
+            return None, parts[-1] if parts else ""
+        rest = parts[parts.index("workspaces") + 1:]
+        workspace = rest[0] if rest else None
+        # 마지막 리소스 이름 (UUID 같은 id 세그먼트는 건너뜀)
+        names = [p for p in rest[1:] if not _looks_like_id(p)]
+        return workspace, names[-1] if names else ""
+
+    def _rule_for(self, workspace, endpoint):
+        for key in (f"{workspace}:{endpoint}", f"{workspace}", f"*:{endpoint}"):
+            if key in self.rules:
+                return key, self.rules[key]
+        return "*", self.default_rate
+
+    def bucket(self, url: str):
+        key, rate = self._rule_for(*self.route(url))
+        with self._lock:
+            if key not in self._buckets:
+                self._buckets[key] = TokenBucket(rate, self.burst)
+            return self._buckets[key]
+
+    # --- 동시 요청 수 (AIMD) ---
+
+    def acquire(self):
+        """동시 요청 슬롯 확보 (스레드용, 빈 슬롯이 생길 때까지 대기)"""
+        with self._lock:
+            if self._free():
+                self.in_flight += 1
+                return
+            waiter = _Waiter()
+            self._waiters.append(waiter)
+        waiter.event.wait()
+
+    async def acquire_async(self):
+        """동시 요청 슬롯 확보 (asyncio용)"""
+        with self._lock:
+            if self._free():
+                self.in_flight += 1
+                return
+            loop = asyncio.get_running_loop()
+            waiter = _Waiter(loop, loop.create_future())
+            self._waiters.append(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:
+                    # 슬롯을 받은 직후 취소되었다면 다음 대기자에게 넘김
+                    self.in_flight -= 1
+                    self._grant()
+                elif waiter in self._waiters:
+                    self._waiters.remove(waiter)
+            raise
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+            self._grant()
+
+    def _free(self):
+        # _lock을 잡은 상태에서 호출, 대기자가 있으면 새 요청이 앞지르지 않음
+        return not self._waiters and self.in_flight < int(self.limit)
+
+    def _grant(self):
+        # _lock을 잡은 상태에서 호출, 빈 슬롯마다 맨 앞 대기자 하나를 깨움 (취소된 대기자는 건너뜀)
+        while self._waiters and self.in_flight < int(self.limit):
+            if self._waiters.popleft().wake():
+                self.in_flight += 1
+
+    def on_success(self, latency: float):
+        with self._lock:
+            if latency > self.latency_target:
+                self.limit = max(self.min_concurrency, self.limit - 1)
+            elif self.limit < self.max_concurrency:
+                self.limit = min(self.max_concurrency, self.limit + 1 / max(self.limit, 1))
+                self._grant()
+
+    def should_retry(self, method: str, status_code: int, retry_after: str, attempt: int):
+        """응답을 재시도할지 여부 (멱등이 아닌 POST는 서버가 처리하지 않았다고 알려 준 경우만)"""
+        if status_code not in self.RETRY_STATUS or attempt >= self.max_retries:
+            return False
+        if method.upper() == "POST":
+            return status_code == 429 or retry_after is not None
+        return True
+
+    def on_throttle(self, url: str, retry_after: str, attempt: int):
+        """429/503 응답 처리: 동시성 축소, 버킷 차단 후 다음 재시도까지 대기할 시간 반환"""
+        with self._lock:
+            self.limit = max(self.min_concurrency, self.limit / 2)
+        delay = self.backoff(attempt, parse_retry_after(retry_after))
+        self.bucket(url).block(delay)
+        return delay
+
+    def backoff(self, attempt: int, retry_after: float = None):
+        """재시도 대기 시간: Retry-After가 있으면 그 값 + 작은 지터, 없으면 full jitter 지수 백오프"""
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max) + random.uniform(0, self.backoff_base)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+
+def parse_retry_after(value):
+    """Retry-After 헤더(초 또는 HTTP-date)를 초 단위로 변환"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _looks_like_id(segment: str):
+    return len(segment) >= 32 and segment.count('-') == 4
+
+
+class _Waiter:
+    """acquire(스레드) 또는 acquire_async(future) 대기자, wake()로 슬롯을 넘겨받음"""
+    __slots__ = ("loop", "future", "event", "granted")
+
+    def __init__(self, loop=None, future=None):
+        self.loop = loop
+        self.future = future
+        self.event = threading.Event() if future is None else None
+        self.granted = False
+
+    def wake(self):
+        """슬롯을 넘겼으면 True (이미 취소됐거나 루프가 닫힌 asyncio 대기자는 False)"""
+        if self.future is None:
+            self.event.set()
+        elif self.future.done() or self.loop.is_closed():
+            return False
+        else:
+            self.loop.call_soon_threadsafe(_set_waiter, self.future)
+        self.granted = True
+        return True
+
+
+def _set_waiter(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
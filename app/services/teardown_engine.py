@@ -0,0 +1,201 @@
+# app/services/teardown_engine.py
+from concurrent.futures import ThreadPoolExecutor
+import uuid
+from sqlalchemy import update
+from sqlalchemy.sql import func
+from app.core.errors import APIConnectionError, TeardownError
+from app.database.models import SyncBatch, CreatedResource, BatchStatus, PlaneProject, PendingLink
+from app.services.metadata_cache import MetadataCache
+
+# Plane API 리소스 종류별 경로
+RESOURCE_PATHS = {"ISSUE": "work-items", "CYCLE": "cycles", "MODULE": "modules"}
+
+
+class TeardownEngine:
+    """created_resources 기록을 따라 배치에서 생성한 Plane 리소스를 삭제
+
+    하위 이슈(깊은 것부터) -> 이슈 -> Cycle/Module -> 프로젝트 순으로 단계별 삭제하고,
+    같은 단계의 요청은 워커 풀에서 동시에 보낸다 (PlaneClient의 RateLimiter를 그대로 거침).
+    삭제한 행은 deleted_at을 기록하므로, 중간에 실패해도 다시 호출하면 남은 것만 삭제한다.
+    cascade_projects이면 이 배치가 만든 프로젝트 안의 리소스는 개별 삭제 없이 프로젝트 삭제로 정리한다.
+    프로젝트 id를 찾을 수 없는 행은 삭제하지 않고 unresolved에 남긴 뒤 TeardownError를 낸다 (배치 상태도 그대로).
+    """
+    def __init__(self, client, db, max_workers: int = 8, chunk_size: int = 500,
+                 cache: MetadataCache = None, cascade_projects: bool = False):
+        self.client = client
+        self.db = db
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.cache = cache or MetadataCache()
+        self.cascade_projects = cascade_projects
+        self.unresolved = []  # 프로젝트 id를 찾지 못해 건너뛴 행
+
+    def rollback_batch(self, batch_id: str, workspace_slug: str = None):
+        """batch_id 배치에서 생성한 리소스를 삭제하고 삭제한 개수를 반환 (못 지운 행이 남으면 TeardownError)"""
+        batch = self.db.get(SyncBatch, batch_id)
+        if batch is None:
+            raise ValueError(f"Batch를 찾을 수 없습니다: {batch_id}")
+
+        # 단계마다 커밋하므로 만료되지 않는 컬럼 튜플로 조회
+        rows = (
+            self.db.query(
+                CreatedResource.id, CreatedResource.batch_id, CreatedResource.resource_type, CreatedResource.plane_id,
+                CreatedResource.project_slug, CreatedResource.parent_id, CreatedResource.node_key,
+            )
+            .filter(CreatedResource.batch_id == batch_id, CreatedResource.deleted_at.is_(None))
+            .all()
+        )
+        workspace_slug = workspace_slug or self._workspace_slug(rows)
+        if rows and not workspace_slug:
+            raise ValueError(f"workspace_slug를 알 수 없습니다 (node_key가 없는 배치): {batch_id}")
+        project_ids = self._project_ids(rows)
+        # 잘못된 URL의 404를 삭제 성공으로 기록하지 않도록 프로젝트를 모르는 행은 건너뜀
+        self.unresolved = [row for row in rows if row.project_slug not in project_ids]
+        if self.unresolved:
+            slugs = sorted({str(row.project_slug) for row in self.unresolved})
+            print(f"⚠️ 프로젝트 id를 찾을 수 없어 {len(self.unresolved)}개를 건너뜁니다: {', '.join(slugs)}")
+            rows = [row for row in rows if row.project_slug in project_ids]
+
+        deleted = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for level in self._levels(rows):
+                deleted += self._delete_level(pool, workspace_slug, project_ids, level)
+
+        if self.unresolved:
+            raise TeardownError(
+                f"프로젝트 id를 찾을 수 없는 리소스 {len(self.unresolved)}개를 삭제하지 못했습니다 (sync 후 다시 실행하세요)",
+                {"batch_id": batch_id, "deleted": deleted,
+                 "unresolved": sorted({str(row.project_slug) for row in self.unresolved})},
+            )
+        batch.status = BatchStatus.ROLLED_BACK
+        # 삭제한 이슈의 연결은 다시 보낼 필요가 없음
+        self.db.query(PendingLink).filter(PendingLink.batch_id == batch_id).delete(synchronize_session=False)
+        self.db.commit()
+        return deleted
+
+    def _workspace_slug(self, rows):
+        # node_key는 "<workspace>/<project slug>/..." 형식
+        for row in rows:
+            if row.node_key:
+                return row.node_key.split('/', 1)[0]
+        return None
+
+    def _project_ids(self, rows):
+        """project_slug -> 프로젝트 id (배치에서 만든 프로젝트, 캐시 순으로 찾고 못 찾은 slug는 빠짐)
+
+        엔진은 slug를 모르는 프로젝트의 id를 project_slug에 그대로 기록하므로 id로도 찾는다.
+        """
+        project_ids = {row.project_slug: row.plane_id for row in rows if row.resource_type == "PROJECT"}
+        for slug in {row.project_slug for row in rows} - set(project_ids):
+            if not slug:
+                continue
+            project_id = self.cache.project_id(self.db, slug)
+            if project_id is None and (self.cache.project_slug(self.db, slug) or _is_uuid(slug)):
+                project_id = slug
+            if project_id:
+                project_ids[slug] = project_id
+        return project_ids
+
+    def _levels(self, rows):
+        """삭제 단계 목록 [[row, ...], ...] (앞 단계부터 삭제)"""
+        projects = [row for row in rows if row.resource_type == "PROJECT"]
+        cascaded = {row.project_slug for row in projects} if self.cascade_projects else set()
+        children = [row for row in rows if row.resource_type != "PROJECT" and row.project_slug not in cascaded]
+
+        issues = {row.plane_id: row for row in children if row.resource_type == "ISSUE"}
+        depths = {}
+
+        def depth(row):
+            # 부모 이슈가 같은 배치에 있으면 부모보다 한 단계 깊음
+            chain, visited = [], set()
+            while row.plane_id not in depths:
+                visited.add(row.plane_id)
+                parent = issues.get(row.parent_id)
+                if parent is None or parent.plane_id in visited:
+                    depths[row.plane_id] = 0
+                    break
+                chain.append(row)
+                row = parent
+            d = depths[row.plane_id]
+            for child in reversed(chain):
+                d += 1
+                depths[child.plane_id] = d
+            return d
+
+        by_depth = {}
+        for row in issues.values():
+            by_depth.setdefault(depth(row), []).append(row)
+
+        levels = [by_depth[d] for d in sorted(by_depth, reverse=True)]
+        levels.append([row for row in children if row.resource_type in ("CYCLE", "MODULE")])
+        levels.append(projects)
+        return [level for level in levels if level]
+
+    def _url(self, workspace_slug, project_ids, row):
+        base = f"{self.client.base_url}/workspaces/{workspace_slug}/projects"
+        if row.resource_type == "PROJECT":
+            return f"{base}/{row.plane_id}/"
+        return f"{base}/{project_ids[row.project_slug]}/{RESOURCE_PATHS[row.resource_type]}/{row.plane_id}/"
+
+    def _delete_level(self, pool, workspace_slug, project_ids, rows):
+        """한 단계를 동시에 삭제하고 성공한 행을 기록, 실패가 있으면 다음 단계로 가지 않고 예외"""
+        futures = [(row, pool.submit(self.client.delete, self._url(workspace_slug, project_ids, row))) for row in rows]
+        done, errors = [], []
+        for row, future in futures:
+            try:
+                future.result()
+                done.append(row)
+            except APIConnectionError as e:
+                # 이미 삭제된 리소스는 성공으로 간주
+                if e.details.get("status_code") == 404:
+                    done.append(row)
+                else:
+                    errors.append(e)
+
+        self._mark_deleted(done)
+        print(f"🗑️ {'/'.join(sorted({row.resource_type for row in rows}))} {len(done)}/{len(rows)}개 삭제")
+        if errors:
+            raise APIConnectionError(
+                f"리소스 {len(errors)}개 삭제 실패: {errors[0].message}",
+                {"failed": len(errors), "first_error": errors[0].details},
+            )
+        return len(done)
+
+    def _mark_deleted(self, rows):
+        """삭제한 행에 deleted_at 기록 (프로젝트는 plane_projects와 캐시에서도 제거)"""
+        ids = [row.id for row in rows]
+        for start in range(0, len(ids), self.chunk_size):
+            self.db.execute(
+                update(CreatedResource)
+                .where(CreatedResource.id.in_(ids[start:start + self.chunk_size]))
+                .values(deleted_at=func.now())
+                .execution_options(synchronize_session=False)
+            )
+
+        projects = [row for row in rows if row.resource_type == "PROJECT"]
+        if projects:
+            project_ids = [row.plane_id for row in projects]
+            self.db.query(PlaneProject).filter(PlaneProject.id.in_(project_ids)).delete(synchronize_session=False)
+            if self.cascade_projects:
+                # 프로젝트와 함께 삭제된 하위 리소스
+                self.db.execute(
+                    update(CreatedResource)
+                    .where(CreatedResource.batch_id == projects[0].batch_id,
+                           CreatedResource.project_slug.in_([row.project_slug for row in projects]),
+                           CreatedResource.deleted_at.is_(None))
+                    .values(deleted_at=func.now())
+                    .execution_options(synchronize_session=False)
+                )
+            self.cache.invalidate_projects()
+            for project_id in project_ids:
+                self.cache.invalidate_states(project_id)
+        self.db.commit()
+
+
+def _is_uuid(value: str) -> bool:
+    # Plane 프로젝트 identifier는 UUID 형식이 될 수 없으므로 UUID면 프로젝트 id로 본다
+    try:
+        uuid.UUID(value)
+        return True
+    except ValueError:
+        return False
@@ -0,0 +1,292 @@
+# app/services/template_compiler.py
+"""배치 템플릿 확장
+
+batch.yaml 형식에 변수, 반복, include를 더한 템플릿을 평평한 노드 배열(CompiledBatch)로 확장한다.
+
+    vars:
+      teams:
+        - {name: Search, slug: SRCH}
+        - {name: Ingest, slug: INGS}
+    Workspace Slug: gopedia
+    batch_name: "roadmap_2026"
+    projects:
+      - $for: team
+        $in: ${teams}
+        $do:
+          name: "${team.name} Roadmap"
+          slug: ${team.slug}
+          cycles:
+            - $for: n
+              $in: 3                      # 정수면 1..n
+              $do: {name: "Phase ${n}"}
+          issues:
+            - $include: templates/common_issues.yaml
+              $with: {owner: "${team.name}"}
+
+- `${a.b}`: vars/반복 변수 조회 (문자열 전체가 `${...}`이면 값의 타입을 유지)
+- `$for`/`$in`/`$do` (선택 `$index`: 1부터 시작하는 번호 변수): 리스트 항목 자리에서 반복,
+  `$do`가 리스트면 결과를 펼쳐 넣음
+- `$include` (선택 `$with`): 현재 파일 기준 상대 경로의 YAML을 확장해 삽입,
+  리스트 항목 자리에서 리스트를 include하면 펼쳐 넣고, 다른 키가 함께 있으면 include한 매핑에 덮어씀
+"""
+import os
+import re
+from array import array
+import yaml
+from app.core.errors import TemplateError
+from app.services.batch_loader import Loader
+from app.services.execution_engine import project_key, child_keys, node_hash
+
+# 노드 종류 (CompiledBatch.kinds 값)
+PROJECT, CYCLE, MODULE, ISSUE = range(4)
+RESOURCE_TYPES = ("PROJECT", "CYCLE", "MODULE", "ISSUE")
+
+# payload에서 빼는 하위 노드 필드 (하위 노드는 별도 노드가 됨)
+_NESTED_FIELDS = ("cycles", "modules", "issues", "sub_issues")
+_DIRECTIVES = ("$for", "$in", "$do", "$index", "$include", "$with")
+_VAR = re.compile(r"\$\{\s*([^}]+?)\s*\}")
+
+
+class CompiledBatch:
+    """확장이 끝난 배치의 노드 배열
+
+    노드 i의 종류/부모/Cycle/Module은 kinds[i], parents[i], cycles[i], modules[i] (없으면 -1),
+    node_key/node_hash/자기 필드는 keys[i], hashes[i], payloads[i]에 있다.
+    노드는 프로젝트마다 [프로젝트, Cycle들, Module들, 이슈들(전위 순서)]로 연속해서 놓이며,
+    parents는 Cycle/Module/최상위 이슈이면 프로젝트 index, 하위 이슈이면 부모 이슈 index다.
+    """
+    def __init__(self, header: dict):
+        self.header = header  # Workspace Slug, batch_name 등 (execute_yaml의 yaml_data와 같은 필드)
+        self.kinds = bytearray()
+        self.parents = array("i")
+        self.cycles = array("i")
+        self.modules = array("i")
+        self.keys = []
+        self.hashes = []
+        self.payloads = []
+        self.projects = array("i")  # 프로젝트 노드 index
+
+    def __len__(self):
+        return len(self.kinds)
+
+    @property
+    def workspace_slug(self):
+        return self.header.get("Workspace Slug")
+
+    def counts(self):
+        """{resource_type: 노드 수}"""
+        return {r_type: self.kinds.count(kind) for kind, r_type in enumerate(RESOURCE_TYPES)}
+
+    def project_ranges(self):
+        """프로젝트마다 (프로젝트 index, 다음 프로젝트 index)"""
+        bounds = list(self.projects) + [len(self)]
+        return zip(bounds[:-1], bounds[1:])
+
+    def project_nodes(self, start: int, end: int):
+        """project_ranges의 한 범위를 (Cycle index들, Module index들, 이슈 index들)로 나눔"""
+        groups = ([], [], [])
+        for i in range(start + 1, end):
+            groups[self.kinds[i] - 1].append(i)
+        return groups
+
+    def _add(self, kind, parent, key, data, cycle=-1, module=-1):
+        self.kinds.append(kind)
+        self.parents.append(parent)
+        self.cycles.append(cycle)
+        self.modules.append(module)
+        self.keys.append(key)
+        self.hashes.append(node_hash(data))
+        self.payloads.append({k: v for k, v in data.items() if k not in _NESTED_FIELDS})
+        return len(self.kinds) - 1
+
+    def add_project(self, p_data: dict):
+        """확장된 프로젝트 dict 하나를 노드로 펼침 (이슈 트리는 명시적 스택으로 순회)"""
+        p_key = project_key(self.workspace_slug, p_data)
+        project = self._add(PROJECT, -1, p_key, p_data)
+        self.projects.append(project)
+
+        names = {}
+        for kind, field, code in (("cycle", "cycles", CYCLE), ("module", "modules", MODULE)):
+            items = p_data.get(field) or []
+            index = names[kind] = {}
+            for data, key in zip(items, child_keys(p_key, kind, items)):
+                index[data["name"]] = self._add(code, project, key, data)
+
+        issues = p_data.get("issues") or []
+        stack = list(zip([project] * len(issues), child_keys(p_key, "issue", issues), issues))[::-1]
+        while stack:
+            parent, key, data = stack.pop()
+            node = self._add(
+                ISSUE, parent, key, data,
+                cycle=self._reference(names["cycle"], data, "cycle", p_data),
+                module=self._reference(names["module"], data, "module", p_data),
+            )
+            children = data.get("sub_issues") or []
+            stack.extend(list(zip([node] * len(children), child_keys(key, "issue", children), children))[::-1])
+
+    def _reference(self, index, data, field, p_data):
+        name = data.get(field)
+        if name is None:
+            return -1
+        if name not in index:
+            # execute_yaml과 같이 연결 없이 생성 (템플릿 단계에서 미리 알림)
+            print(f"⚠️ 프로젝트 {p_data['slug']}에 {field} '{name}'이 없습니다 (이슈: {data.get('name')})")
+            return -1
+        return index[name]
+
+    def as_yaml_data(self):
+        """execute_yaml / BatchPlanner / BatchQueue에 넘길 중첩 dict (projects는 하나씩 만드는 제너레이터)"""
+        return dict(self.header, projects=self._iter_projects())
+
+    def _iter_projects(self):
+        for start, end in self.project_ranges():
+            project = dict(self.payloads[start])
+            nodes = {start: project}
+            for i in range(start + 1, end):
+                data = nodes[i] = dict(self.payloads[i])
+                kind = self.kinds[i]
+                if kind == CYCLE:
+                    project.setdefault("cycles", []).append(data)
+                elif kind == MODULE:
+                    project.setdefault("modules", []).append(data)
+                elif self.parents[i] == start:
+                    project.setdefault("issues", []).append(data)
+                else:
+                    nodes[self.parents[i]].setdefault("sub_issues", []).append(data)
+            yield project
+
+
+class TemplateCompiler:
+    """배치 템플릿을 CompiledBatch로 확장
+
+    projects는 항목 하나씩 확장해 바로 노드로 펼치므로, 확장된 전체 트리를 한 번에 메모리에 두지 않는다.
+    include한 파일은 한 번만 파싱한다. variables는 템플릿의 vars를 덮어쓴다 (CLI --var).
+    """
+    def __init__(self, variables: dict = None):
+        self.variables = variables or {}
+        self._files = {}  # 절대 경로 -> 파싱한 YAML
+
+    def compile_file(self, path: str):
+        path = os.path.abspath(path)
+        return self.compile(self._load(path), base_dir=os.path.dirname(path), source=path)
+
+    def compile(self, template: dict, base_dir: str = ".", source: str = None):
+        if not isinstance(template, dict):
+            raise TemplateError("템플릿 최상위는 매핑이어야 합니다")
+        context = (base_dir, (source,) if source else ())
+        scope = dict(self.variables)
+        for name, value in (template.get("vars") or {}).items():
+            if name not in self.variables:
+                scope[name] = self._expand(value, scope, context)  # 앞에서 정의한 변수 사용 가능
+
+        header = {
+            key: self._expand(value, scope, context)
+            for key, value in template.items() if key not in ("vars", "projects")
+        }
+        if not header.get("Workspace Slug"):
+            raise TemplateError("Workspace Slug가 필요합니다")
+        compiled = CompiledBatch(header)
+        for p_data in self._expand_items(template.get("projects") or [], scope, context):
+            if not isinstance(p_data, dict):
+                raise TemplateError(f"프로젝트 항목은 매핑이어야 합니다: {p_data!r}")
+            try:
+                compiled.add_project(p_data)
+            except KeyError as e:
+                raise TemplateError(f"필수 필드 {e}가 없습니다 (프로젝트: {p_data.get('name')})")
+        return compiled
+
+    def _load(self, path):
+        if path not in self._files:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._files[path] = yaml.load(f, Loader=Loader)
+            except OSError as e:
+                raise TemplateError(f"템플릿 파일을 읽을 수 없습니다: {path} ({e})")
+        return self._files[path]
+
+    def _expand(self, value, scope, context):
+        if isinstance(value, str):
+            return _substitute(value, scope)
+        if isinstance(value, list):
+            return list(self._expand_items(value, scope, context))
+        if isinstance(value, dict):
+            if "$for" in value:
+                raise TemplateError("$for는 리스트 항목에서만 사용할 수 있습니다")
+            if "$include" in value:
+                included = self._include(value, scope, context)
+                rest = {k: v for k, v in value.items() if k not in ("$include", "$with")}
+                if not rest:
+                    return included
+                if not isinstance(included, dict):
+                    raise TemplateError(f"다른 키와 함께 include하는 파일은 매핑이어야 합니다: {value['$include']}")
+                return dict(included, **self._expand(rest, scope, context))
+            return {
+                _substitute(key, scope) if isinstance(key, str) else key: self._expand(item, scope, context)
+                for key, item in value.items()
+            }
+        return value
+
+    def _expand_items(self, items, scope, context):
+        """리스트 항목을 확장하며 하나씩 yield ($for 반복, 리스트를 include하면 펼침)"""
+        for item in items:
+            if isinstance(item, dict) and "$for" in item:
+                yield from self._expand_loop(item, scope, context)
+                continue
+            expanded = self._expand(item, scope, context)
+            if isinstance(item, dict) and "$include" in item and isinstance(expanded, list):
+                yield from expanded
+            else:
+                yield expanded
+
+    def _expand_loop(self, item, scope, context):
+        unknown = [key for key in item if isinstance(key, str) and key.startswith("$") and key not in _DIRECTIVES]
+        if unknown or "$do" not in item:
+            raise TemplateError(f"$for 항목에는 $in과 $do가 필요합니다 (알 수 없는 키: {unknown})")
+        values = self._expand(item.get("$in"), scope, context)
+        if isinstance(values, int):
+            values = range(1, values + 1)
+        elif not isinstance(values, list):
+            raise TemplateError(f"$in은 리스트나 정수여야 합니다: {values!r}")
+        body = item["$do"]
+        for number, value in enumerate(values, 1):
+            inner = dict(scope)
+            inner[item["$for"]] = value
+            if item.get("$index"):
+                inner[item["$index"]] = number
+            if isinstance(body, list):
+                yield from self._expand_items(body, inner, context)
+            else:
+                yield self._expand(body, inner, context)
+
+    def _include(self, value, scope, context):
+        base_dir, stack = context
+        path = os.path.normpath(os.path.join(base_dir, str(_substitute(value["$include"], scope))))
+        if path in stack:
+            raise TemplateError(f"include가 순환합니다: {' -> '.join(stack + (path,))}")
+        inner = dict(scope)
+        if value.get("$with"):
+            inner.update(self._expand(value["$with"], scope, context))
+        return self._expand(self._load(path), inner, (os.path.dirname(path), stack + (path,)))
+
+
+def _lookup(name, scope):
+    """a.b.0 형태의 변수 조회"""
+    head, *rest = name.split(".")
+    if head not in scope:
+        raise TemplateError(f"정의되지 않은 변수입니다: ${{{name}}}")
+    value = scope[head]
+    for part in rest:
+        try:
+            value = value[int(part)] if isinstance(value, list) else value[part]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise TemplateError(f"변수를 찾을 수 없습니다: ${{{name}}}")
+    return value
+
+
+def _substitute(text, scope):
+    if "${" not in text:
+        return text
+    match = _VAR.fullmatch(text)
+    if match:
+        return _lookup(match.group(1), scope)
+    return _VAR.sub(lambda m: str(_lookup(m.group(1), scope)), text)
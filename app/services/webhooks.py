@@ -0,0 +1,48 @@
+# app/services/webhooks.py
+"""Plane 웹훅 서명 검증과 본문 해석
+
+Plane은 웹훅 본문을 워크스페이스 웹훅의 secret key로 HMAC-SHA256 서명해 X-Plane-Signature(hex)로 보낸다.
+
+    {"event": "project", "action": "update", "webhook_id": "...", "workspace_id": "...", "data": {...}}
+
+delete 이벤트의 data에는 id만 있을 수 있다. 반영은 MetadataService.apply_event가 담당한다.
+"""
+import hashlib
+import hmac
+import json
+from app.core.errors import WebhookError
+
+SIGNATURE_HEADER = "X-Plane-Signature"
+EVENT_HEADER = "X-Plane-Event"
+DELIVERY_HEADER = "X-Plane-Delivery"
+
+ACTIONS = ("create", "update", "delete")
+
+
+def sign(secret: str, body: bytes):
+    """본문의 HMAC-SHA256 서명 (hex)"""
+    return hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def verify_signature(secret: str, body: bytes, signature: str):
+    if not secret or not signature:
+        return False
+    return hmac.compare_digest(sign(secret, body), signature.strip().lower())
+
+
+def parse_event(body, event: str = None):
+    """웹훅 본문(bytes 또는 dict)을 (event, action, data)로 해석 (event는 본문에 없으면 X-Plane-Event 값)"""
+    if isinstance(body, (bytes, str)):
+        try:
+            body = json.loads(body)
+        except ValueError as e:
+            raise WebhookError(f"웹훅 본문이 JSON이 아닙니다: {e}")
+    if not isinstance(body, dict):
+        raise WebhookError("웹훅 본문은 JSON 객체여야 합니다")
+    event = body.get("event") or event
+    action = body.get("action")
+    data = body.get("data")
+    if not event or action not in ACTIONS or not isinstance(data, dict):
+        raise WebhookError(f"event/action/data가 올바르지 않습니다 (event={event!r}, action={action!r})",
+                           details={"event": event, "action": action})
+    return event, action, data
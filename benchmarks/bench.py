@@ -0,0 +1,268 @@
+# benchmarks/bench.py
+"""로컬 Plane 대역(fake_plane)에 대한 end-to-end 처리량 벤치마크
+
+합성 배치를 execute_yaml로 실행하거나 MetadataService.sync_*를 실행하고
+요청/초, 요청 지연 p50/p99, DB 왕복 횟수, 최대 RSS를 출력한다.
+각 시나리오는 별도 프로세스에서 실행되므로 RSS는 시나리오별 값이다.
+DB는 .env의 설정(Postgres)을 그대로 사용한다.
+
+    python -m benchmarks.bench execute --issues 10 1000 100000 --latency 0.005
+    python -m benchmarks.bench sync --projects 200 --members 500 --throttle 0.01
+    python -m benchmarks.bench execute --issues 1000 --async --json result.json
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import resource
+import socket
+import time
+import uuid
+from sqlalchemy import event
+import uvicorn
+from benchmarks.fake_plane import FakePlaneConfig, create_app
+
+WORKSPACE = "bench"
+
+
+# --- 로컬 서버 ---
+
+def _serve(port, config_kwargs):
+    app = create_app(FakePlaneConfig(**config_kwargs), workspaces=(WORKSPACE,))
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def start_server(config_kwargs: dict):
+    """fake_plane을 별도 프로세스로 띄우고 (process, base_url) 반환"""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    process = multiprocessing.Process(target=_serve, args=(port, config_kwargs), daemon=True)
+    process.start()
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return process, f"http://127.0.0.1:{port}/api/v1"
+        except OSError:
+            time.sleep(0.05)
+    process.terminate()
+    raise RuntimeError("fake_plane 서버가 시작되지 않았습니다")
+
+
+# --- 측정 ---
+
+class RequestRecorder:
+    """클라이언트의 논리 요청(재시도 포함)별 지연을 기록"""
+    def __init__(self, client):
+        self.latencies = []
+        name = "request" if hasattr(client, "aclose") else "_request"
+        original = getattr(client, name)
+        if name == "request":
+            async def timed(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await original(*args, **kwargs)
+                finally:
+                    self.latencies.append(time.perf_counter() - started)
+        else:
+            def timed(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    self.latencies.append(time.perf_counter() - started)
+        setattr(client, name, timed)
+
+    def percentile(self, p: float):
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+class RoundTripCounter:
+    """엔진에서 실행된 SQL 문 수 (executemany는 1회)"""
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+
+def make_batch(issues: int, projects: int = 1, sub_issues: int = 9, cycles: int = 3, modules: int = 3):
+    """issues개의 이슈(상위 이슈마다 sub_issues개 하위 이슈)를 projects개 프로젝트에 나눈 합성 배치"""
+    run = uuid.uuid4().hex[:6].upper()
+    per_project = math.ceil(issues / projects)
+    data = {"Workspace Slug": WORKSPACE, "batch_name": f"bench-{run}", "projects": []}
+    remaining = issues
+    for p in range(projects):
+        count = min(per_project, remaining)
+        remaining -= count
+        tree = []
+        while count > 0:
+            children = min(sub_issues, count - 1)
+            n = len(tree)
+            issue = {"name": f"Issue {n}", "priority": "medium",
+                     "sub_issues": [{"name": f"Issue {n}.{c}"} for c in range(children)]}
+            if cycles:
+                issue["cycle"] = f"Cycle {n % cycles}"
+            if modules:
+                issue["module"] = f"Module {n % modules}"
+            tree.append(issue)
+            count -= children + 1
+        data["projects"].append({
+            "name": f"Bench {run} {p}",
+            "slug": f"B{run}{p}",
+            "cycles": [{"name": f"Cycle {c}"} for c in range(cycles)],
+            "modules": [{"name": f"Module {m}"} for m in range(modules)],
+            "issues": tree,
+        })
+    return data
+
+
+# --- 시나리오 ---
+
+def scenario_execute(base_url: str, issues: int, options: dict):
+    from app.core.config import settings
+    from app.database.session import SessionLocal, engine as db_engine
+    from app.services.plane_client import PlaneClient
+    from app.services.async_plane_client import AsyncPlaneClient
+    from app.services.rate_limiter import RateLimiter
+    from app.services.execution_engine import ExecutionEngine
+    from app.services.async_execution_engine import AsyncExecutionEngine
+
+    limiter = RateLimiter.from_settings(settings)
+    db = SessionLocal()
+    if options["async"]:
+        client = AsyncPlaneClient(base_url, "bench", max_in_flight=settings.PLANE_ASYNC_MAX_IN_FLIGHT, limiter=limiter)
+        runner = AsyncExecutionEngine(client, db, max_projects=settings.PLANE_ASYNC_MAX_PROJECTS,
+                                      chunk_size=settings.DB_BULK_CHUNK_SIZE)
+    else:
+        client = PlaneClient(base_url, "bench", pool_maxsize=settings.PLANE_HTTP_POOL_MAXSIZE, limiter=limiter)
+        runner = ExecutionEngine(client, db, max_workers=settings.PLANE_MAX_WORKERS,
+                                 chunk_size=settings.DB_BULK_CHUNK_SIZE)
+
+    batch = make_batch(issues, projects=options["projects"])
+    recorder = RequestRecorder(client)
+    round_trips = RoundTripCounter(db_engine)
+    started = time.perf_counter()
+    try:
+        runner.execute_yaml(batch)
+    finally:
+        elapsed = time.perf_counter() - started
+        db.close()
+        client.close()
+    return _report("execute_yaml", issues, elapsed, recorder, round_trips)
+
+
+def scenario_sync(base_url: str, size: int, options: dict):
+    from app.database.session import SessionLocal, engine as db_engine
+    from app.services.plane_client import PlaneClient
+    from app.services.metadata_service import MetadataService
+
+    db = SessionLocal()
+    client = PlaneClient(base_url, "bench")
+    service = MetadataService(client, page_size=options["page_size"])
+    recorder = RequestRecorder(client)
+    round_trips = RoundTripCounter(db_engine)
+    started = time.perf_counter()
+    try:
+        service.sync_members(db, WORKSPACE)
+        service.sync_project_list(db, WORKSPACE)
+        project_ids = [p["id"] for page, _ in service.iter_pages(f"{base_url}/workspaces/{WORKSPACE}/projects/")
+                       for p in page]
+        for project_id in project_ids:
+            service.sync_project_states(db, WORKSPACE, project_id)
+    finally:
+        elapsed = time.perf_counter() - started
+        db.close()
+        client.close()
+    return _report("sync", size, elapsed, recorder, round_trips)
+
+
+def _report(scenario, size, elapsed, recorder, round_trips):
+    requests = len(recorder.latencies)
+    return {
+        "scenario": scenario,
+        "size": size,
+        "requests": requests,
+        "seconds": round(elapsed, 3),
+        "requests_per_sec": round(requests / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(recorder.percentile(50) * 1000, 2),
+        "p99_ms": round(recorder.percentile(99) * 1000, 2),
+        "db_round_trips": round_trips.count,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def _isolated(queue, fn, args):
+    try:
+        queue.put(fn(*args))
+    except Exception as e:
+        queue.put({"scenario": fn.__name__, "size": args[1], "error": repr(e)})
+
+
+def run_isolated(fn, *args):
+    """시나리오를 새 프로세스에서 실행해 RSS가 섞이지 않게 함"""
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_isolated, args=(queue, fn, args))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def print_table(results):
+    columns = ("scenario", "size", "requests", "seconds", "requests_per_sec", "p50_ms", "p99_ms",
+               "db_round_trips", "peak_rss_mb")
+    print(" ".join(f"{c:>16}" for c in columns))
+    for result in results:
+        if "error" in result:
+            print(f"{result['scenario']:>16} {result['size']:>16} ERROR {result['error']}")
+            continue
+        print(" ".join(f"{result[c]:>16}" for c in columns))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plane 배치 처리량 벤치마크 (로컬 fake_plane 사용)")
+    parser.add_argument("scenario", choices=("execute", "sync"))
+    parser.add_argument("--issues", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000])
+    parser.add_argument("--projects", type=int, default=1, help="execute: 이슈를 나눌 프로젝트 수, sync: 시드 프로젝트 수")
+    parser.add_argument("--members", type=int, default=100, help="sync: 시드 멤버 수")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--async", dest="use_async", action="store_true", help="AsyncExecutionEngine 사용")
+    parser.add_argument("--latency", type=float, default=0.0, help="요청당 서버 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--throttle", type=float, default=0.0, help="429 응답 비율")
+    parser.add_argument("--retry-after", type=float, default=0.1)
+    parser.add_argument("--failure", type=float, default=0.0, help="500 응답 비율")
+    parser.add_argument("--json", help="결과를 JSON으로 저장할 경로")
+    args = parser.parse_args(argv)
+
+    config = {
+        "latency": args.latency, "jitter": args.jitter, "page_size": args.page_size,
+        "throttle_rate": args.throttle, "retry_after": args.retry_after, "failure_rate": args.failure,
+    }
+    options = {"async": args.use_async, "projects": args.projects, "page_size": args.page_size}
+    if args.scenario == "sync":
+        config.update(seed_projects=args.projects, seed_members=args.members)
+
+    process, base_url = start_server(config)
+    try:
+        if args.scenario == "execute":
+            results = [run_isolated(scenario_execute, base_url, n, options) for n in args.issues]
+        else:
+            results = [run_isolated(scenario_sync, base_url, args.projects, options)]
+    finally:
+        process.terminate()
+
+    print_table(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
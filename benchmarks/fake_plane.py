@@ -0,0 +1,205 @@
+# benchmarks/fake_plane.py
+"""PlaneClient가 사용하는 Plane API 엔드포인트의 로컬 대역 (FastAPI)
+
+프로젝트, 상태, 멤버, Cycle, Module, 워크아이템을 메모리에 저장한다.
+지연 시간, 페이지 크기, 429 주입 비율, 500 실패 비율을 FakePlaneConfig로 조절할 수 있다.
+
+    uvicorn benchmarks.fake_plane:app --port 8011
+"""
+import asyncio
+import hashlib
+import json
+import random
+import uuid
+from datetime import datetime, timezone
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+
+# Plane이 프로젝트 생성 시 만드는 기본 상태
+DEFAULT_STATES = (
+    ("Backlog", "backlog"),
+    ("Todo", "unstarted"),
+    ("In Progress", "started"),
+    ("Done", "completed"),
+    ("Cancelled", "cancelled"),
+)
+
+
+class FakePlaneConfig:
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, page_size: int = 100,
+                 throttle_rate: float = 0.0, retry_after: float = 1.0, failure_rate: float = 0.0,
+                 seed_projects: int = 0, seed_members: int = 0, seed: int = None):
+        self.latency = latency              # 요청당 기본 지연(초)
+        self.jitter = jitter                # 지연에 더할 0~jitter초 난수
+        self.page_size = page_size          # per_page가 없을 때 페이지 크기
+        self.throttle_rate = throttle_rate  # 429 응답 비율 (0~1)
+        self.retry_after = retry_after      # 429 응답의 Retry-After(초)
+        self.failure_rate = failure_rate    # 500 응답 비율 (0~1)
+        self.seed_projects = seed_projects  # 시작 시 만들어 둘 프로젝트 수 (sync 벤치마크용)
+        self.seed_members = seed_members
+        self.random = random.Random(seed)
+
+
+class FakePlaneStore:
+    """워크스페이스별 메모리 저장소"""
+    def __init__(self):
+        self.members = {}    # workspace -> [member]
+        self.projects = {}   # workspace -> {project_id: project}
+        self.states = {}     # project_id -> [state]
+        self.items = {}      # (project_id, kind) -> {id: item}  kind: cycles / modules / work-items
+
+    def seed(self, workspace: str, projects: int, members: int):
+        self.members[workspace] = [
+            {"id": str(uuid.uuid4()), "member": {
+                "id": str(uuid.uuid4()), "email": f"user{i}@example.com", "display_name": f"user{i}",
+                "updated_at": _now(),
+            }}
+            for i in range(members)
+        ]
+        for i in range(projects):
+            self.create_project(workspace, {"name": f"Seed {i}", "identifier": f"S{i}"})
+
+    def create_project(self, workspace: str, payload: dict):
+        project_id = str(uuid.uuid4())
+        project = dict(payload, id=project_id, workspace=_workspace_id(workspace), updated_at=_now())
+        project.setdefault("slug", payload.get("identifier"))
+        self.projects.setdefault(workspace, {})[project_id] = project
+        self.states[project_id] = [
+            {"id": str(uuid.uuid4()), "name": name, "group": group, "project": project_id, "updated_at": _now()}
+            for name, group in DEFAULT_STATES
+        ]
+        return project
+
+    def create_item(self, project_id: str, kind: str, payload: dict):
+        item = dict(payload, id=str(uuid.uuid4()), project=project_id, updated_at=_now())
+        self.items.setdefault((project_id, kind), {})[item["id"]] = item
+        return item
+
+
+def create_app(config: FakePlaneConfig = None, workspaces=("bench",)):
+    config = config or FakePlaneConfig()
+    store = FakePlaneStore()
+    for workspace in workspaces:
+        store.seed(workspace, config.seed_projects, config.seed_members)
+
+    app = FastAPI(title="Fake Plane API")
+    app.state.store = store
+    app.state.config = config
+
+    @app.middleware("http")
+    async def inject(request: Request, call_next):
+        delay = config.latency + config.random.uniform(0, config.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        roll = config.random.random()
+        if roll < config.throttle_rate:
+            return JSONResponse({"detail": "Request was throttled."}, status_code=429,
+                                headers={"Retry-After": f"{config.retry_after:g}"})
+        if roll < config.throttle_rate + config.failure_rate:
+            return JSONResponse({"detail": "Injected failure."}, status_code=500)
+        return await call_next(request)
+
+    def listing(request: Request, items: list, paginate: bool = True):
+        """updated_at__gte 필터, cursor 페이지네이션("<per_page>:<page>:0"), ETag/304 처리"""
+        since = request.query_params.get("updated_at__gte")
+        if since:
+            items = [item for item in items if item.get("updated_at", "") >= since]
+        if paginate:
+            per_page = int(request.query_params.get("per_page") or config.page_size)
+            cursor = request.query_params.get("cursor")
+            page = int(cursor.split(":")[1]) if cursor else 0
+            chunk = items[page * per_page:(page + 1) * per_page]
+            has_next = (page + 1) * per_page < len(items)
+            body = {
+                "results": chunk,
+                "next_cursor": f"{per_page}:{page + 1}:0",
+                "prev_cursor": f"{per_page}:{max(page - 1, 0)}:0",
+                "next_page_results": has_next,
+                "prev_page_results": page > 0,
+                "count": len(chunk),
+                "total_results": len(items),
+            }
+        else:
+            body = items
+        content = json.dumps(body)
+        etag = '"' + hashlib.md5(content.encode()).hexdigest() + '"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        return Response(content, media_type="application/json", headers={"ETag": etag})
+
+    prefix = "/api/v1/workspaces/{workspace}"
+
+    @app.get(prefix + "/members/")
+    async def list_members(workspace: str, request: Request):
+        # Plane의 멤버 API는 페이지네이션 없는 리스트를 반환
+        return listing(request, store.members.get(workspace, []), paginate=False)
+
+    @app.get(prefix + "/projects/")
+    async def list_projects(workspace: str, request: Request):
+        return listing(request, list(store.projects.get(workspace, {}).values()))
+
+    @app.post(prefix + "/projects/", status_code=201)
+    async def create_project(workspace: str, payload: dict):
+        return store.create_project(workspace, payload)
+
+    @app.delete(prefix + "/projects/{project_id}/", status_code=204)
+    async def delete_project(workspace: str, project_id: str):
+        if store.projects.get(workspace, {}).pop(project_id, None) is None:
+            return JSONResponse({"detail": "Not found."}, status_code=404)
+        store.states.pop(project_id, None)
+        for key in [key for key in store.items if key[0] == project_id]:
+            del store.items[key]
+        return Response(status_code=204)
+
+    @app.get(prefix + "/projects/{project_id}/states/")
+    async def list_states(workspace: str, project_id: str, request: Request):
+        return listing(request, store.states.get(project_id, []))
+
+    @app.get(prefix + "/projects/{project_id}/{kind}/")
+    async def list_items(workspace: str, project_id: str, kind: str, request: Request):
+        return listing(request, list(store.items.get((project_id, kind), {}).values()))
+
+    @app.post(prefix + "/projects/{project_id}/{kind}/", status_code=201)
+    async def create_item(workspace: str, project_id: str, kind: str, payload: dict):
+        if project_id not in store.states:
+            return JSONResponse({"detail": "Project not found."}, status_code=404)
+        return store.create_item(project_id, kind, payload)
+
+    @app.patch(prefix + "/projects/{project_id}/{kind}/{item_id}/")
+    async def update_item(workspace: str, project_id: str, kind: str, item_id: str, payload: dict):
+        item = store.items.get((project_id, kind), {}).get(item_id)
+        if item is None:
+            return JSONResponse({"detail": "Not found."}, status_code=404)
+        item.update(payload, updated_at=_now())
+        return item
+
+    @app.delete(prefix + "/projects/{project_id}/{kind}/{item_id}/", status_code=204)
+    async def delete_item(workspace: str, project_id: str, kind: str, item_id: str):
+        if store.items.get((project_id, kind), {}).pop(item_id, None) is None:
+            return JSONResponse({"detail": "Not found."}, status_code=404)
+        return Response(status_code=204)
+
+    @app.post(prefix + "/projects/{project_id}/{kind}/{item_id}/{link}/", status_code=201)
+    async def add_issues(workspace: str, project_id: str, kind: str, item_id: str, link: str, payload: dict):
+        # cycle-issues / module-issues: 요청 하나로 여러 이슈를 Cycle/Module에 추가
+        if item_id not in store.items.get((project_id, kind), {}):
+            return JSONResponse({"detail": "Not found."}, status_code=404)
+        field = "cycle" if kind == "cycles" else "module"
+        work_items = store.items.get((project_id, "work-items"), {})
+        for issue_id in payload.get("issues", []):
+            if issue_id in work_items:
+                work_items[issue_id].update({field: item_id}, updated_at=_now())
+        return {"issues": payload.get("issues", [])}
+
+    return app
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _workspace_id(workspace: str):
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, workspace))
+
+
+app = create_app()
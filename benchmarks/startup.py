@@ -0,0 +1,81 @@
+# benchmarks/startup.py
+"""CLI 시작 비용 벤치마크
+
+새 인터프리터에서 `import main`과 `main.py --help`의 실행 시간을 재고,
+import만으로 무거운 모듈(yaml, requests, sqlalchemy, pydantic, httpx)이 올라오는지 확인한다.
+.env 없이도 실행되며, 무거운 모듈이 올라오거나 --max-ms를 넘으면 종료 코드 1.
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 20 --max-ms 150
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("yaml", "requests", "sqlalchemy", "pydantic", "pydantic_settings", "httpx", "fastapi")
+
+CASES = {
+    "import main": [sys.executable, "-c", "import main"],
+    "main.py --help": [sys.executable, "main.py", "--help"],
+    "python (baseline)": [sys.executable, "-c", "pass"],
+}
+
+
+def _clean_env():
+    # .env / 환경 변수의 설정값이 없어도 시작할 수 있어야 함
+    return {k: v for k, v in os.environ.items() if not k.startswith(("PLANE_", "DB_"))}
+
+
+def time_command(command, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, env=_clean_env(), check=True, stdout=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - started) * 1000)
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples), "max_ms": max(samples)}
+
+
+def loaded_heavy_modules():
+    """import main 직후 sys.modules에 있는 무거운 모듈"""
+    probe = f"import sys, json, main; print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    output = subprocess.run(
+        [sys.executable, "-c", probe], cwd=ROOT, env=_clean_env(), check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CLI 시작 비용 벤치마크")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, help="import main의 중앙값(ms) 한도")
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args(argv)
+
+    results = {name: time_command(command, args.runs) for name, command in CASES.items()}
+    heavy = loaded_heavy_modules()
+    for name, result in results.items():
+        print(f"{name:<20} median {result['median_ms']:7.1f} ms  (min {result['min_ms']:.1f}, max {result['max_ms']:.1f})")
+
+    failed = False
+    if heavy:
+        print(f"❌ import main이 무거운 모듈을 불러옵니다: {', '.join(heavy)}")
+        failed = True
+    if args.max_ms and results["import main"]["median_ms"] > args.max_ms:
+        print(f"❌ import main 중앙값이 한도({args.max_ms} ms)를 넘었습니다")
+        failed = True
+    if not failed:
+        print("✅ 시작 비용 확인 완료")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"results": results, "heavy_modules": heavy}, f, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
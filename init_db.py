@@ -1,10 +1,30 @@
-from app.database.session import engine, Base
+import sys
+from app.core.config import get_settings
+from app.database.session import get_engine, Base
 from app.database import models
+from app.database.migrations import migrate
+from app.database.partitions import run_maintenance
 
 def init():
     print("Creating tables...")
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
     print("Tables created successfully.")
+    apply_migrations()
+
+def apply_migrations():
+    applied = migrate(get_engine())
+    print(f"Migrations applied: {applied}" if applied else "Schema is up to date.")
+
+def maintenance():
+    # cron 등으로 주기적으로 실행 (다음 달 파티션 생성 + 보관 기간 정리)
+    run_maintenance(get_engine(), get_settings())
+    print("Maintenance finished.")
 
 if __name__ == "__main__":
-    init()
\ No newline at end of file
+    command = sys.argv[1] if len(sys.argv) > 1 else "init"
+    if command == "migrate":
+        apply_migrations()
+    elif command == "maintenance":
+        maintenance()
+    else:
+        init()
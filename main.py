@@ -1,15 +1,75 @@
-import yaml
 import os
-from app.core.config import settings
-from app.services.plane_client import PlaneClient
-from app.database.session import SessionLocal
-from app.database.models import LogTable
-from app.services.metadata_service import MetadataService
-from app.services.execution_engine import ExecutionEngine
+import sys
+from contextlib import contextmanager
+
+# import만으로는 설정/DB 엔진/HTTP 클라이언트를 만들지 않도록 무거운 모듈은 함수 안에서 import
+# (cron에서 단계 하나만 실행할 때 시작 비용을 줄임)
+_metadata_cache = None
+
+
+def _settings():
+    from app.core.config import get_settings
+    return get_settings()
+
+
+def _cache():
+    """단계 함수들이 공유하는 메타데이터 캐시 (sync 단계에서 비워짐)"""
+    global _metadata_cache
+    if _metadata_cache is None:
+        from app.services.metadata_cache import MetadataCache
+        _metadata_cache = MetadataCache.from_settings(_settings())
+    return _metadata_cache
+
+
+def _session():
+    from app.database.session import SessionLocal
+    return SessionLocal()
+
+
+def _client(**kwargs):
+    from app.services.plane_client import PlaneClient
+    return PlaneClient.from_settings(_settings(), **kwargs)
+
+
+def _meta_service(client):
+    from app.services.metadata_service import MetadataService
+    settings = _settings()
+    return MetadataService(client, _cache(), page_size=settings.PLANE_SYNC_PAGE_SIZE,
+                           snapshot_path=settings.METADATA_SNAPSHOT_PATH)
+
+
+def _state_sync(client=None):
+    """배치가 상태를 모르는 프로젝트를 만났을 때 실행할 상태 동기화 (METADATA_AUTO_STATE_SYNC가 꺼져 있으면 None)"""
+    settings = _settings()
+    if not settings.METADATA_AUTO_STATE_SYNC:
+        return None
+    from functools import partial
+    from app.database.session import SessionLocal
+    # 스냅샷은 배치가 끝날 때 metadata_changed로 한 번만 다시 씀
+    options = dict(max_workers=settings.METADATA_SYNC_WORKERS, members=False, snapshot=False)
+    if client is not None:
+        return partial(_meta_service(client).sync_workspace, SessionLocal, **options)
+
+    def sync(workspace_slug, project_ids=None):
+        # 비동기 실행에서는 동기 PlaneClient가 없으므로 동기화할 때만 만들고 끝나면 닫음 (스레드에서 실행)
+        with _client() as owned:
+            return _meta_service(owned).sync_workspace(SessionLocal, workspace_slug, project_ids, **options)
+    return sync
+
+
+def _metadata_changed():
+    """METADATA_SNAPSHOT_PATH가 있으면 배치가 프로젝트/상태를 바꾼 뒤 워크스페이스 스냅샷을 다시 쓰는 함수"""
+    if not _settings().METADATA_SNAPSHOT_PATH:
+        return None
+    from functools import partial
+    from app.database.session import SessionLocal
+    return partial(_meta_service(None).refresh_snapshot, SessionLocal)
+
 
 def run_step_1(workspace_slug: str):
-    db = SessionLocal()
-    client = PlaneClient(settings.PLANE_API_BASE_URL, settings.PLANE_API_KEY)
+    from app.database.models import LogTable
+    db = _session()
+    client = _client()
     
     print(f"--- 1단계: 연결 테스트 시작 (Workspace: {workspace_slug}) ---")
     
@@ -28,10 +88,11 @@ def run_step_1(workspace_slug: str):
         print(f"❌ 오류 발생: {e}")
     finally:
         db.close()
+        client.close()
 def run_step_2(workspace_slug: str, test_project_id: str = None):
-    db = SessionLocal()
-    client = PlaneClient(settings.PLANE_API_BASE_URL, settings.PLANE_API_KEY)
-    meta_service = MetadataService(client)
+    db = _session()
+    client = _client()
+    meta_service = _meta_service(client)
     
     print(f"--- 2단계: 메타데이터 동기화 시작 ---")
     
@@ -44,29 +105,56 @@ def run_step_2(workspace_slug: str, test_project_id: str = None):
         if test_project_id:
             state_count = meta_service.sync_project_states(db, workspace_slug, test_project_id)
             print(f"✅ 프로젝트({test_project_id}) 상태 {state_count}개 동기화 완료")
+        meta_service.write_snapshot(db, workspace_slug)
             
     except Exception as e:
         print(f"❌ 2단계 오류: {e}")
     finally:
         db.close()
+        client.close()
 def run_step_3(workspace_slug: str):
-    db = SessionLocal()
-    client = PlaneClient(settings.PLANE_API_BASE_URL, settings.PLANE_API_KEY)
-    meta_service = MetadataService(client)
+    db = _session()
+    client = _client()
+    meta_service = _meta_service(client)
     
     print(f"--- 3단계: 프로젝트 목록 동기화 시작 ---")
     
     try:
         project_count = meta_service.sync_project_list(db, workspace_slug)
         print(f"✅ 프로젝트 {project_count}개 동기화 완료")
+        meta_service.write_snapshot(db, workspace_slug)
     except Exception as e:
         print(f"❌ 3단계 오류: {e}")
     finally:
         db.close()
+        client.close()
+def run_workspace_sync(workspace_slug: str, detect_deletions: bool = False):
+    """멤버, 프로젝트 목록, 모든 프로젝트의 상태를 동기화 (프로젝트별 상태는 동시에)"""
+    from app.database.session import SessionLocal
+    client = _client()
+    meta_service = _meta_service(client)
+
+    print(f"--- 워크스페이스 동기화 시작 (Workspace: {workspace_slug}) ---")
+    try:
+        report = meta_service.sync_workspace(
+            SessionLocal, workspace_slug, max_workers=_settings().METADATA_SYNC_WORKERS,
+            detect_deletions=detect_deletions,
+        )
+        print(f"✅ 멤버 {report['members']}명, 프로젝트 {report['projects']}개, 상태 {report['states']}개")
+        slowest = sorted(report["timings"].items(), key=lambda item: -item[1])[:5]
+        for project_id, seconds in slowest:
+            print(f"  {project_id}: {seconds}초")
+        for project_id, error in report["failures"].items():
+            print(f"❌ {project_id}: {error}")
+        return report
+    except Exception as e:
+        print(f"❌ 워크스페이스 동기화 오류: {e}")
+    finally:
+        client.close()
 def run_step_4(workspace_slug: str, project_name: str, identifier: str = None):
-    db = SessionLocal()
-    client = PlaneClient(settings.PLANE_API_BASE_URL, settings.PLANE_API_KEY)
-    meta_service = MetadataService(client)
+    db = _session()
+    client = _client()
+    meta_service = _meta_service(client)
     
     print(f"--- 4단계: 프로젝트 생성 시작 ---")
     
@@ -77,29 +165,36 @@ def run_step_4(workspace_slug: str, project_name: str, identifier: str = None):
         print(f"❌ 4단계 오류: {e}")
     finally:
         db.close()
+        client.close()
 def run_step_5(workspace_slug: str, project_id: str, workitem_name: str, state_id: str = None):
-    db = SessionLocal()
-    client = PlaneClient(settings.PLANE_API_BASE_URL, settings.PLANE_API_KEY)
-    meta_service = MetadataService(client)
+    """워크아이템 생성 테스트 (project_id 대신 프로젝트 slug도 사용 가능)"""
+    db = _session()
+    client = _client()
+    meta_service = _meta_service(client)
     
     print(f"--- 5단계: 워크아이템 생성 시작 ---")
     try:
-        item_id = meta_service.create_workitem(db, workspace_slug, project_id=project_id, title=workitem_name, state_id=None)
+        project_id = _cache().project_id(db, project_id) or project_id
+        state_id = state_id or _cache().default_state_id(db, project_id)
+        item_id = meta_service.create_workitem(db, workspace_slug, project_id=project_id, title=workitem_name, state_id=state_id)
         print(f"✅ 워크아이템({item_id}) 생성 완료")
     except Exception as e:
         print(f"❌ 5단계 오류: {e}")
     finally:
         db.close()
+        client.close()
 
 def run_step_6(workspace_slug: str, project_id: str, cycle_name: str, 
                start_date: str = None, end_date: str = None, description: str = None, owned_by: str = None):
-    """Cycle 생성 테스트"""
-    db = SessionLocal()
-    client = PlaneClient(settings.PLANE_API_BASE_URL, settings.PLANE_API_KEY)
-    meta_service = MetadataService(client)
+    """Cycle 생성 테스트 (project_id는 slug, owned_by는 멤버 email도 사용 가능)"""
+    db = _session()
+    client = _client()
+    meta_service = _meta_service(client)
     
     print(f"--- 6단계: Cycle 생성 테스트 시작 ---")
     try:
+        project_id = _cache().project_id(db, project_id) or project_id
+        owned_by = _cache().member_id(db, owned_by) or owned_by
         cycle_id = meta_service.create_cycle(
             db, workspace_slug, project_id, cycle_name,
             start_date=start_date, end_date=end_date, description=description, owned_by=owned_by
@@ -114,13 +209,94 @@ def run_step_6(workspace_slug: str, project_id: str, cycle_name: str,
         traceback.print_exc()
     finally:
         db.close()
+        client.close()
+
+
+def _build_engine(db):
+    """설정에 따라 (client, ExecutionEngine 또는 AsyncExecutionEngine) 생성"""
+    from app.services.metrics import Metrics
+    settings = _settings()
+    metrics = Metrics.from_settings(settings)  # client와 engine이 같은 Metrics에 기록
+    if settings.PLANE_ASYNC_EXECUTION:
+        from app.database.session import get_async_sessionmaker
+        from app.services.async_plane_client import AsyncPlaneClient
+        from app.services.async_execution_engine import AsyncExecutionEngine
+        client = AsyncPlaneClient.from_settings(settings, metrics=metrics)
+        engine = AsyncExecutionEngine(
+            client, db, max_projects=settings.PLANE_ASYNC_MAX_PROJECTS, chunk_size=settings.DB_BULK_CHUNK_SIZE,
+            cache=_cache(), cycle_owner_email=settings.PLANE_CYCLE_OWNER_EMAIL, metrics=metrics,
+            bulk_membership=settings.PLANE_BULK_MEMBERSHIP, state_sync=_state_sync(),
+            metadata_changed=_metadata_changed(),
+            async_sessionmaker=get_async_sessionmaker() if settings.DB_ASYNC_ENABLED else None
+        )
+    else:
+        from app.services.execution_engine import ExecutionEngine
+        client = _client(metrics=metrics)
+        engine = ExecutionEngine(
+            client, db, max_workers=settings.PLANE_MAX_WORKERS, chunk_size=settings.DB_BULK_CHUNK_SIZE,
+            cache=_cache(), cycle_owner_email=settings.PLANE_CYCLE_OWNER_EMAIL, metrics=metrics,
+            bulk_membership=settings.PLANE_BULK_MEMBERSHIP, state_sync=_state_sync(client),
+            metadata_changed=_metadata_changed()
+        )
+    return client, engine
+
+
+def _export_metrics(engine):
+    """PLANE_METRICS_EXPORT_PATH가 있으면 배치의 Prometheus 텍스트를 파일로 저장"""
+    settings = _settings()
+    if engine.metrics.enabled and settings.PLANE_METRICS_EXPORT_PATH:
+        engine.metrics.write_prometheus(settings.PLANE_METRICS_EXPORT_PATH)
+        print(f"📈 메트릭 저장: {settings.PLANE_METRICS_EXPORT_PATH}")
+
 
+def _compile_template(template_path: str, variables: dict = None):
+    from app.services.template_compiler import TemplateCompiler
+    compiled = TemplateCompiler(variables).compile_file(template_path)
+    counts = ", ".join(f"{r_type} {count}" for r_type, count in compiled.counts().items())
+    print(f"✅ 템플릿 확장 완료: 노드 {len(compiled)}개 ({counts})")
+    return compiled
 
-def run_yaml_batch(yaml_path: str = "data/batch.yaml"):
-    """YAML 파일을 읽어서 ExecutionEngine으로 실행"""
-    db = SessionLocal()
-    client = PlaneClient(settings.PLANE_API_BASE_URL, settings.PLANE_API_KEY)
-    engine = ExecutionEngine(client, db)
+
+@contextmanager
+def _yaml_source(yaml_path: str, template: bool = False, variables: dict = None):
+    """배치 파일의 yaml_data (template이면 템플릿을 확장한 결과, 아니면 BatchStream)"""
+    if not os.path.exists(yaml_path):
+        raise FileNotFoundError(f"YAML 파일을 찾을 수 없습니다: {yaml_path}")
+    if template or variables:
+        yield _compile_template(yaml_path, variables).as_yaml_data()
+        return
+    from app.services.batch_loader import BatchStream
+    with BatchStream(yaml_path) as stream:
+        yield stream.as_yaml_data()
+
+
+def run_template_batch(template_path: str, variables: dict = None, batch_id: str = None):
+    """배치 템플릿을 한 번 확장하고 CompiledBatch를 바로 실행"""
+    db = _session()
+    client, engine = _build_engine(db)
+
+    print(f"--- 템플릿 배치 실행 시작: {template_path} ---")
+    try:
+        if not os.path.exists(template_path):
+            raise FileNotFoundError(f"템플릿 파일을 찾을 수 없습니다: {template_path}")
+        compiled = _compile_template(template_path, variables)
+        engine.execute_compiled(compiled, batch_id=batch_id)
+        print("✅ 배치 실행 완료")
+    except Exception as e:
+        print(f"❌ 배치 실행 오류: {e}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        _export_metrics(engine)
+        db.close()
+        client.close()
+
+
+def run_yaml_batch(yaml_path: str = "data/batch.yaml", batch_id: str = None):
+    """YAML 파일을 읽어서 ExecutionEngine으로 실행 (batch_id를 주면 실패한 배치를 이어서 실행)"""
+    from app.services.batch_loader import BatchStream
+    db = _session()
+    client, engine = _build_engine(db)
     
     print(f"--- YAML 배치 실행 시작: {yaml_path} ---")
     
@@ -129,13 +305,13 @@ def run_yaml_batch(yaml_path: str = "data/batch.yaml"):
         if not os.path.exists(yaml_path):
             raise FileNotFoundError(f"YAML 파일을 찾을 수 없습니다: {yaml_path}")
         
-        with open(yaml_path, 'r', encoding='utf-8') as f:
-            yaml_data = yaml.safe_load(f)
-        
-        print(f"✅ YAML 파일 로드 완료: {yaml_data.get('batch_name')}")
-        
-        # ExecutionEngine 실행
-        engine.execute_yaml(yaml_data)
+        # 프로젝트 단위로 파싱하면서 바로 실행
+        with BatchStream(yaml_path) as stream:
+            yaml_data = stream.as_yaml_data()
+            print(f"✅ YAML 파일 헤더 로드 완료: {yaml_data.get('batch_name')}")
+
+            # ExecutionEngine 실행
+            engine.execute_yaml(yaml_data, batch_id=batch_id)
         print("✅ 배치 실행 완료")
         
     except Exception as e:
@@ -143,26 +319,373 @@ def run_yaml_batch(yaml_path: str = "data/batch.yaml"):
         import traceback
         traceback.print_exc()
     finally:
+        _export_metrics(engine)
+        db.close()
+        client.close()
+
+
+def plan_yaml_batch(yaml_path: str = "data/batch.yaml", include_updates: bool = False, apply: bool = False,
+                    template: bool = False, variables: dict = None):
+    """YAML 배치(또는 템플릿)를 기존 상태와 비교해 실행 계획을 출력 (apply이면 계획의 생성/수정 단계만 실행)"""
+    from app.services.planner import BatchPlanner
+    db = _session()
+    client, engine = _build_engine(db)
+
+    print(f"--- YAML 배치 실행 계획: {yaml_path} ---")
+
+    try:
+        with _yaml_source(yaml_path, template, variables) as yaml_data:
+            plan = BatchPlanner(db, _cache(), include_updates=include_updates,
+                                bulk_membership=engine.bulk_membership,
+                                state_sync=engine.state_sync is not None).plan(yaml_data)
+        print(plan.summary(rate=_settings().PLANE_RATE_LIMIT))
+
+        if apply:
+            engine.execute_plan(plan)
+            print("✅ 계획 실행 완료")
+        return plan
+
+    except Exception as e:
+        print(f"❌ 실행 계획 오류: {e}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        _export_metrics(engine)
         db.close()
+        client.close()
+
+def enqueue_yaml_batch(yaml_path: str = "data/batch.yaml", split_projects: bool = False,
+                       template: bool = False, variables: dict = None):
+    """YAML 배치(또는 확장한 템플릿)를 sync_batches 큐에 등록 (split_projects이면 프로젝트마다 배치 하나)"""
+    from app.database.session import SessionLocal
+    from app.services.batch_queue import BatchQueue
+    queue = BatchQueue.from_settings(_settings(), SessionLocal)
+    print(f"--- YAML 배치 큐 등록: {yaml_path} ---")
+    try:
+        with _yaml_source(yaml_path, template, variables) as yaml_data:
+            batch_ids = queue.enqueue(yaml_data, split_projects=split_projects)
+        print(f"✅ 배치 {len(batch_ids)}개 등록 완료")
+        return batch_ids
+    except Exception as e:
+        print(f"❌ 큐 등록 오류: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+def run_queue_worker(max_batches: int = None, stop_when_idle: bool = False):
+    """큐의 배치를 가져와 실행하는 워커 (여러 프로세스/호스트에서 동시에 실행 가능)"""
+    from app.database.session import ScopedSession
+    from app.services.batch_queue import BatchQueue, QueueWorker
+    settings = _settings()
+    queue = BatchQueue.from_settings(settings, ScopedSession)
+    worker = QueueWorker(
+        queue, _build_engine,
+        poll_interval=settings.BATCH_QUEUE_POLL_SECONDS,
+        heartbeat_interval=settings.BATCH_QUEUE_HEARTBEAT_SECONDS,
+    )
+    try:
+        processed = worker.run(max_batches=max_batches, stop_when_idle=stop_when_idle)
+        print(f"✅ 워커 종료: 배치 {processed}개 처리")
+    except KeyboardInterrupt:
+        print("⏹️ 워커 중지")
+
+
+def run_rollback_batch(batch_id: str, workspace_slug: str = None, cascade_projects: bool = False):
+    """배치에서 생성한 리소스를 역순으로 삭제 (실패 시 다시 호출하면 남은 것만 삭제)"""
+    from app.core.errors import TeardownError
+    from app.services.teardown_engine import TeardownEngine
+    settings = _settings()
+    db = _session()
+    client = _client()
+    engine = TeardownEngine(
+        client, db, max_workers=settings.PLANE_MAX_WORKERS, chunk_size=settings.DB_BULK_CHUNK_SIZE,
+        cache=_cache(), cascade_projects=cascade_projects
+    )
+
+    print(f"--- 배치 롤백 시작: {batch_id} ---")
+    try:
+        deleted = engine.rollback_batch(batch_id, workspace_slug)
+        print(f"✅ 리소스 {deleted}개 삭제 완료")
+    except TeardownError as e:
+        print(f"⚠️ 리소스 {e.details['deleted']}개 삭제, {e}: {', '.join(e.details['unresolved'])}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ 배치 롤백 오류: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        db.close()
+        client.close()
+
+
+def export_resources(fmt: str = "jsonl", output: str = None, tree: bool = False, batch_id: str = None,
+                     since=None, until=None, resource_type: str = None):
+    """created_resources를 JSONL/CSV로 스트리밍 내보내기 (output이 없으면 stdout), fmt가 summary면 종류별 개수"""
+    from app.database.session import SessionLocal
+    from app.services.batch_report import BatchReport
+    report = BatchReport.from_settings(_settings(), SessionLocal)
+    if fmt == "summary":
+        import json
+        summary = report.summary(batch_id, since, until)
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+        return summary
+
+    out = open(output, "w", encoding="utf-8", newline="") if output else sys.stdout
+    try:
+        for chunk in report.export(fmt, tree=tree, batch_id=batch_id, since=since, until=until,
+                                   resource_type=resource_type):
+            out.write(chunk)
+    finally:
+        if output:
+            out.close()
+    if output:
+        print(f"✅ 내보내기 완료: {output}", file=sys.stderr)
+
+
+def show_batch_status(batch_id: str = None, limit: int = 20):
+    """배치 하나의 상태와 생성 개수, batch_id가 없으면 최근 배치 목록을 출력"""
+    from app.database.session import SessionLocal
+    from app.services.batch_queue import BatchQueue
+    queue = BatchQueue.from_settings(_settings(), SessionLocal)
+    if batch_id is None:
+        for batch in queue.recent_batches(limit):
+            print(f"{batch['id']}  {batch['status']:<11}  {batch['template_name'] or '-'}  (시도 {batch['attempts'] or 0})")
+        return
+    status = queue.batch_status(batch_id)
+    if status is None:
+        print(f"❌ Batch를 찾을 수 없습니다: {batch_id}")
+        return
+    print(f"{status['id']}  {status['status']}  {status['template_name'] or '-'}")
+    if status["error"]:
+        print(f"  오류: {status['error']}")
+    for resource_type, count in sorted(status["created"].items()):
+        print(f"  {resource_type}: {count}")
+    return status
+
+
+def _read_webhook_events(path: str):
+    """JSON 객체 하나, JSON 배열, 또는 JSON Lines 파일의 웹훅 본문들"""
+    import json
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    return data if isinstance(data, list) else [data]
+
+
+def replay_webhooks(paths, url: str = None):
+    """저장해 둔 Plane 웹훅 본문을 다시 적용 (url을 주면 PLANE_WEBHOOK_SECRET으로 서명해 API로 전송)"""
+    import json
+    from app.core.errors import WebhookError
+    from app.services.webhooks import SIGNATURE_HEADER, EVENT_HEADER, sign, parse_event
+    settings = _settings()
+    if url:
+        import requests
+        if not settings.PLANE_WEBHOOK_SECRET:
+            print("❌ --url로 전송하려면 PLANE_WEBHOOK_SECRET이 필요합니다")
+            return
+        http = requests.Session()
+    else:
+        db = _session()
+        meta_service = _meta_service(None)
+
+    applied = 0
+    try:
+        for path in paths:
+            for payload in _read_webhook_events(path):
+                try:
+                    event, action, data = parse_event(payload)
+                except WebhookError as e:
+                    print(f"⚠️ {path}: {e.message}")
+                    continue
+                if url:
+                    body = json.dumps(payload).encode()
+                    res = http.post(url, data=body, headers={
+                        "Content-Type": "application/json", EVENT_HEADER: event,
+                        SIGNATURE_HEADER: sign(settings.PLANE_WEBHOOK_SECRET, body),
+                    })
+                    res.raise_for_status()
+                    count = res.json().get("applied", 0)
+                else:
+                    count = meta_service.apply_event(db, event, action, data)
+                applied += count
+                print(f"{'✅' if count else '↩️'} {event} {action} {data.get('id', '')}")
+        print(f"✅ 웹훅 재생 완료 (반영된 행 {applied}개)")
+        if not url:
+            meta_service.write_snapshots(db)
+    except Exception as e:
+        print(f"❌ 웹훅 재생 오류: {e}")
+    finally:
+        if url:
+            http.close()
+        else:
+            db.close()
+
+
+def _build_parser():
+    import argparse
+    parser = argparse.ArgumentParser(prog="main.py", description="GoQuest Manager CLI")
+    commands = parser.add_subparsers(dest="command")
+
+    check = commands.add_parser("check", help="DB/Plane API 연결 확인")
+    check.add_argument("workspace")
+
+    sync = commands.add_parser("sync", help="멤버/프로젝트/상태 동기화")
+    sync.add_argument("workspace")
+    sync.add_argument("--projects", action="store_true", help="프로젝트 목록 동기화")
+    sync.add_argument("--states", metavar="PROJECT_ID", help="프로젝트의 상태 동기화 (멤버와 함께)")
+    sync.add_argument("--all", action="store_true", help="멤버, 프로젝트 목록, 모든 프로젝트의 상태 (동시에)")
+    sync.add_argument("--detect-deletions", action="store_true", help="--all: 전체 목록과 비교해 삭제 반영")
+
+    create = commands.add_parser("create", help="프로젝트/워크아이템/Cycle 생성")
+    kinds = create.add_subparsers(dest="kind", required=True)
+    project = kinds.add_parser("project")
+    project.add_argument("workspace")
+    project.add_argument("name")
+    project.add_argument("--identifier")
+    workitem = kinds.add_parser("workitem")
+    workitem.add_argument("workspace")
+    workitem.add_argument("project", help="프로젝트 id 또는 slug")
+    workitem.add_argument("name")
+    workitem.add_argument("--state")
+    cycle = kinds.add_parser("cycle")
+    cycle.add_argument("workspace")
+    cycle.add_argument("project", help="프로젝트 id 또는 slug")
+    cycle.add_argument("name")
+    cycle.add_argument("--start-date")
+    cycle.add_argument("--end-date")
+    cycle.add_argument("--description")
+    cycle.add_argument("--owner", help="멤버 id 또는 email")
+
+    run = commands.add_parser("run-batch", help="YAML 배치 실행/계획/큐 등록")
+    run.add_argument("yaml_path", nargs="?", default="data/batch.yaml")
+    run.add_argument("--batch-id", help="실패한 배치를 이어서 실행")
+    run.add_argument("--plan", action="store_true", help="요청 없이 실행 계획만 출력")
+    run.add_argument("--apply", action="store_true", help="실행 계획의 생성/수정 단계만 실행")
+    run.add_argument("--include-updates", action="store_true")
+    run.add_argument("--enqueue", action="store_true", help="실행하지 않고 큐에 등록")
+    run.add_argument("--split-projects", action="store_true", help="큐 등록 시 프로젝트마다 배치 하나")
+    run.add_argument("--template", action="store_true", help="변수/$for/$include가 있는 배치 템플릿")
+    run.add_argument("--var", action="append", default=[], metavar="NAME=VALUE",
+                     help="템플릿 변수 (값은 YAML로 해석, 예: teams='[{name: A, slug: AAA}]'), --template 포함")
+
+    status = commands.add_parser("status", help="배치 상태 (id가 없으면 최근 배치 목록)")
+    status.add_argument("batch_id", nargs="?")
+    status.add_argument("--limit", type=int, default=20)
+
+    worker = commands.add_parser("worker", help="큐 워커 실행")
+    worker.add_argument("--max-batches", type=int)
+    worker.add_argument("--stop-when-idle", action="store_true")
+
+    rollback = commands.add_parser("rollback", help="배치에서 생성한 리소스 삭제")
+    rollback.add_argument("batch_id")
+    rollback.add_argument("--workspace")
+    rollback.add_argument("--cascade-projects", action="store_true")
+
+    report = commands.add_parser("report", help="배치/기간의 created_resources 내보내기 (JSONL/CSV) 또는 종류별 개수")
+    report.add_argument("batch_id", nargs="?")
+    report.add_argument("--since", type=_parse_datetime, help="생성 시각 하한 (ISO 8601, 포함)")
+    report.add_argument("--until", type=_parse_datetime, help="생성 시각 상한 (ISO 8601, 제외)")
+    report.add_argument("--type", dest="resource_type", choices=("PROJECT", "CYCLE", "MODULE", "ISSUE"))
+    report.add_argument("--format", default="jsonl", choices=("jsonl", "csv", "summary"))
+    report.add_argument("--tree", action="store_true", help="parent_id로 이은 트리 순서 (depth 포함)")
+    report.add_argument("-o", "--output", help="출력 파일 (없으면 stdout)")
+
+    webhooks = commands.add_parser("replay-webhooks", help="저장한 Plane 웹훅 본문을 메타데이터 테이블에 다시 적용")
+    webhooks.add_argument("paths", nargs="+", help="JSON / JSON Lines 파일")
+    webhooks.add_argument("--url", help="직접 적용하지 않고 서명해서 보낼 웹훅 URL (예: http://localhost:8011/webhooks/plane)")
+    return parser
+
+
+def _parse_datetime(value: str):
+    from datetime import datetime
+    import argparse
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"ISO 8601 시각이 아닙니다: {value}")
+
+
+def _parse_vars(parser, pairs):
+    """--var NAME=VALUE 목록을 dict로 (값은 YAML 스칼라/리스트/매핑으로 해석)"""
+    if not pairs:
+        return {}
+    import yaml
+    variables = {}
+    for pair in pairs:
+        name, sep, value = pair.partition("=")
+        if not sep or not name:
+            parser.error(f"--var는 NAME=VALUE 형식이어야 합니다: {pair}")
+        variables[name] = yaml.safe_load(value)
+    return variables
+
+
+def main(argv=None):
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "check":
+        run_step_1(args.workspace)
+    elif args.command == "sync":
+        if args.all:
+            run_workspace_sync(args.workspace, args.detect_deletions)
+            return
+        if args.projects:
+            run_step_3(args.workspace)
+        if args.states or not args.projects:
+            run_step_2(args.workspace, args.states)
+    elif args.command == "create":
+        if args.kind == "project":
+            run_step_4(args.workspace, args.name, args.identifier)
+        elif args.kind == "workitem":
+            run_step_5(args.workspace, args.project, args.name, args.state)
+        else:
+            run_step_6(args.workspace, args.project, args.name, start_date=args.start_date,
+                       end_date=args.end_date, description=args.description, owned_by=args.owner)
+    elif args.command == "run-batch":
+        variables = _parse_vars(parser, args.var)
+        template = args.template or bool(variables)
+        if args.enqueue:
+            enqueue_yaml_batch(args.yaml_path, split_projects=args.split_projects, template=template, variables=variables)
+        elif args.plan or args.apply:
+            plan_yaml_batch(args.yaml_path, include_updates=args.include_updates, apply=args.apply,
+                            template=template, variables=variables)
+        elif template:
+            run_template_batch(args.yaml_path, variables, batch_id=args.batch_id)
+        else:
+            run_yaml_batch(args.yaml_path, batch_id=args.batch_id)
+    elif args.command == "status":
+        show_batch_status(args.batch_id, args.limit)
+    elif args.command == "worker":
+        run_queue_worker(args.max_batches, args.stop_when_idle)
+    elif args.command == "rollback":
+        run_rollback_batch(args.batch_id, args.workspace, args.cascade_projects)
+    elif args.command == "report":
+        if not (args.batch_id or args.since or args.until):
+            parser.error("report에는 batch_id나 --since/--until이 필요합니다")
+        export_resources(args.format, args.output, args.tree, args.batch_id, args.since, args.until,
+                         args.resource_type)
+    elif args.command == "replay-webhooks":
+        replay_webhooks(args.paths, args.url)
+    else:
+        # 인자 없이 실행하면 이전처럼 기본 YAML 배치 실행
+        run_yaml_batch("data/batch.yaml")
 
 
 if __name__ == "__main__":
-    # YAML 배치 실행
-    # run_yaml_batch("data/batch.yaml")
-    
-    # Cycle 생성 테스트
-    WS_SLUG = "gopedia"
-    PROJECT_ID = "d0e3ab80-1e0c-4432-8bfd-9bf27589f7a8"  # 테스트용 프로젝트 ID
-    # run_step_6(WS_SLUG, PROJECT_ID, "Test Cycle", owned_by="45c205c7-05fe-420c-b323-f2b1c54adbbf",
-    #            start_date="2025-12-29", end_date="2025-12-31",
-    #            description="Test Cycle Description")
-    
-    # 기존 단계별 실행 함수들 (주석 처리됨)
-    # WS_SLUG = "lyckabc"
-    # PJ_SLUG = "f5badd3d-79d9-4571-aed2-155cb03e4d66"
-    # run_step_1(WS_SLUG)
-    # run_step_2(WS_SLUG, PJ_SLUG)
-    # run_step_3(WS_SLUG)
-    # run_step_4(WS_SLUG, "test_projectB", "TestB")
-    # run_step_5(WS_SLUG, "fbcb63ce-c564-40cb-819a-62c186e89577", "Test Workitem from Script", None)
-    run_yaml_batch("data/batch.yaml")
\ No newline at end of file
+    # 예)
+    #   python main.py check gopedia
+    #   python main.py sync gopedia --projects --states <project_id>
+    #   python main.py sync gopedia --all
+    #   python main.py create cycle gopedia <project_slug> "Test Cycle" --start-date 2025-12-29 --end-date 2025-12-31
+    #   python main.py run-batch data/batch.yaml --plan --include-updates
+    #   python main.py run-batch data/batch.yaml --enqueue --split-projects
+    #   python main.py run-batch data/roadmap.template.yaml --template --var year=2026
+    #   python main.py status [<batch_id>]
+    #   python main.py worker
+    #   python main.py rollback <batch_id>
+    #   python main.py report <batch_id> --format csv --tree -o report.csv
+    #   python main.py replay-webhooks data/webhooks/sample_events.jsonl
+    main(sys.argv[1:])
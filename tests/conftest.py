@@ -0,0 +1,100 @@
+# tests/conftest.py
+# 저장소 루트에서 `pytest`로 실행해도 app / main을 import할 수 있도록
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import pytest
+from sqlalchemy import BigInteger, create_engine, event
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from app.core.errors import APIConnectionError
+
+
+@compiles(BigInteger, "sqlite")
+def _sqlite_bigint(type_, compiler, **kw):
+    # sqlite는 INTEGER PRIMARY KEY만 자동 증가
+    return "INTEGER"
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """임시 sqlite 파일 DB의 Session 팩토리 (스레드마다 별도 커넥션, WAL)"""
+    from app.database.session import Base
+    from app.database import models  # noqa: F401  (테이블 등록)
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False, "timeout": 30})
+
+    @event.listens_for(engine, "connect")
+    def _wal(connection, _):
+        connection.execute("PRAGMA journal_mode=WAL")
+
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    engine.dispose()
+
+
+class FakePlaneClient:
+    """PlaneClient와 같은 메서드로 benchmarks.fake_plane 앱을 호출 (네트워크 없이 TestClient)"""
+    base_url = "http://testserver/api/v1"
+
+    def __init__(self, app):
+        from fastapi.testclient import TestClient
+        self.app = app
+        self.http = TestClient(app)
+        self.calls = []  # (method, url)
+
+    @property
+    def store(self):
+        return self.app.state.store
+
+    def _request(self, method, url, payload=None, params=None, headers=None):
+        self.calls.append((method, url))
+        response = self.http.request(method, url, json=payload, params=params, headers=headers)
+        if response.status_code >= 400:
+            raise APIConnectionError(f"Plane {method} 요청 실패: {response.status_code}",
+                                     {"url": url, "method": method, "status_code": response.status_code})
+        return response
+
+    def request(self, method, url, payload=None, params=None, headers=None):
+        response = self._request(method, url, payload, params, headers)
+        return response.json() if response.content else None
+
+    def get(self, url, params=None, headers=None):
+        return self.request("GET", url, params=params, headers=headers)
+
+    def get_conditional(self, url, params=None, etag=None):
+        response = self._request("GET", url, params=params, headers={"If-None-Match": etag} if etag else None)
+        if response.status_code == 304:
+            return None, response.headers.get("ETag") or etag
+        return (response.json() if response.content else []), response.headers.get("ETag")
+
+    def post(self, url, payload, headers=None):
+        return self.request("POST", url, payload, headers=headers)
+
+    def patch(self, url, payload, headers=None):
+        return self.request("PATCH", url, payload, headers=headers)
+
+    def delete(self, url, headers=None):
+        return self.request("DELETE", url, headers=headers)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_plane():
+    """benchmarks.fake_plane 앱 하나와 그 앱을 부르는 client를 만드는 함수"""
+    from benchmarks.fake_plane import create_app, FakePlaneConfig
+    app = create_app(FakePlaneConfig(), workspaces=("w",))
+    return lambda: FakePlaneClient(app)
+
+
+@pytest.fixture
+def sqlite_upsert(monkeypatch):
+    """MetadataService의 postgresql INSERT ... ON CONFLICT를 sqlite 방언으로 (같은 on_conflict_do_update API)"""
+    from sqlalchemy.dialects.sqlite import insert
+    from app.services import metadata_service
+    monkeypatch.setattr(metadata_service, "pg_insert", insert)
@@ -0,0 +1,60 @@
+# tests/test_batch_loader.py
+import pytest
+import yaml
+from app.services.batch_loader import BatchStream
+
+STREAMED = """\
+Workspace Slug: w
+batch_name: stream
+defaults: &defaults {priority: high, labels: [a, b]}
+projects:
+  - name: P1
+    slug: P1
+    issues:
+      - {name: one, <<: *defaults}
+      - {name: two, priority: low, <<: *defaults}
+  - name: P2
+    slug: P2
+    count: 3
+    due: 2024-01-31
+owner: me
+"""
+
+
+def _write(tmp_path, text):
+    path = tmp_path / "batch.yaml"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_streams_projects_after_header(tmp_path):
+    path = _write(tmp_path, STREAMED)
+    with BatchStream(path) as stream:
+        assert stream._streaming
+        assert stream.header["Workspace Slug"] == "w" and "owner" not in stream.header
+        projects = stream.projects()
+        assert next(projects)["slug"] == "P1"  # 나머지는 아직 파싱하지 않음
+        rest = list(projects)
+        assert stream.header["owner"] == "me"  # projects 뒤의 필드는 다 읽은 뒤 header에 추가
+
+    expected = yaml.safe_load(STREAMED)
+    assert rest == expected["projects"][1:]
+    with BatchStream(path) as stream:
+        data = stream.as_yaml_data()
+        data["projects"] = list(data["projects"])
+    assert data["projects"] == expected["projects"]
+
+
+def test_falls_back_to_full_load_when_header_follows_projects(tmp_path):
+    text = "projects:\n  - {name: P1, slug: P1}\nWorkspace Slug: w\n"
+    with BatchStream(_write(tmp_path, text)) as stream:
+        assert not stream._streaming
+        assert stream.header == {"Workspace Slug": "w"}
+        assert list(stream.projects()) == [{"name": "P1", "slug": "P1"}]
+
+
+def test_file_without_projects_or_mapping(tmp_path):
+    with BatchStream(_write(tmp_path, "Workspace Slug: w\n")) as stream:
+        assert stream.header == {"Workspace Slug": "w"} and list(stream.projects()) == []
+    with pytest.raises(ValueError):
+        BatchStream(_write(tmp_path, "- just\n- a list\n"))
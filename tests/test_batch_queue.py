@@ -0,0 +1,102 @@
+# tests/test_batch_queue.py
+import time
+from datetime import datetime
+from sqlalchemy import func
+from app.database.models import SyncBatch, BatchStatus
+from app.services.batch_queue import BatchQueue, QueueWorker
+from app.services.execution_engine import ExecutionEngine
+
+PAYLOAD = {
+    "Workspace Slug": "w", "batch_name": "lease",
+    "projects": [
+        {"name": "P1", "slug": "P1", "issues": [{"name": "a"}, {"name": "b"}]},
+        {"name": "P2", "slug": "P2", "issues": [{"name": "c"}]},
+    ],
+}
+
+
+class SqliteBatchQueue(BatchQueue):
+    # sqlite에는 now() + interval이 없어 lease 만료 시각만 datetime()으로 계산
+    def _lease_deadline(self):
+        return func.datetime("now", f"+{int(self.lease_seconds)} seconds")
+
+
+def _batch(session_factory, batch_id):
+    db = session_factory()
+    try:
+        batch = db.get(SyncBatch, batch_id)
+        return batch.status, batch.worker_id
+    finally:
+        db.close()
+
+
+def _expire(session_factory, batch_id):
+    db = session_factory()
+    db.query(SyncBatch).filter(SyncBatch.id == batch_id).update({SyncBatch.lease_expires_at: datetime(2000, 1, 1)})
+    db.commit()
+    db.close()
+
+
+def test_claim_takes_queued_batches_once(session_factory):
+    queue = SqliteBatchQueue(session_factory)
+    first, second = queue.enqueue(PAYLOAD, split_projects=True)
+    assert queue.claim("A").id == first
+    assert queue.claim("B").id == second
+    assert queue.claim("C") is None
+    assert queue.heartbeat(first, "A") and not queue.heartbeat(first, "B")
+
+
+def test_finish_requeues_until_max_attempts(session_factory):
+    queue = SqliteBatchQueue(session_factory, max_attempts=2)
+    (batch_id,) = queue.enqueue(PAYLOAD)
+    queue.claim("A")
+    queue.finish(batch_id, "A", RuntimeError("boom"))
+    assert _batch(session_factory, batch_id) == (BatchStatus.QUEUED, None)
+    queue.claim("A")
+    queue.finish(batch_id, "A", RuntimeError("boom"))
+    assert _batch(session_factory, batch_id) == (BatchStatus.FAILED, None)
+
+
+def test_reclaimed_lease_stops_old_worker(session_factory, fake_plane):
+    queue = SqliteBatchQueue(session_factory)
+    (batch_id,) = queue.enqueue(PAYLOAD)
+    claimed = {"A": queue.claim("A")}
+    engines = {}
+
+    class TakeoverClient(type(fake_plane())):
+        # A가 첫 프로젝트를 만드는 동안 lease가 만료되고 B가 배치를 가져감
+        def post(self, url, payload, headers=None):
+            if url.endswith("/projects/") and "B" not in claimed:
+                deadline = time.monotonic() + 5
+                # A의 heartbeat가 만료 직후 lease를 갱신할 수 있으므로 B가 가져갈 때까지 반복
+                while claimed.get("B") is None and time.monotonic() < deadline:
+                    _expire(session_factory, batch_id)
+                    claimed["B"] = queue.claim("B")
+                while not engines["A"]._lease.lost.is_set() and time.monotonic() < deadline:
+                    time.sleep(0.01)
+            return super().post(url, payload, headers)
+
+    client_a = TakeoverClient(fake_plane().app)
+
+    def factory_a(db):
+        engines["A"] = ExecutionEngine(client_a, db, max_workers=2)
+        return client_a, engines["A"]
+
+    QueueWorker(queue, factory_a, worker_id="A", heartbeat_interval=0.01).run_one(claimed["A"])
+
+    store = client_a.store
+    assert claimed["B"].id == batch_id
+    assert engines["A"]._lease.lost.is_set()
+    # A는 P2로 넘어가지 않았고, 배치 상태도 B의 것으로 남아 있음
+    assert [p["slug"] for p in store.projects["w"].values()] == ["P1"]
+    assert _batch(session_factory, batch_id) == (BatchStatus.RUNNING, "B")
+
+    client_b = fake_plane()
+    QueueWorker(queue, lambda db: (client_b, ExecutionEngine(client_b, db, max_workers=2)),
+                worker_id="B").run_one(claimed["B"])
+
+    assert _batch(session_factory, batch_id) == (BatchStatus.COMPLETED, None)
+    assert sorted(p["slug"] for p in store.projects["w"].values()) == ["P1", "P2"]
+    names = sorted(item["name"] for (_, kind), items in store.items.items() if kind == "work-items"
+                   for item in items.values())
+    assert names == ["a", "b", "c"]  # A가 만든 이슈를 B가 다시 만들지 않음
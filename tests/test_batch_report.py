@@ -0,0 +1,77 @@
+# tests/test_batch_report.py
+import csv
+import io
+import json
+import pytest
+from app.database.models import CreatedResource, SyncBatch
+from app.services.batch_report import BatchReport, COLUMNS, TREE_COLUMNS
+from app.services.execution_engine import ExecutionEngine
+
+BATCH = {
+    "Workspace Slug": "w", "batch_name": "report",
+    "projects": [{
+        "name": "P", "slug": "P",
+        "cycles": [{"name": "Sprint"}],
+        "issues": [
+            {"name": "a", "sub_issues": [{"name": "a1", "sub_issues": [{"name": "a1x"}]}, {"name": "a2"}]},
+            {"name": "b"},
+        ],
+    }],
+}
+
+
+@pytest.fixture
+def report(session_factory, fake_plane):
+    db = session_factory()
+    # 같은 부모의 하위 이슈가 생성(기록) 순서대로 나오도록 워커 하나로 실행
+    ExecutionEngine(fake_plane(), db, max_workers=1).execute_yaml(BATCH)
+    db.query(CreatedResource).filter(CreatedResource.resource_type == "CYCLE").update(
+        {CreatedResource.deleted_at: CreatedResource.created_at})
+    db.commit()
+    db.close()
+    return BatchReport(session_factory, fetch_size=2)
+
+
+def _batch_id(report):
+    db = report.session_factory()
+    try:
+        return db.query(SyncBatch.id).one()[0]
+    finally:
+        db.close()
+
+
+def _names(client):
+    return {item["id"]: item["name"] for items in client.store.items.values() for item in items.values()}
+
+
+def test_summary_counts_by_type(report):
+    assert report.summary(_batch_id(report)) == {
+        "total": 7, "deleted": 1,
+        "by_type": {"PROJECT": 1, "CYCLE": 1, "ISSUE": 5}, "deleted_by_type": {"CYCLE": 1},
+    }
+    assert report.summary("other")["total"] == 0
+
+
+def test_tree_rows_follow_parents_depth_first(report, fake_plane):
+    names = _names(fake_plane())
+    rows = list(report.iter_rows(batch_id=_batch_id(report), tree=True))
+    issues = [(names[row["plane_id"]], row["depth"]) for row in rows if row["resource_type"] == "ISSUE"]
+    # 같은 부모의 하위 이슈는 생성 순서, 하위 이슈는 부모 바로 뒤
+    assert [name for name, _ in issues if name.startswith("a")] == ["a", "a1", "a1x", "a2"]
+    assert dict(issues) == {"a": 0, "a1": 1, "a1x": 2, "a2": 1, "b": 0}
+    assert list(rows[0]) == list(TREE_COLUMNS)
+
+
+def test_export_jsonl_and_csv(report):
+    chunks = list(report.export("jsonl", batch_id=_batch_id(report)))
+    assert len(chunks) == 4  # fetch_size(2)줄씩
+    rows = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+    assert [row["id"] for row in rows] == sorted(row["id"] for row in rows) and len(rows) == 7
+    assert sum(1 for row in rows if row["deleted_at"]) == 1
+
+    text = "".join(report.export("csv", resource_type="CYCLE"))
+    (header, row) = list(csv.reader(io.StringIO(text)))
+    assert tuple(header) == COLUMNS and row[COLUMNS.index("deleted_at")]
+
+    with pytest.raises(ValueError):
+        report.export("xml")
@@ -0,0 +1,90 @@
+# tests/test_bulk_links.py
+import pytest
+from app.core.errors import APIConnectionError
+from app.database.models import LogTable, PendingLink
+from app.services.execution_engine import ExecutionEngine
+
+BATCH = {
+    "Workspace Slug": "w", "batch_name": "links",
+    "projects": [{
+        "name": "P", "slug": "P",
+        "cycles": [{"name": "Sprint"}],
+        "modules": [{"name": "Core"}],
+        "issues": [
+            {"name": "a", "cycle": "Sprint", "module": "Core"},
+            {"name": "b", "cycle": "Sprint", "sub_issues": [{"name": "c", "module": "Core"}]},
+        ],
+    }],
+}
+
+
+@pytest.fixture
+def client(fake_plane):
+    class LinkClient(type(fake_plane())):
+        # fail_links가 켜져 있으면 cycle-issues 요청이 500으로 실패
+        fail_links = False
+
+        def post(self, url, payload, headers=None):
+            if self.fail_links and url.endswith("/cycle-issues/"):
+                self.calls.append(("POST", url))
+                raise APIConnectionError("Plane POST 요청 실패: 500", {"url": url, "status_code": 500})
+            return super().post(url, payload, headers)
+
+    return LinkClient(fake_plane().app)
+
+
+def _work_items(store):
+    return {item["name"]: item for (_, kind), items in store.items.items() if kind == "work-items"
+            for item in items.values()}
+
+
+def _link_calls(client):
+    return [url for method, url in client.calls if url.endswith(("/cycle-issues/", "/module-issues/"))]
+
+
+def test_links_are_sent_once_per_cycle_and_module(session_factory, client):
+    db = session_factory()
+    ExecutionEngine(client, db, max_workers=2).execute_yaml(BATCH)
+    items = _work_items(client.store)
+    assert set(items) == {"a", "b", "c"}
+    assert items["a"]["cycle"] == items["b"]["cycle"] and items["a"]["module"] == items["c"]["module"]
+    assert "cycle" not in items["c"]
+    assert len(_link_calls(client)) == 2
+    db.close()
+
+
+def test_failed_links_are_replayed_on_next_run(session_factory, client):
+    db = session_factory()
+    client.fail_links = True
+    engine = ExecutionEngine(client, db, max_workers=2)
+    engine.execute_yaml(BATCH)  # 연결 실패는 배치를 멈추지 않음
+
+    assert [f["type"] for f in engine.link_failures] == ["CYCLE"]
+    pending = db.query(PendingLink).one()
+    assert pending.resource_type == "CYCLE" and len(pending.issue_ids) == 2
+    assert db.query(LogTable).filter(LogTable.step == "LINK_CYCLE").count() == 1
+    assert not any("cycle" in item for item in _work_items(client.store).values())
+
+    client.fail_links = False
+    client.calls.clear()
+    ExecutionEngine(client, db, max_workers=2).execute_yaml(BATCH)
+
+    # 이미 만든 이슈는 다시 만들지 않고, 보내지 못한 연결만 다시 보냄
+    items = _work_items(client.store)
+    assert len(items) == 3 and items["a"]["cycle"] and items["b"]["cycle"]
+    calls = _link_calls(client)
+    assert len(calls) == 1 and calls[0].endswith("/cycle-issues/") and client.calls[0] == ("POST", calls[0])
+    assert db.query(PendingLink).count() == 0
+    db.close()
+
+
+def test_link_to_missing_target_is_not_retried(session_factory, client):
+    db = session_factory()
+    engine = ExecutionEngine(client, db, max_workers=2)
+    engine._start_batch(BATCH)
+    error = APIConnectionError("Plane POST 요청 실패: 404", {"status_code": 404})
+    engine._record_link_failure("p", "CYCLE", "gone", ["i"], error)
+    db.commit()
+    assert db.query(LogTable).filter(LogTable.step == "LINK_CYCLE").count() == 1
+    assert db.query(PendingLink).count() == 0
+    db.close()
@@ -0,0 +1,64 @@
+# tests/test_execution_engine.py
+import pytest
+from sqlalchemy import event
+from app.core.errors import APIConnectionError
+from app.database.models import BatchStatus, CreatedResource, SyncBatch
+from app.services.execution_engine import ExecutionEngine
+
+BATCH = {
+    "Workspace Slug": "w", "batch_name": "bulk",
+    "projects": [{
+        "name": "P", "slug": "P",
+        "issues": [{"name": name} for name in ("a", "b", "c", "d", "e")],
+    }],
+}
+
+
+def _inserts(db):
+    """created_resources INSERT 문 실행 횟수 (executemany는 한 번)"""
+    count = []
+
+    def before(conn, cursor, statement, *args):
+        if statement.startswith("INSERT INTO created_resources"):
+            count.append(statement)
+
+    event.listen(db.get_bind(), "before_cursor_execute", before)
+    return count
+
+
+def test_resources_are_inserted_per_chunk(session_factory, fake_plane):
+    db = session_factory()
+    inserts = _inserts(db)
+    ExecutionEngine(fake_plane(), db, max_workers=2, chunk_size=4).execute_yaml(BATCH)
+    assert db.query(CreatedResource).count() == 6
+    assert len(inserts) == 2  # 4 + 2
+    assert db.query(SyncBatch).one().status == BatchStatus.COMPLETED
+    db.close()
+
+
+def test_failed_batch_keeps_created_rows_for_resume(session_factory, fake_plane):
+    class FailingClient(type(fake_plane())):
+        fail_on = "d"
+
+        def post(self, url, payload, headers=None):
+            if payload.get("name") == self.fail_on:
+                raise APIConnectionError("Plane POST 요청 실패: 500", {"url": url, "status_code": 500})
+            return super().post(url, payload, headers)
+
+    db = session_factory()
+    client = FailingClient(fake_plane().app)
+    with pytest.raises(APIConnectionError):
+        ExecutionEngine(client, db, max_workers=1, chunk_size=100).execute_yaml(BATCH)
+    assert db.query(SyncBatch).one().status == BatchStatus.FAILED
+    # Plane에 만든 리소스는 버퍼에 남아 있던 행까지 실패 처리 때 기록
+    created = db.query(CreatedResource).count()
+    assert created == 1 + sum(len(items) for items in client.store.items.values())
+
+    client.fail_on = None
+    client.calls.clear()
+    ExecutionEngine(client, db, max_workers=1, chunk_size=100).execute_yaml(BATCH)
+    posts = [url for method, url in client.calls if method == "POST"]
+    assert len(posts) == 6 - created  # 이미 만든 노드는 다시 만들지 않음
+    names = sorted(item["name"] for items in client.store.items.values() for item in items.values())
+    assert names == ["a", "b", "c", "d", "e"]
+    db.close()
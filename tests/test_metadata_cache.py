@@ -0,0 +1,80 @@
+# tests/test_metadata_cache.py
+import pytest
+from sqlalchemy import event
+from app.database.models import PlaneMember, PlaneProject, PlaneState
+from app.services import metadata_cache
+from app.services.metadata_cache import MetadataCache
+
+
+@pytest.fixture
+def db(session_factory):
+    db = session_factory()
+    db.add_all([
+        PlaneProject(id="p1", slug="ONE"), PlaneProject(id="p2", slug="TWO"), PlaneProject(id="p3", slug="THREE"),
+        PlaneState(id="s1", project_id="p1", group="backlog"),
+        PlaneState(id="s2", project_id="p1", group="unstarted"),
+        PlaneState(id="s3", project_id="p2", group="completed"),
+        PlaneMember(id="m1", email="Dev@Example.com"),
+    ])
+    db.commit()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def queries(db):
+    """db 세션이 실행한 SELECT 수"""
+    count = []
+    bind = db.get_bind()
+
+    def before(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            count.append(statement)
+
+    event.listen(bind, "before_cursor_execute", before)
+    yield count
+    event.remove(bind, "before_cursor_execute", before)
+
+
+def test_lookups_hit_db_once_until_ttl(db, queries, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(metadata_cache.time, "monotonic", lambda: now[0])
+    cache = MetadataCache(ttl=60)
+    for _ in range(3):
+        assert cache.project_id(db, "ONE") == "p1" and cache.project_slug(db, "p2") == "TWO"
+        assert cache.member_id(db, "dev@EXAMPLE.com") == "m1"
+    assert len(queries) == 2  # 프로젝트, 멤버 테이블을 한 번씩
+
+    now[0] += 61
+    assert cache.project_id(db, "ONE") == "p1"
+    assert len(queries) == 3
+
+
+def test_default_state_prefers_groups_and_falls_back(db):
+    cache = MetadataCache()
+    assert cache.default_state_id(db, "p1") == "s2"  # unstarted가 backlog보다 우선
+    assert cache.state_id(db, "p1", "backlog") == "s1"
+    assert cache.default_state_id(db, "p2") == "s3"  # 기본 group이 없으면 아무 상태
+    assert cache.default_state_id(db, "p3") is None
+
+
+def test_state_index_evicts_least_recently_used(db, queries):
+    cache = MetadataCache(max_projects=2)
+    cache.default_state_id(db, "p1")
+    cache.default_state_id(db, "p2")
+    cache.default_state_id(db, "p1")  # p1을 최근에 사용
+    cache.default_state_id(db, "p3")
+    assert list(cache._states) == ["p1", "p3"]
+    assert len(queries) == 3
+
+    cache.invalidate_states("p1")
+    assert cache.default_state_id(db, "p1") == "s2" and len(queries) == 4
+
+
+def test_put_project_updates_loaded_index(db, queries):
+    cache = MetadataCache()
+    cache.put_project("p9", "NINE")  # 아직 로드 전이면 무시 (다음 로드 때 DB에서 읽음)
+    assert cache.project_id(db, "ONE") == "p1"
+    cache.put_project("p9", "NINE")
+    assert cache.project_id(db, "NINE") == "p9" and cache.project_slug(db, "p9") == "NINE"
+    assert len(queries) == 1
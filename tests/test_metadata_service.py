@@ -0,0 +1,170 @@
+# tests/test_metadata_service.py
+import uuid
+from datetime import datetime, timezone
+from app.core.errors import APIConnectionError
+from app.database.models import PlaneMember, PlaneProject, PlaneState, SyncState
+from app.services.metadata_cache import MetadataCache
+from app.services.execution_engine import ExecutionEngine
+from app.services.metadata_service import MetadataService
+
+WORKSPACE_ID = str(uuid.uuid5(uuid.NAMESPACE_URL, "w"))  # benchmarks.fake_plane의 워크스페이스 id
+
+
+def _projects(db):
+    return sorted((p.id, p.slug, p.workspace_id) for p in db.query(PlaneProject))
+
+
+def test_engine_and_create_project_store_workspace_id(session_factory, fake_plane):
+    db = session_factory()
+    ExecutionEngine(fake_plane(), db, max_workers=2).execute_yaml(
+        {"Workspace Slug": "w", "batch_name": "ws", "projects": [{"name": "P", "slug": "P"}]})
+    project_id = MetadataService(fake_plane()).create_project(db, "w", "Quest", "QST")
+    assert {(slug, workspace_id) for _, slug, workspace_id in _projects(db)} == {
+        ("P", WORKSPACE_ID), ("QST", WORKSPACE_ID)}
+    assert db.get(PlaneProject, project_id).workspace_id == WORKSPACE_ID
+    db.close()
+
+
+def test_recreated_project_replaces_row_with_same_workspace_slug(session_factory, fake_plane):
+    db = session_factory()
+    db.add(PlaneProject(id="deleted-in-plane", slug="QST", workspace_id=WORKSPACE_ID))
+    db.commit()
+    project_id = MetadataService(fake_plane()).create_project(db, "w", "Quest", "QST")
+    assert _projects(db) == [(project_id, "QST", WORKSPACE_ID)]
+    db.close()
+
+
+def test_upsert_keeps_workspace_id_missing_from_response(session_factory, sqlite_upsert):
+    db = session_factory()
+    service = MetadataService(None)
+    service._upsert(db, PlaneProject, [{"id": "p1", "name": "P", "slug": "P", "workspace_id": WORKSPACE_ID}])
+    service._upsert(db, PlaneProject, [{"id": "p1", "name": "Renamed", "slug": "P", "workspace_id": None}])
+    db.commit()
+    assert _projects(db) == [("p1", "P", WORKSPACE_ID)]
+    assert db.get(PlaneProject, "p1").name == "Renamed"
+    db.close()
+
+
+def test_apply_event_state_without_project_uses_stored_row(session_factory, sqlite_upsert):
+    db = session_factory()
+    db.add(PlaneState(id="s1", project_id="p1", name="Todo", group="unstarted"))
+    db.commit()
+    cache = MetadataCache()
+    assert cache.default_state_id(db, "p1") == "s1"
+    service = MetadataService(None, cache)
+
+    assert service.apply_event(db, "state", "update", {"id": "s1", "name": "Ready", "group": "backlog"}) == 1
+    assert (db.get(PlaneState, "s1").project_id, db.get(PlaneState, "s1").group) == ("p1", "backlog")
+    assert "p1" not in cache._states  # 저장된 행의 프로젝트 캐시를 비움
+
+    # 프로젝트도 저장된 행도 없으면 project_id NULL 행을 만들지 않음
+    assert service.apply_event(db, "state", "create", {"id": "s2", "name": "Orphan", "group": "backlog"}) == 0
+    assert db.get(PlaneState, "s2") is None
+
+    assert service.apply_event(db, "state", "delete", {"id": "s1"}) == 1
+    assert service.apply_event(db, "state", "delete", {"id": "s1"}) == 0
+    db.close()
+
+
+def test_apply_event_ignores_member_delete(session_factory, sqlite_upsert):
+    db = session_factory()
+    service = MetadataService(None)
+    assert service.apply_event(db, "workspace_member", "create", {"member": {"id": "m1", "email": "a@b.c"}}) == 1
+    # plane_members는 워크스페이스 구분이 없어 다른 워크스페이스의 멤버일 수 있음
+    assert service.apply_event(db, "workspace_member", "delete", {"member": {"id": "m1"}}) == 0
+    assert db.get(PlaneMember, "m1").email == "a@b.c"
+    db.close()
+
+
+def test_apply_event_project_delete_removes_states(session_factory):
+    db = session_factory()
+    db.add_all([PlaneProject(id="p1", slug="P", workspace_id=WORKSPACE_ID),
+                PlaneState(id="s1", project_id="p1", group="backlog")])
+    db.commit()
+    assert MetadataService(None).apply_event(db, "project", "delete", {"id": "p1"}) == 1
+    assert db.query(PlaneProject).count() == 0 and db.query(PlaneState).count() == 0
+    db.close()
+
+
+def _gets(client, path):
+    return [url for method, url in client.calls if method == "GET" and url.endswith(path)]
+
+
+def test_project_list_sync_pages(session_factory, fake_plane, sqlite_upsert):
+    db = session_factory()
+    client = fake_plane()
+    client.store.seed("w", projects=5, members=0)
+    service = MetadataService(client, page_size=2)
+
+    assert service.sync_project_list(db, "w") == 5
+    assert len(_gets(client, "/projects/")) == 3  # 2 + 2 + 1
+    assert sorted(p.slug for p in db.query(PlaneProject)) == ["S0", "S1", "S2", "S3", "S4"]
+    db.close()
+
+
+def test_project_list_sync_uses_watermark(session_factory, fake_plane, sqlite_upsert):
+    db = session_factory()
+    client = fake_plane()
+    client.store.seed("w", projects=5, members=0)
+    service = MetadataService(client, page_size=2)
+    service.sync_project_list(db, "w")
+    assert db.get(SyncState, ("w", "", "PROJECT")).etag is None  # 여러 페이지면 ETag를 쓰지 않음
+
+    # 다음 sync는 watermark 이후 변경분만 받음
+    (changed, *_) = client.store.projects["w"].values()
+    changed.update(name="Renamed", updated_at=datetime.now(timezone.utc).isoformat())
+    client.calls.clear()
+    assert service.sync_project_list(db, "w") == 2  # 바뀐 항목 + watermark와 같은 시각의 항목
+    assert len(_gets(client, "/projects/")) == 1
+    assert db.get(PlaneProject, changed["id"]).name == "Renamed"
+    db.close()
+
+
+def test_project_list_sync_detects_deletions(session_factory, fake_plane, sqlite_upsert):
+    db = session_factory()
+    client = fake_plane()
+    client.store.seed("w", projects=3, members=0)
+    db.add(PlaneProject(id="other-workspace", slug="O", workspace_id="ws-other"))
+    db.commit()
+    service = MetadataService(client, page_size=2)
+    service.sync_project_list(db, "w")
+
+    gone = next(iter(client.store.projects["w"]))
+    del client.store.projects["w"][gone]
+    assert service.sync_project_list(db, "w", detect_deletions=True) == 2
+    assert db.get(PlaneProject, gone) is None
+    assert db.get(PlaneProject, "other-workspace") is not None  # 다른 워크스페이스 행은 그대로
+    db.close()
+
+
+def test_single_page_list_uses_etag(session_factory, fake_plane, sqlite_upsert, capsys):
+    db = session_factory()
+    client = fake_plane()
+    client.store.seed("w", projects=1, members=0)
+    (project_id,) = client.store.projects["w"]
+    service = MetadataService(client)
+
+    assert service.sync_project_states(db, "w", project_id) == 5
+    assert db.get(SyncState, ("w", project_id, "STATE")).etag
+    # watermark와 같은 시각의 항목은 updated_at__gte로 다시 받고, 같은 조건의 다음 요청은 304
+    assert service.sync_project_states(db, "w", project_id) == 1
+    assert service.sync_project_states(db, "w", project_id) == 0
+    assert "304 Not Modified" in capsys.readouterr().out
+    assert db.query(PlaneState).count() == 5
+    db.close()
+
+
+def test_sync_workspace_reports_state_failures(session_factory, fake_plane, sqlite_upsert):
+    client = fake_plane()
+    client.store.seed("w", projects=2, members=1)
+    broken = next(iter(client.store.projects["w"]))
+
+    class FailingClient(type(client)):
+        def get_conditional(self, url, params=None, etag=None):
+            if f"/projects/{broken}/states/" in url:
+                raise APIConnectionError("Plane GET 요청 실패: 500", {"url": url, "status_code": 500})
+            return super().get_conditional(url, params, etag)
+
+    report = MetadataService(FailingClient(client.app)).sync_workspace(session_factory, "w", max_workers=2)
+    assert (report["members"], report["projects"], report["states"]) == (1, 2, 5)
+    assert list(report["failures"]) == [broken]
@@ -0,0 +1,100 @@
+# tests/test_metadata_snapshot.py
+import os
+from types import SimpleNamespace
+import pytest
+from app.database.models import PlaneMember, PlaneProject, PlaneState, SyncState
+from app.services import metadata_snapshot
+from app.services.execution_engine import ExecutionEngine
+from app.services.metadata_cache import MetadataCache
+from app.services.metadata_service import MetadataService
+from app.services.metadata_snapshot import MetadataSnapshot, snapshot_path
+
+
+def _settings(path, max_age=0):
+    return SimpleNamespace(METADATA_CACHE_TTL=300, METADATA_CACHE_MAX_PROJECTS=16,
+                           METADATA_SNAPSHOT_PATH=path, METADATA_SNAPSHOT_MAX_AGE=max_age)
+
+
+@pytest.fixture
+def db(session_factory):
+    db = session_factory()
+    db.add_all([
+        PlaneProject(id="p1", slug="ONE", workspace_id="ws-a"),
+        PlaneProject(id="p2", slug="TWO", workspace_id="ws-a"),  # 상태를 동기화한 적 없지만 같은 워크스페이스
+        PlaneProject(id="p3", slug="OTHER", workspace_id="ws-b"),
+        PlaneState(id="s1", project_id="p1", group="backlog"),
+        PlaneState(id="s2", project_id="p1", group="unstarted"),
+        PlaneState(id="s3", project_id="p3", group="backlog"),
+        PlaneMember(id="m1", email="Dev@Example.com"),
+        SyncState(workspace_slug="a", project_id="p1", resource_type="STATE"),
+        SyncState(workspace_slug="b", project_id="p3", resource_type="STATE"),
+    ])
+    db.commit()
+    yield db
+    db.close()
+
+
+def test_snapshot_path_is_keyed_by_workspace():
+    assert snapshot_path("data/metadata.snapshot", "gopedia") == "data/metadata.gopedia.snapshot"
+    assert snapshot_path("data/{workspace}/meta", "gopedia") == "data/gopedia/meta"
+
+
+def test_write_snapshot_per_workspace_and_warm_without_db(db, tmp_path):
+    path = str(tmp_path / "metadata.snapshot")
+    service = MetadataService(None, snapshot_path=path)
+    assert [s.workspace_slug for s in service.write_snapshots(db)] == ["a", "b"]
+    assert os.path.exists(tmp_path / "metadata.a.snapshot") and os.path.exists(tmp_path / "metadata.b.snapshot")
+
+    snapshot = MetadataSnapshot.load(snapshot_path(path, "a"))
+    assert sorted(snapshot.projects) == [("p1", "ONE"), ("p2", "TWO")]
+    assert snapshot.states == {"p1": [("s1", "backlog"), ("s2", "unstarted")]}
+
+    # 모든 워크스페이스의 스냅샷으로 채운 캐시는 DB 없이 조회됨
+    cache = MetadataCache.from_settings(_settings(path))
+    assert cache.project_id(None, "ONE") == "p1" and cache.project_id(None, "OTHER") == "p3"
+    assert cache.default_state_id(None, "p1") == "s2"
+    assert cache.member_id(None, "dev@example.com") == "m1"
+
+
+def test_load_rejects_other_format_or_python_version(db, tmp_path, monkeypatch, capsys):
+    path = str(tmp_path / "metadata.a.snapshot")
+    MetadataSnapshot.build(db, "a").write(path)
+    assert MetadataSnapshot.load(path) is not None
+
+    monkeypatch.setattr(metadata_snapshot.sys, "version_info", (2, 7, 0))
+    assert MetadataSnapshot.load(path) is None
+    monkeypatch.undo()
+    monkeypatch.setattr(metadata_snapshot, "FORMAT_VERSION", metadata_snapshot.FORMAT_VERSION + 1)
+    assert MetadataSnapshot.load(path) is None
+    assert "형식이 달라 무시합니다" in capsys.readouterr().out
+
+
+def test_load_rejects_truncated_or_old_snapshot(db, tmp_path):
+    path = str(tmp_path / "metadata.a.snapshot")
+    snapshot = MetadataSnapshot.build(db, "a")
+    snapshot.created_at -= 120
+    snapshot.write(path)
+    assert MetadataSnapshot.load(path, max_age=60) is None
+    assert MetadataSnapshot.load(path, max_age=600) is not None
+    assert MetadataSnapshot.load(str(tmp_path / "missing.snapshot")) is None
+
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[:len(data) // 2])
+    assert MetadataSnapshot.load(path) is None
+    assert MetadataCache.from_settings(_settings(str(tmp_path / "metadata.snapshot")))._projects is None
+
+
+def test_engine_reports_metadata_change_after_creating_project(session_factory, fake_plane):
+    changed = []
+    db = session_factory()
+    engine = ExecutionEngine(fake_plane(), db, max_workers=2, metadata_changed=changed.append)
+    engine.execute_yaml({"Workspace Slug": "w", "batch_name": "snap",
+                         "projects": [{"name": "P", "slug": "P", "issues": [{"name": "a"}]}]})
+    assert changed == ["w"]
+    # 이미 만든 프로젝트만 다시 실행하면 메타데이터는 바뀌지 않음
+    engine.execute_yaml({"Workspace Slug": "w", "batch_name": "snap",
+                         "projects": [{"name": "P", "slug": "P", "issues": [{"name": "a"}]}]})
+    assert changed == ["w"]
+    db.close()
@@ -0,0 +1,38 @@
+# tests/test_metrics.py
+from app.services.metrics import Metrics, endpoint_of
+from app.services.plane_client import PlaneClient
+
+BASE = "http://plane/api/v1"
+URL = f"{BASE}/workspaces/w/projects/0f6c1f9e-1d2a-4c3b-9e8f-7a6b5c4d3e2f/work-items/"
+
+
+def test_endpoint_of_replaces_ids():
+    assert endpoint_of(URL + "?page=2", BASE) == "/workspaces/w/projects/{id}/work-items/"
+
+
+def test_child_records_batch_and_process_metrics():
+    process = Metrics(base_url=BASE)
+    batch = process.child()
+    batch.batch_id = "b1"
+    batch.record_request("POST", URL, 201, 0.02, retries=1)
+    with batch.phase("issues"):
+        pass
+
+    summary = batch.log_entry().details
+    assert summary["requests"]["POST /workspaces/w/projects/{id}/work-items/ 201"]["count"] == 1
+    assert summary["retries"] == {"POST /workspaces/w/projects/{id}/work-items/": 1}
+    assert "issues" in summary["phases"]
+
+    # 프로세스 전체 Metrics에는 batch_id 라벨 없이 반영
+    assert process.summary(None)["requests"]["POST /workspaces/w/projects/{id}/work-items/ 201"]["count"] == 1
+    assert "batch_id" not in process.to_prometheus()
+
+
+def test_client_with_metrics_shares_session():
+    process = Metrics(base_url=BASE)
+    client = PlaneClient(BASE, "key", metrics=process)
+    batch = process.child()
+    view = client.with_metrics(batch)
+    assert view.metrics is batch and client.metrics is process
+    assert view.session is client.session and view.limiter is client.limiter
+    client.close()
@@ -0,0 +1,27 @@
+# tests/test_node_keys.py
+from app.services.execution_engine import node_key, project_key, child_keys, node_hash
+
+
+def test_node_key_quotes_name():
+    assert node_key("gopedia/GPD", "issue", "Wiki POC") == "gopedia/GPD/issue:Wiki%20POC"
+    assert node_key("gopedia/GPD", "issue", "a/b") == "gopedia/GPD/issue:a%2Fb"
+    assert node_key("gopedia/GPD", "cycle", 3) == "gopedia/GPD/cycle:3"
+
+
+def test_project_key():
+    assert project_key("gopedia", {"name": "Gopedia", "slug": "GPD"}) == "gopedia/GPD"
+
+
+def test_child_keys_numbers_duplicates_and_uses_key():
+    items = [{"name": "A"}, {"name": "B"}, {"name": "A"}, {"name": "A", "key": "custom"}, {"name": "A"}]
+    assert child_keys("w/P", "issue", items) == [
+        "w/P/issue:A", "w/P/issue:B", "w/P/issue:A#2", "w/P/issue:custom", "w/P/issue:A#3",
+    ]
+
+
+def test_node_hash_ignores_order_and_children():
+    base = {"name": "A", "priority": "high"}
+    assert node_hash(base) == node_hash({"priority": "high", "name": "A"})
+    assert node_hash(base) == node_hash(dict(base, key="k", sub_issues=[{"name": "child"}]))
+    assert node_hash(base) != node_hash(dict(base, priority="low"))
+    assert len(node_hash(base)) == 40
@@ -0,0 +1,40 @@
+# tests/test_partitions.py
+from datetime import date, datetime, timedelta, timezone
+import pytest
+from app.database import partitions
+from app.database.models import LogTable
+from app.database.partitions import add_months, apply_retention, month_start, partition_name
+
+
+@pytest.mark.parametrize("day, months, expected", [
+    (date(2024, 1, 31), 1, date(2024, 2, 1)),
+    (date(2024, 11, 15), 2, date(2025, 1, 1)),
+    (date(2024, 3, 1), -3, date(2023, 12, 1)),
+    (date(2024, 12, 1), 0, date(2024, 12, 1)),
+])
+def test_add_months(day, months, expected):
+    assert add_months(day, months) == expected
+
+
+def test_month_start_and_partition_name():
+    assert month_start(date(2024, 2, 29)) == date(2024, 2, 1)
+    assert partition_name("operation_logs", date(2024, 2, 1)) == "operation_logs_y2024m02"
+
+
+def test_retention_deletes_old_rows_from_unpartitioned_table(session_factory, monkeypatch):
+    # sqlite에는 파티션이 없으므로 파티션이 아닌 테이블 경로만 확인
+    monkeypatch.setattr(partitions, "is_partitioned", lambda conn, table: False)
+    db = session_factory()
+    now = datetime.now(timezone.utc)
+    db.add_all([LogTable(step="old", created_at=now - timedelta(days=40)),
+                LogTable(step="new", created_at=now - timedelta(days=1))])
+    db.commit()
+
+    engine = db.get_bind()
+    with engine.begin() as conn:
+        assert apply_retention(conn, "operation_logs", keep_days=0) == []  # 0이면 정리하지 않음
+    assert db.query(LogTable).count() == 2
+    with engine.begin() as conn:
+        assert apply_retention(conn, "operation_logs", keep_days=30) == []
+    assert [row.step for row in db.query(LogTable)] == ["new"]
+    db.close()
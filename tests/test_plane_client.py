@@ -0,0 +1,55 @@
+# tests/test_plane_client.py
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from app.services.plane_client import PlaneClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        body = json.dumps({"path": self.path, "key": self.headers.get("x-api-key")}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/api/v1"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_threads_get_own_session_sharing_one_pool(server):
+    client = PlaneClient(server, "key", pool_maxsize=4)
+    sessions = {}
+
+    def fetch(i):
+        data = client.get(f"{server}/workspaces/w/projects/{i}/")
+        sessions[threading.get_ident()] = client.session
+        return data
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(fetch, range(40)))
+
+    assert [r["path"] for r in results] == [f"/api/v1/workspaces/w/projects/{i}/" for i in range(40)]
+    assert all(r["key"] == "key" for r in results)
+    # 스레드마다 다른 Session, 커넥션 풀은 하나
+    assert len({id(s) for s in sessions.values()}) == len(sessions) > 1
+    assert all(s.get_adapter(server) is client._adapter for s in sessions.values())
+    assert client.session is client.session
+    client.close()
+    assert not client._sessions
+
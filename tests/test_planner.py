@@ -0,0 +1,56 @@
+# tests/test_planner.py
+import copy
+from app.services.execution_engine import ExecutionEngine
+from app.services.planner import BatchPlanner, CREATE, UPDATE, UNCHANGED
+
+BATCH = {
+    "Workspace Slug": "w", "batch_name": "plan",
+    "projects": [{
+        "name": "P", "slug": "P",
+        "cycles": [{"name": "Sprint"}],
+        "modules": [{"name": "Core"}],
+        "issues": [
+            {"name": "a", "cycle": "Sprint", "module": "Core"},
+            {"name": "b", "cycle": "Sprint", "sub_issues": [{"name": "c"}]},
+        ],
+    }],
+}
+
+
+def _writes(client):
+    return [(method, url) for method, url in client.calls if method != "GET"]
+
+
+def test_plan_budget_matches_requests_sent(session_factory, fake_plane):
+    db = session_factory()
+    plan = BatchPlanner(db).plan(BATCH)
+    assert {r_type: counts[CREATE] for r_type, counts in plan.counts().items()} == {
+        "PROJECT": 1, "CYCLE": 1, "MODULE": 1, "ISSUE": 3}
+    assert plan.link_requests == 2 and plan.request_budget == 8
+
+    client = fake_plane()
+    ExecutionEngine(client, db, max_workers=2).execute_plan(plan)
+    assert len(_writes(client)) == plan.request_budget
+
+    # 다시 계획하면 모두 기존 id로 유지
+    again = BatchPlanner(db).plan(BATCH)
+    assert again.is_empty and again.request_budget == 0
+    assert all(step.action == UNCHANGED and step.plane_id for step in again.steps)
+    db.close()
+
+
+def test_plan_marks_changed_nodes_for_update(session_factory, fake_plane):
+    db = session_factory()
+    ExecutionEngine(fake_plane(), db, max_workers=2).execute_yaml(BATCH)
+    changed = copy.deepcopy(BATCH)
+    changed["projects"][0]["issues"][1]["sub_issues"][0]["priority"] = "high"
+
+    assert BatchPlanner(db).plan(changed).is_empty  # include_updates가 아니면 변경을 보지 않음
+    plan = BatchPlanner(db, include_updates=True).plan(changed)
+    assert [(step.action, step.name) for step in plan.steps if step.action != UNCHANGED] == [(UPDATE, "c")]
+
+    client = fake_plane()
+    ExecutionEngine(client, db, max_workers=2).execute_plan(plan)
+    assert [method for method, _ in _writes(client)] == ["PATCH"]
+    assert BatchPlanner(db, include_updates=True).plan(changed).is_empty
+    db.close()
@@ -0,0 +1,165 @@
+# tests/test_rate_limiter.py
+import asyncio
+import threading
+import time
+from email.utils import formatdate
+import pytest
+from app.services.rate_limiter import TokenBucket, RateLimiter, parse_retry_after
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, None),
+    ("", None),
+    ("3", 3.0),
+    ("1.5", 1.5),
+    ("-2", 0.0),
+    ("soon", None),
+])
+def test_parse_retry_after_seconds(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    assert parse_retry_after(formatdate(time.time() + 30, usegmt=True)) == pytest.approx(30, abs=2)
+    # 지난 시각이면 기다리지 않음
+    assert parse_retry_after(formatdate(time.time() - 30, usegmt=True)) == 0.0
+
+
+def test_token_bucket_burst_then_wait():
+    bucket = TokenBucket(rate=10, burst=3)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    # 토큰이 없으면 다음 토큰까지 (1/rate초씩 쌓이며) 기다림
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+
+def test_token_bucket_refills():
+    bucket = TokenBucket(rate=10, burst=1)
+    assert bucket.reserve() == 0.0
+    bucket.updated_at -= 0.5  # 0.5초 경과 (burst보다 많이 쌓이지 않음)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+
+
+def test_token_bucket_unlimited_and_block():
+    bucket = TokenBucket(rate=0, burst=1)
+    assert all(bucket.reserve() == 0.0 for _ in range(100))
+    bucket.block(5)
+    assert bucket.reserve() == pytest.approx(5, abs=0.1)
+    bucket.block(1)  # 더 짧은 차단은 기존 차단을 줄이지 않음
+    assert bucket.reserve() == pytest.approx(5, abs=0.1)
+
+
+@pytest.mark.parametrize("method, status, retry_after, expected", [
+    ("GET", 429, None, True),
+    ("GET", 503, None, True),
+    ("PATCH", 503, None, True),
+    ("POST", 429, None, True),
+    ("POST", 503, None, False),
+    ("POST", 503, "2", True),
+    ("GET", 500, None, False),
+])
+def test_should_retry(method, status, retry_after, expected):
+    assert RateLimiter(max_retries=2).should_retry(method, status, retry_after, attempt=0) is expected
+
+
+def test_should_retry_stops_after_max_retries():
+    assert RateLimiter(max_retries=2).should_retry("GET", 429, None, attempt=2) is False
+
+
+def _wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert predicate()
+
+
+def test_release_wakes_one_waiter_in_fifo_order():
+    limiter = RateLimiter(max_concurrency=1)
+    limiter.acquire()
+    order = []
+
+    def thread_waiter():
+        limiter.acquire()
+        order.append("thread")
+
+    async def async_waiter():
+        await limiter.acquire_async()
+        order.append("async")
+
+    first = threading.Thread(target=thread_waiter)
+    first.start()
+    _wait_for(lambda: len(limiter._waiters) == 1)
+    second = threading.Thread(target=asyncio.run, args=(async_waiter(),))
+    second.start()
+    _wait_for(lambda: len(limiter._waiters) == 2)
+
+    limiter.release()
+    first.join(timeout=5)
+    # 슬롯 하나는 스레드 대기자 하나에게만 넘어가고 asyncio 대기자는 계속 기다림
+    assert order == ["thread"] and limiter.in_flight == 1 and len(limiter._waiters) == 1
+    limiter.release()
+    second.join(timeout=5)
+    assert order == ["thread", "async"] and limiter.in_flight == 1
+    limiter.release()
+    assert limiter.in_flight == 0
+
+
+def test_mixed_thread_and_async_waiters_respect_max_concurrency():
+    limiter = RateLimiter(max_concurrency=3)
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0, "done": 0}
+
+    def enter():
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+
+    def leave():
+        with lock:
+            state["active"] -= 1
+            state["done"] += 1
+        limiter.release()
+
+    def thread_request():
+        limiter.acquire()
+        enter()
+        time.sleep(0.002)
+        leave()
+
+    async def async_requests(n):
+        async def one():
+            await limiter.acquire_async()
+            enter()
+            await asyncio.sleep(0.002)
+            leave()
+        await asyncio.gather(*(one() for _ in range(n)))
+
+    threads = [threading.Thread(target=thread_request) for _ in range(20)]
+    threads += [threading.Thread(target=asyncio.run, args=(async_requests(20),)) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert state["done"] == 60
+    assert state["peak"] <= 3
+    assert limiter.in_flight == 0 and not limiter._waiters
+
+
+def test_cancelled_async_waiter_passes_slot_on():
+    limiter = RateLimiter(max_concurrency=1)
+
+    async def run():
+        await limiter.acquire_async()
+        cancelled = asyncio.ensure_future(limiter.acquire_async())
+        waiting = asyncio.ensure_future(limiter.acquire_async())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        limiter.release()
+        await asyncio.wait_for(waiting, timeout=5)
+        assert cancelled.cancelled() and limiter.in_flight == 1
+        limiter.release()
+
+    asyncio.run(run())
+    assert limiter.in_flight == 0 and not limiter._waiters
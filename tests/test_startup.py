@@ -0,0 +1,7 @@
+# tests/test_startup.py
+from benchmarks.startup import loaded_heavy_modules
+
+
+def test_import_main_loads_no_heavy_modules():
+    # .env 없이 새 인터프리터에서 import main만 했을 때
+    assert loaded_heavy_modules() == []
@@ -0,0 +1,113 @@
+# tests/test_teardown.py
+import pytest
+from app.core.errors import APIConnectionError, TeardownError
+from app.database.models import BatchStatus, CreatedResource, PlaneProject, SyncBatch
+from app.services.execution_engine import ExecutionEngine
+from app.services.teardown_engine import TeardownEngine
+
+BATCH = {
+    "Workspace Slug": "w", "batch_name": "teardown",
+    "projects": [{
+        "name": "P", "slug": "P",
+        "cycles": [{"name": "Sprint"}],
+        "modules": [{"name": "Core"}],
+        "issues": [{"name": "a", "sub_issues": [{"name": "b", "sub_issues": [{"name": "c"}]}]}],
+    }],
+}
+
+
+@pytest.fixture
+def db(session_factory, fake_plane):
+    db = session_factory()
+    ExecutionEngine(fake_plane(), db, max_workers=2).execute_yaml(BATCH)
+    yield db
+    db.close()
+
+
+def _batch_id(db):
+    return db.query(SyncBatch.id).one()[0]
+
+
+def _deleted(client):
+    """DELETE 요청을 보낸 리소스 종류 순서 (연속된 같은 종류는 하나로)"""
+    kinds = []
+    for method, url in client.calls:
+        if method == "DELETE":
+            parts = url.rstrip("/").split("/")
+            kind = parts[-2] if parts[-2] != "projects" else "projects"
+            if not kinds or kinds[-1] != kind:
+                kinds.append(kind)
+    return kinds
+
+
+def _names(client):
+    return sorted(item["name"] for (_, kind), items in client.store.items.items() for item in items.values())
+
+
+def test_rollback_deletes_children_before_parents(db, fake_plane):
+    client = fake_plane()
+    work_items = {item["name"]: item["id"] for (_, kind), items in client.store.items.items()
+                  if kind == "work-items" for item in items.values()}
+
+    assert TeardownEngine(client, db, max_workers=2).rollback_batch(_batch_id(db)) == 6
+
+    deletes = [url for method, url in client.calls if method == "DELETE" and "/work-items/" in url]
+    assert [url.rstrip("/").rsplit("/", 1)[1] for url in deletes] == [work_items[n] for n in ("c", "b", "a")]
+    kinds = _deleted(client)
+    assert kinds[0] == "work-items" and set(kinds[1:3]) == {"cycles", "modules"} and kinds[3:] == ["projects"]
+    assert client.store.projects["w"] == {} and db.query(PlaneProject).count() == 0
+    assert db.get(SyncBatch, _batch_id(db)).status == BatchStatus.ROLLED_BACK
+    assert db.query(CreatedResource).filter(CreatedResource.deleted_at.is_(None)).count() == 0
+
+
+def test_already_deleted_resources_count_as_deleted(db, fake_plane):
+    client = fake_plane()
+    for items in client.store.items.values():
+        items.clear()  # Plane에서 먼저 지워진 이슈/Cycle/Module (DELETE가 404)
+    assert TeardownEngine(client, db, max_workers=2).rollback_batch(_batch_id(db)) == 6
+    assert db.get(SyncBatch, _batch_id(db)).status == BatchStatus.ROLLED_BACK
+
+
+def test_failed_delete_stops_before_parents(db, fake_plane):
+    class FailingClient(type(fake_plane())):
+        def delete(self, url, headers=None):
+            if "/cycles/" in url:
+                self.calls.append(("DELETE", url))
+                raise APIConnectionError("Plane DELETE 요청 실패: 500", {"url": url, "status_code": 500})
+            return super().delete(url, headers)
+
+    client = FailingClient(fake_plane().app)
+    with pytest.raises(APIConnectionError):
+        TeardownEngine(client, db, max_workers=2).rollback_batch(_batch_id(db))
+    assert _names(client) == ["Sprint"] and client.store.projects["w"]
+    assert db.get(SyncBatch, _batch_id(db)).status != BatchStatus.ROLLED_BACK
+
+    # 다시 호출하면 남은 것만 삭제
+    assert TeardownEngine(fake_plane(), db, max_workers=2).rollback_batch(_batch_id(db)) == 2
+
+
+def test_project_slug_recorded_as_project_id_resolves(db, fake_plane):
+    client = fake_plane()
+    (project_id,) = client.store.projects["w"]
+    # 엔진이 slug를 몰라 프로젝트 id를 project_slug로 기록한 행
+    db.query(CreatedResource).filter(CreatedResource.resource_type != "PROJECT").update(
+        {CreatedResource.project_slug: project_id})
+    db.query(CreatedResource).filter(CreatedResource.resource_type == "PROJECT").delete()
+    db.query(PlaneProject).delete()
+    db.commit()
+
+    assert TeardownEngine(client, db, max_workers=2).rollback_batch(_batch_id(db)) == 5
+    assert _names(client) == []
+
+
+def test_unresolved_project_raises_and_keeps_batch(db, fake_plane):
+    client = fake_plane()
+    db.query(CreatedResource).filter(CreatedResource.resource_type == "CYCLE").update(
+        {CreatedResource.project_slug: "GONE"})
+    db.commit()
+
+    with pytest.raises(TeardownError) as e:
+        TeardownEngine(client, db, max_workers=2).rollback_batch(_batch_id(db))
+    assert e.value.details["unresolved"] == ["GONE"] and e.value.details["deleted"] == 5
+    assert db.query(CreatedResource).filter(CreatedResource.deleted_at.is_(None)).count() == 1
+    assert db.get(SyncBatch, _batch_id(db)).status != BatchStatus.ROLLED_BACK
@@ -0,0 +1,71 @@
+# tests/test_template_compiler.py
+import pytest
+from app.core.errors import TemplateError
+from app.services.execution_engine import node_hash
+from app.services.template_compiler import TemplateCompiler, PROJECT, CYCLE, MODULE, ISSUE
+
+TEMPLATE = {
+    "vars": {"teams": [{"name": "Search", "slug": "SRCH"}, {"name": "Ingest", "slug": "INGS"}]},
+    "Workspace Slug": "gopedia",
+    "batch_name": "roadmap_${year}",
+    "projects": [{
+        "$for": "team",
+        "$in": "${teams}",
+        "$do": {
+            "name": "${team.name} Roadmap",
+            "slug": "${team.slug}",
+            "cycles": [{"$for": "n", "$in": 2, "$do": {"name": "Phase ${n}"}}],
+            "modules": [{"name": "Core"}],
+            "issues": [{
+                "name": "Kickoff", "cycle": "Phase 1", "module": "Core",
+                "sub_issues": [{"name": "Agenda"}],
+            }],
+        },
+    }],
+}
+
+
+def test_compile_expands_loops_and_variables():
+    compiled = TemplateCompiler(variables={"year": 2027}).compile(TEMPLATE)
+    assert compiled.header == {"Workspace Slug": "gopedia", "batch_name": "roadmap_2027"}
+    assert compiled.counts() == {"PROJECT": 2, "CYCLE": 4, "MODULE": 2, "ISSUE": 4}
+
+    (start, end), _ = compiled.project_ranges()
+    assert list(compiled.kinds[start:end]) == [PROJECT, CYCLE, CYCLE, MODULE, ISSUE, ISSUE]
+    assert compiled.payloads[start] == {"name": "Search Roadmap", "slug": "SRCH"}
+    assert compiled.keys[start + 1] == "gopedia/SRCH/cycle:Phase%201"
+
+
+def test_compile_links_issue_nodes():
+    compiled = TemplateCompiler(variables={"year": 2027}).compile(TEMPLATE)
+    kickoff, agenda = 4, 5
+    assert compiled.parents[kickoff] == 0
+    assert compiled.parents[agenda] == kickoff
+    assert compiled.cycles[kickoff] == 1 and compiled.modules[kickoff] == 3
+    assert compiled.cycles[agenda] == -1
+    assert compiled.keys[agenda] == "gopedia/SRCH/issue:Kickoff/issue:Agenda"
+    # 해시는 execute_yaml과 같이 하위 노드를 뺀 자기 필드로 계산
+    assert compiled.hashes[kickoff] == node_hash({"name": "Kickoff", "cycle": "Phase 1", "module": "Core"})
+
+
+def test_compile_round_trips_to_yaml_data():
+    compiled = TemplateCompiler(variables={"year": 2027}).compile(TEMPLATE)
+    projects = list(compiled.as_yaml_data()["projects"])
+    assert [p["slug"] for p in projects] == ["SRCH", "INGS"]
+    assert projects[0]["issues"][0]["sub_issues"] == [{"name": "Agenda"}]
+
+
+def test_compile_keeps_value_type_for_whole_variable():
+    template = {"vars": {"n": 3}, "Workspace Slug": "w", "projects": [{"name": "P", "slug": "P", "count": "${n}"}]}
+    assert TemplateCompiler().compile(template).payloads[0]["count"] == 3
+
+
+@pytest.mark.parametrize("template", [
+    [],
+    {"projects": []},
+    {"Workspace Slug": "w", "projects": [{"name": "no slug"}]},
+    {"Workspace Slug": "w", "projects": [{"$for": "x", "$in": "oops", "$do": {}}]},
+])
+def test_compile_rejects_invalid_templates(template):
+    with pytest.raises(TemplateError):
+        TemplateCompiler().compile(template)
@@ -0,0 +1,39 @@
+# tests/test_webhooks.py
+import json
+import pytest
+from app.core.errors import WebhookError
+from app.services.webhooks import sign, verify_signature, parse_event
+
+SECRET = "plane-secret"
+BODY = json.dumps({"event": "project", "action": "update", "data": {"id": "p1", "name": "P"}}).encode()
+
+
+def test_verify_signature():
+    signature = sign(SECRET, BODY)
+    assert verify_signature(SECRET, BODY, signature)
+    assert verify_signature(SECRET, BODY, f" {signature.upper()} ")
+    assert not verify_signature(SECRET, BODY + b" ", signature)
+    assert not verify_signature("other", BODY, signature)
+
+
+@pytest.mark.parametrize("secret, signature", [("", "abc"), (SECRET, None), (SECRET, "")])
+def test_verify_signature_requires_secret_and_signature(secret, signature):
+    assert not verify_signature(secret, BODY, signature)
+
+
+def test_parse_event():
+    assert parse_event(BODY) == ("project", "update", {"id": "p1", "name": "P"})
+    # 본문에 event가 없으면 X-Plane-Event 헤더 값 사용
+    assert parse_event({"action": "delete", "data": {"id": "s1"}}, event="state") == ("state", "delete", {"id": "s1"})
+
+
+@pytest.mark.parametrize("body", [
+    b"not json",
+    b"[]",
+    {"event": "project", "action": "archive", "data": {}},
+    {"event": "project", "action": "create", "data": None},
+    {"action": "create", "data": {}},
+])
+def test_parse_event_rejects_invalid_body(body):
+    with pytest.raises(WebhookError):
+        parse_event(body)